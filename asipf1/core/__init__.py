@@ -1,3 +0,0 @@
-import seaborn as sns
-
-sns.set_style("white", {"axes.grid": True})
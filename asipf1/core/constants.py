@@ -3,6 +3,8 @@ PERCENTAGES_CSV = DATA_FOLDER + "./percentages.csv"
 GAPS_CSV = DATA_FOLDER + "./gaps.csv"
 PITSTOPS_CSV = DATA_FOLDER + "./pitstops.csv"
 RESULTS_CSV = DATA_FOLDER + "./results.csv"
+DNFS_QUERY_STATS_JSON = DATA_FOLDER + "/gap_dnf_query_stats.json"
+PITSTOPS_QUERY_STATS_JSON = DATA_FOLDER + "/optimal_pitstop_query_stats.json"
 
 IMAGES_FOLDER = "images"
 IMAGES_DNFS_FOLDER = IMAGES_FOLDER + "/gap_dnfs"
@@ -1,12 +1,29 @@
 import textwrap
+from functools import lru_cache
+from types import ModuleType
 from typing import Optional
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 from core.constants import IMAGES_DPI, IMAGES_PITSTOPS_SIZE
 
 
+@lru_cache(maxsize=None)
+def get_pyplot() -> ModuleType:
+    """
+    Imports matplotlib and applies the plot style on first use. Plotting libraries are
+    slow to import, so only the functions that actually render should call this.
+
+    Returns:
+        ModuleType: The matplotlib.pyplot module.
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    sns.set_style("white", {"axes.grid": True})
+    return plt
+
+
 def get_local_minimum(c: np.poly1d) -> tuple[np.ndarray, np.ndarray]:
     """
     Gets local minimum of a NumPy 1D Polynomial. Should be used in conjuction with the
@@ -48,6 +65,7 @@ def plot_regression(
         title (str, optional): _description_. Defaults to "".
     """
 
+    plt = get_pyplot()
     max_x = x.max() if x.max() > min_x else min_x
     first_stops_line = np.linspace(x.min(), max_x, 200)
 
@@ -61,6 +79,7 @@ def plot_regression(
 
 
 def plot_multiple_by_time(res: pd.DataFrame, filename: str) -> None:
+    plt = get_pyplot()
     optimal_txt = (
         "Actual and optimal correlation: "
         + f"{res['actualFirstPitstopLap'].corr(res['optimalFirstPitstopLap']):.2f}"
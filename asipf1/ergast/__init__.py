@@ -1,11 +1,112 @@
-import json
 import textwrap
-from typing import Optional
+from typing import Iterator, Optional
 
 import pandas as pd
-from ergast.db import con
+from ergast import columnar, raceindex
+from ergast.instrument import instrumented
+from ergast.memo import memoize
+from ergast.query import (
+    CATEGORY,
+    CHUNK_SIZE,
+    DATE,
+    FLOAT32,
+    INT16,
+    INT32,
+    PAGE_SIZE,
+    Column,
+    Page,
+    Shape,
+    fetch,
+    fetch_page,
+    paginate,
+    project,
+    shape,
+    stream,
+    template,
+)
+
+_SEASON_LIST_COLUMNS = [
+    Column("s.year", "year", INT16),
+    Column("s.url", "url", CATEGORY),
+]
+
+
+@template(_SEASON_LIST_COLUMNS)
+def _season_list_sql(f: Shape, select: str) -> str:
+    query = textwrap.dedent(
+        f"""
+        SELECT DISTINCT {select}
+        FROM seasons s
+        {", drivers dr" if "driver" in f else ""}
+        {", constructors co" if "constructor" in f else ""}
+        """
+    )
+
+    if f & {"driverStanding", "constructorStanding"}:
+        query = textwrap.dedent(
+            f"""
+            {query}
+            , races ra
+            {", driverStandings ds" if f & {"driverStanding", "driver"} else ""}
+            {", constructorStandings cs" if f & {"constructorStanding", "constructor"} else ""}
+            """
+        )
+    else:
+        query = textwrap.dedent(
+            f"""
+            {query}
+            {", races ra" if f & {"year", "circuit", "driver", "constructor", "status", "result", "grid", "fastest"} else ""}
+            {", results re" if f & {"driver", "constructor", "status", "result", "grid", "fastest"} else ""}
+            {", circuits ci" if "circuit" in f else ""}
+            """
+        )
+    query += " WHERE TRUE"
+
+    if f & {"driverStanding", "constructorStanding"}:
+        query = textwrap.dedent(
+            f"""
+            {query}
+            AND s.year=ra.year
+            {"AND cs.raceId=ra.raceId" if f & {"constructorStanding", "constructor"} else ""}
+            {"AND cs.constructorId=co.constructorId AND co.constructorRef=:constructor" if "constructor" in f else ""}
+            {"AND cs.positionText=CAST(:constructorStanding AS TEXT)" if "constructorStanding" in f else ""}
+            {"AND ds.raceId=ra.raceId" if f & {"driverStanding", "driver"} else ""}
+            {"AND ds.driverId=dr.driverId AND dr.driverRef=:driver" if "driver" in f else ""}
+            {"AND ds.positionText=CAST(:driverStanding AS TEXT)" if "driverStanding" in f else ""}
+            {"AND s.year=:year" if "year" in f else ""}
+            {"AND ra.round=:race" if "race" in f else ("AND ra.round=(SELECT MAX(round) FROM races WHERE races.year=:year)" if "year" in f else "AND (ra.year, ra.round) IN (SELECT year, MAX(round) FROM races GROUP BY year)")}
+            """
+        )
+    else:
+        query = textwrap.dedent(
+            f"""
+            {query}
+            {"AND s.year=ra.year" if f & {"year", "circuit", "driver", "constructor", "status", "result", "grid", "fastest"} else ""}
+            {"AND ra.circuitId=ci.circuitId AND ci.circuitRef=:circuit" if "circuit" in f else ""}
+            {"AND ra.raceId=re.raceId" if f & {"driver", "constructor", "status", "result", "grid", "fastest"} else ""}
+            {"AND re.constructorId=co.constructorId AND co.constructorRef=:constructor" if "constructor" in f else ""}
+            {"AND re.driverId=dr.driverId AND dr.driverRef=:driver" if "driver" in f else ""}
+            {"AND re.statusId=:status" if "status" in f else ""}
+            {"AND re.grid=:grid" if "grid" in f else ""}
+            {"AND re.rank=:fastest" if "fastest" in f else ""}
+            {"AND re.positionText=CAST(:result AS TEXT)" if "result" in f else ""}
+            {"AND s.year=:year" if "year" in f else ""}
+            {"AND ra.round=:race" if "race" in f else ""}
+            """
+        )
 
+    query = textwrap.dedent(
+        f"""
+        {query}
+        ORDER BY s.year
+        {paginate(f)}
+        """
+    )
+    return query
 
+
+@instrumented
+@memoize
 def season_list(
     *,
     year: Optional[int] = None,
@@ -19,6 +120,8 @@ def season_list(
     status: Optional[int] = None,
     constructorStanding: Optional[int] = None,
     driverStanding: Optional[int] = None,
+    columns: Optional[list[str]] = None,
+    compact: bool = False,
     offset: Optional[int] = None,
     limit: Optional[int] = None,
 ) -> pd.DataFrame:
@@ -50,10 +153,14 @@ def season_list(
         driverStanding (Optional[int], optional): Limit results by a final WDC position
             (e.g. only drivers that have finished a season in 3rd place).
             Defaults to None.
-        offset (Optional[int], optional): If specified along with limit will return
-            paginated results. Defaults to None.
-        limit (Optional[int], optional): If specified along with offset will return
-            paginated results. Defaults to None.
+        columns (Optional[list[str]], optional): Only select and return these columns
+            (e.g. ["year", "round"]). Defaults to None (all columns).
+        compact (bool, optional): Return categorical strings, downcast numbers and
+            parsed dates to reduce the memory footprint. Defaults to False.
+        offset (Optional[int], optional): Skip this many results, usually along with
+            limit. Defaults to None.
+        limit (Optional[int], optional): Return at most this many results.
+            Defaults to None.
 
     Raises:
         ValueError: Cannot combine standings with circuit, grid, result or status qualifiers.
@@ -69,90 +176,72 @@ def season_list(
             "Cannot combine standings with circuit, grid, result or status qualifiers."
         )
 
+    params = {
+        "year": year,
+        "race": race,
+        "circuit": circuit,
+        "constructor": constructor,
+        "driver": driver,
+        "grid": grid,
+        "result": result,
+        "fastest": fastest,
+        "status": status,
+        "constructorStanding": constructorStanding,
+        "driverStanding": driverStanding,
+        "offset": offset,
+        "limit": limit,
+    }
+    selected = project(_SEASON_LIST_COLUMNS, columns)
+    return fetch(_season_list_sql(shape(params), selected), params, selected, compact)
+
+
+_RACE_SCHEDULE_COLUMNS = [
+    Column("ra.year", "year", INT16),
+    Column("ra.round", "round", INT16),
+    Column("ra.name", "raceName", CATEGORY),
+    Column("ra.date", "date", DATE),
+    Column("ra.time", "time", CATEGORY),
+    Column("ra.url", "url", CATEGORY),
+    Column("c.circuitRef", "circuitId", CATEGORY),
+    Column("c.name", "circuitName", CATEGORY),
+    Column("c.location", "location", CATEGORY),
+    Column("c.country", "country", CATEGORY),
+    Column("c.lat", "lat", FLOAT32),
+    Column("c.lng", "long", FLOAT32),
+    Column("c.alt", "altitude", INT16),
+    Column("c.url", "circuitUrl", CATEGORY),
+]
+
+
+@template(_RACE_SCHEDULE_COLUMNS)
+def _race_schedule_sql(f: Shape, select: str) -> str:
     query = textwrap.dedent(
         f"""
-        SELECT DISTINCT s.year, s.url
-        FROM seasons s
-        {", drivers dr" if driver else ""}
-        {", constructors co" if constructor else ""}
-        """
-    )
-
-    if driverStanding or constructorStanding:
-        query = textwrap.dedent(
-            f"""
-            {query}
-            , races ra
-            {", driverStandings ds" if driverStanding or driver else ""}
-            {", constructorStandings cs" if constructorStanding or constructor else ""}
-            """
-        )
-    else:
-        query = textwrap.dedent(
-            f"""
-            {query}
-            {", races ra" if year or circuit or driver or constructor or status or result or grid or fastest else ""}
-            {", results re" if driver or constructor or status or result or grid or fastest else ""}
-            {", circuits ci" if circuit else ""}
-            """
-        )
-    query += " WHERE TRUE"
-
-    if driverStanding or constructorStanding:
-        query = textwrap.dedent(
-            f"""
-            {query}
-            AND s.year=ra.year
-            {"AND cs.raceId=ra.raceId" if constructorStanding or constructor else ""}
-            {f"AND cs.constructorId=co.constructorId AND co.constructorRef='{constructor}'" if constructor else ""}
-            {f"AND cs.positionText='{constructorStanding}'" if constructorStanding else ""}
-            {"AND ds.raceId=ra.raceId" if driverStanding or driver else ""}
-            {f"AND ds.driverId=dr.driverId AND dr.driverRef='{driver}'" if driver else ""}
-            {f"AND ds.positionText='{driverStanding}'" if driverStanding else ""}
-            {f"AND s.year='{year}'" if year else ""}
-            {f"AND ra.round='{race}'" if race else (f"AND ra.round=(SELECT MAX(round) FROM races WHERE races.year='{year}')" if year else "AND (ra.year, ra.round) IN (SELECT year, MAX(round) FROM races GROUP BY year)")}
-            """
-        )
-    else:
-        query = textwrap.dedent(
-            f"""
-            {query}
-            {"AND s.year=ra.year" if year or circuit or driver or constructor or status or result or grid or fastest else ""}
-            {f"AND ra.circuitId=ci.circuitId AND ci.circuitRef='{circuit}'" if circuit else ""}
-            {"AND ra.raceId=re.raceId" if driver or constructor or status or result or grid or fastest else ""}
-            {f"AND re.constructorId=co.constructorId AND co.constructorRef='{constructor}'" if constructor else ""}
-            {f"AND re.driverId=dr.driverId AND dr.driverRef='{driver}'" if driver else ""}
-            {f"AND re.statusId='{status}'" if status else ""}
-            {f"AND re.grid='{grid}'" if grid else ""}
-            {f"AND re.rank='{fastest}'" if fastest else ""}
-            {f"AND re.positionText='{result}'" if result else ""}
-            {f"AND s.year='{year}'" if year else ""}
-            {f"AND ra.round='{race}'" if race else ""}
-            """
-        )
-
-    query = textwrap.dedent(
-        f"""
-        {query}
-        ORDER BY s.year
-        {f"LIMIT {offset}, {limit}" if offset and limit else ""}
+        SELECT {select}
+        FROM races ra, circuits c
+        {", results re" if f & {"driver", "constructor", "grid", "result", "status", "fastest"} else ""}
+        {", drivers" if "driver" in f else ""}
+        {", constructors" if "constructor" in f else ""}
+        WHERE ra.circuitId=c.circuitId
+        {"AND ra.year=:year" if "year" in f else ""}
+        {"AND ra.round=:race" if "race" in f else ""}
+        {"AND c.circuitRef=:circuit" if "circuit" in f else ""}
+        {"AND ra.raceId=re.raceId" if f & {"driver", "constructor", "grid", "result", "status", "fastest"} else ""}
+        {"AND re.constructorId=constructors.constructorId AND constructors.constructorRef=:constructor" if "constructor" in f else ""}
+        {"AND re.driverId=drivers.driverId AND drivers.driverRef=:driver" if "driver" in f else ""}
+        {"AND re.statusId=:status" if "status" in f else ""}
+        {"AND re.grid=:grid" if "grid" in f else ""}
+        {"AND re.rank=:fastest" if "fastest" in f else ""}
+        {"AND re.positionText=CAST(:result AS TEXT)" if "result" in f else ""}
+        ORDER BY ra.year, ra.round
+        {paginate(f)}
         """
     )
-
-    cur = con.cursor()
-    res = cur.execute(query).fetchall()
-    cur.close()
-
-    df = pd.DataFrame(
-        res,
-        columns=[
-            "year",
-            "url",
-        ],
-    )
-    return df
+    return query
 
 
+@instrumented
+@memoize
 def race_schedule(
     *,
     year: Optional[int] = None,
@@ -164,6 +253,8 @@ def race_schedule(
     result: Optional[int] = None,
     fastest: Optional[int] = None,
     status: Optional[int] = None,
+    columns: Optional[list[str]] = None,
+    compact: bool = False,
     offset: Optional[int] = None,
     limit: Optional[int] = None,
 ) -> pd.DataFrame:
@@ -190,70 +281,119 @@ def race_schedule(
         status (Optional[int], optional): Limit results to a specific race outcome
             (e.g. 1 means finished). This is fairly useless since you cant know in
             advance what the statusIds are. Defaults to None.
-        offset (Optional[int], optional): If specified along with limit will return
-            paginated results. Defaults to None.
-        limit (Optional[int], optional): If specified along with offset will return
-            paginated results. Defaults to None.
+        columns (Optional[list[str]], optional): Only select and return these columns
+            (e.g. ["year", "round"]). Defaults to None (all columns).
+        compact (bool, optional): Return categorical strings, downcast numbers and
+            parsed dates to reduce the memory footprint. Defaults to False.
+        offset (Optional[int], optional): Skip this many results, usually along with
+            limit. Defaults to None.
+        limit (Optional[int], optional): Return at most this many results.
+            Defaults to None.
 
     Returns:
         pd.DataFrame: Pandas DataFrame with race schedule for the given criteria.
     """
 
+    params = {
+        "year": year,
+        "race": race,
+        "circuit": circuit,
+        "constructor": constructor,
+        "driver": driver,
+        "grid": grid,
+        "result": result,
+        "fastest": fastest,
+        "status": status,
+        "offset": offset,
+        "limit": limit,
+    }
+    selected = project(_RACE_SCHEDULE_COLUMNS, columns)
+    return fetch(_race_schedule_sql(shape(params), selected), params, selected, compact)
+
+
+_RACE_RESULTS_COLUMNS = [
+    Column("ra.year", "year", INT16),
+    Column("ra.round", "round", INT16),
+    Column("ra.name", "raceName", CATEGORY),
+    Column("ra.date", "date", DATE),
+    Column("ra.time", "time", CATEGORY),
+    Column("ra.url", "url", CATEGORY),
+    Column("ci.circuitRef", "circuitId", CATEGORY),
+    Column("ci.name", "circuitName", CATEGORY),
+    Column("ci.location", "locality", CATEGORY),
+    Column("ci.country", "country", CATEGORY),
+    Column("ci.url", "circuitUrl", CATEGORY),
+    Column("ci.lat", "lat", FLOAT32),
+    Column("ci.lng", "long", FLOAT32),
+    Column("ci.alt", "altitude", INT16),
+    Column("re.grid", "grid", INT16),
+    Column("re.positionText", "positionText", CATEGORY),
+    Column("re.positionOrder", "position", INT16),
+    Column("re.number", "carNumber", INT16),
+    Column("re.points", "points", FLOAT32),
+    Column("re.laps", "laps", INT16),
+    Column("re.time", "time", CATEGORY),
+    Column("re.milliseconds", "timeMillis", INT32),
+    Column("re.rank", "fastestLapRank", INT16),
+    Column("re.fastestLap", "fastestLap", INT16),
+    Column("re.fastestLapTime", "fastestLapTime", CATEGORY),
+    Column("re.fastestLapSpeed", "fastestLapSpeed", CATEGORY),
+    Column("dr.driverRef", "driverId", CATEGORY),
+    Column("dr.number", "driverNumber", INT16),
+    Column("dr.code", "driverCode", CATEGORY),
+    Column("dr.forename", "givenName", CATEGORY),
+    Column("dr.surname", "familyName", CATEGORY),
+    Column("dr.dob", "dateOfBirth", DATE),
+    Column("dr.nationality", "nationality", CATEGORY),
+    Column("dr.url", "driverUrl", CATEGORY),
+    Column("st.statusId", "statusId", INT16),
+    Column("st.status", "status", CATEGORY),
+    Column("co.constructorRef", "constructorId", CATEGORY),
+    Column("co.name", "constructorName", CATEGORY),
+    Column("co.nationality", "constructorNationality", CATEGORY),
+    Column("co.url", "constructorUrl", CATEGORY),
+]
+
+
+@template(_RACE_RESULTS_COLUMNS)
+def _race_results_sql(f: Shape, select: str) -> str:
     query = textwrap.dedent(
         f"""
-        SELECT
-        ra.year, ra.round, ra.name, ra.date, ra.time, ra.url,
-        c.circuitRef, c.name, c.location, c.country, c.lat, c.lng, c.alt, c.url
-        FROM races ra, circuits c
-        {", results re" if driver or constructor or grid or result or status or fastest else ""}
-        {", drivers" if driver else ""}
-        {", constructors" if constructor else ""}
-        WHERE ra.circuitId=c.circuitId
-        {f"AND ra.year='{year}'" if year else ""}
-        {f"AND ra.round='{race}'" if race else ""}
-        {f"AND c.circuitRef='{circuit}'" if circuit else ""}
-        {"AND ra.raceId=re.raceId" if driver or constructor or grid or result or status or fastest else ""}
-        {f"AND re.constructorId=constructors.constructorId AND constructors.constructorRef='{constructor}'" if constructor else ""}
-        {f"AND re.driverId=drivers.driverId AND drivers.driverRef='{driver}'" if driver else ""}
-        {f"AND re.statusId='{status}'" if status else ""}
-        {f"AND re.grid='{grid}'" if grid else ""}
-        {f"AND re.rank='{fastest}'" if fastest else ""}
-        {f"AND re.positionText='{result}'" if result else ""}
-        ORDER BY ra.year, ra.round
-        {f"LIMIT {offset}, {limit}" if offset and limit else ""}
+        SELECT {select}
+        FROM races ra, circuits ci, results re, drivers dr, constructors co, status st
+        WHERE ra.circuitId=ci.circuitId
+        AND ra.raceId=re.raceId
+        AND re.driverId=dr.driverId
+        AND re.constructorId=co.constructorId
+        AND re.statusId=st.statusId
+        {"AND re.raceId=:race_id" if "race_id" in f else ""}
+        {"AND ra.year=:year" if "year" in f else ""}
+        {"AND ra.round=:race" if "race" in f else ""}
+        {"AND ra.year>=:start_year" if "start_year" in f else ""}
+        {"AND ra.year<=:end_year" if "end_year" in f else ""}
+        {"AND ci.circuitRef=:circuit" if "circuit" in f else ""}
+        {"AND co.constructorRef=:constructor" if "constructor" in f else ""}
+        {"AND dr.driverRef=:driver" if "driver" in f else ""}
+        {"AND re.statusId=:status" if "status" in f else ""}
+        {"AND re.grid=:grid" if "grid" in f else ""}
+        {"AND re.rank=:fastest" if "fastest" in f else ""}
+        {"AND re.positionText=CAST(:result AS TEXT)" if "result" in f else ""}
+        {"AND (ra.year, ra.round) >= (:after_year, :after_round) AND (ra.year, ra.round, re.positionOrder, re.resultId) > (:after_year, :after_round, :after_position, :after_result)" if "after_year" in f else ""}
+        ORDER BY ra.year, ra.round, re.positionOrder{", re.resultId" if "keyset" in f else ""}
+        {paginate(f)}
         """
     )
-
-    cur = con.cursor()
-    res = cur.execute(query).fetchall()
-    cur.close()
-
-    df = pd.DataFrame(
-        res,
-        columns=[
-            "year",
-            "round",
-            "raceName",
-            "date",
-            "time",
-            "url",
-            "circuitId",
-            "circuitName",
-            "location",
-            "country",
-            "lat",
-            "long",
-            "altitude",
-            "circuitUrl",
-        ],
-    )
-    return df
+    return query
 
 
+@instrumented
+@memoize
 def race_results(
     *,
     year: Optional[int] = None,
     race: Optional[int] = None,
+    start_year: Optional[int] = None,
+    end_year: Optional[int] = None,
     circuit: Optional[str] = None,
     constructor: Optional[str] = None,
     driver: Optional[str] = None,
@@ -261,6 +401,8 @@ def race_results(
     result: Optional[int] = None,
     fastest: Optional[int] = None,
     status: Optional[int] = None,
+    columns: Optional[list[str]] = None,
+    compact: bool = False,
     offset: Optional[int] = None,
     limit: Optional[int] = None,
 ) -> pd.DataFrame:
@@ -298,6 +440,10 @@ def race_results(
             onwards. Defaults to None.
         race (Optional[int], optional): Race round in the selected calendar year.
             Defaults to None.
+        start_year (Optional[int], optional): Limit results to seasons from this year
+            onwards (inclusive). Defaults to None.
+        end_year (Optional[int], optional): Limit results to seasons up to this year
+            (inclusive). Defaults to None.
         circuit (Optional[str], optional): Limit results to a specified circuit
             (e.g. monaco). Defaults to None.
         constructor (Optional[str], optional): Limit results to a specified constructor
@@ -313,96 +459,312 @@ def race_results(
         status (Optional[int], optional): Limit results to a specific race outcome
             (e.g. 1 means finished). This is fairly useless since you cant know in
             advance what the statusIds are. Defaults to None.
-        offset (Optional[int], optional): If specified along with limit will return
-            paginated results. Defaults to None.
-        limit (Optional[int], optional): If specified along with offset will return
-            paginated results. Defaults to None.
+        columns (Optional[list[str]], optional): Only select and return these columns
+            (e.g. ["year", "round"]). Defaults to None (all columns).
+        compact (bool, optional): Return categorical strings, downcast numbers and
+            parsed dates to reduce the memory footprint. Defaults to False.
+        offset (Optional[int], optional): Skip this many results, usually along with
+            limit. Defaults to None.
+        limit (Optional[int], optional): Return at most this many results.
+            Defaults to None.
 
     Returns:
         pd.DataFrame: Pandas DataFrame with race results for the given criteria.
     """
 
+    params = {
+        "year": year,
+        "race": race,
+        "start_year": start_year,
+        "end_year": end_year,
+        "circuit": circuit,
+        "constructor": constructor,
+        "driver": driver,
+        "grid": grid,
+        "result": result,
+        "fastest": fastest,
+        "status": status,
+        "offset": offset,
+        "limit": limit,
+    }
+    selected = project(_RACE_RESULTS_COLUMNS, columns)
+    if columnar.is_enabled():
+        return columnar.read(
+            "race_results",
+            _race_results_sql,
+            _RACE_RESULTS_COLUMNS,
+            selected,
+            year=year,
+            start_year=start_year,
+            end_year=end_year,
+            filters={
+                "round": race,
+                "circuitId": circuit,
+                "constructorId": constructor,
+                "driverId": driver,
+                "statusId": status,
+                "grid": grid,
+                "fastestLapRank": fastest,
+                "positionText": result,
+            },
+            offset=offset,
+            limit=limit,
+            compact=compact,
+        )
+    race_id = raceindex.resolve(year, race, circuit)
+    if race_id is not None:  # Filter the fact table by raceId directly
+        params.update(year=None, race=None, circuit=None, race_id=race_id)
+    return fetch(_race_results_sql(shape(params), selected), params, selected, compact)
+
+
+@instrumented
+def iter_race_results(
+    *,
+    year: Optional[int] = None,
+    race: Optional[int] = None,
+    start_year: Optional[int] = None,
+    end_year: Optional[int] = None,
+    circuit: Optional[str] = None,
+    constructor: Optional[str] = None,
+    driver: Optional[str] = None,
+    grid: Optional[int] = None,
+    result: Optional[int] = None,
+    fastest: Optional[int] = None,
+    status: Optional[int] = None,
+    columns: Optional[list[str]] = None,
+    compact: bool = False,
+    chunk_size: int = CHUNK_SIZE,
+    by_race: bool = False,
+) -> Iterator[pd.DataFrame]:
+    """
+    Streams the race results for the specified query. Rows are fetched chunk_size at a
+    time, so the whole history can be processed with bounded memory. Always reads
+    from SQLite, the columnar cache is not used.
+
+    Args:
+        year (Optional[int], optional): Season calendar year. Should be from 2003
+            onwards. Defaults to None.
+        race (Optional[int], optional): Race round in the selected calendar year.
+            Defaults to None.
+        start_year (Optional[int], optional): Limit results to seasons from this year
+            onwards (inclusive). Defaults to None.
+        end_year (Optional[int], optional): Limit results to seasons up to this year
+            (inclusive). Defaults to None.
+        circuit (Optional[str], optional): Limit results to a specified circuit
+            (e.g. monaco). Defaults to None.
+        constructor (Optional[str], optional): Limit results to a specified constructor
+            (e.g. renault). Defaults to None.
+        driver (Optional[str], optional): Limit results to a specific driver
+            (e.g. alonso). Defaults to None.
+        grid (Optional[int], optional): Limit results to a specific starting grid
+            position. Defaults to None.
+        result (Optional[int], optional): Limit results to a specific finishing
+            position. Defaults to None.
+        fastest (Optional[int], optional): Limit results to a specific fastest lap rank
+            (e.g. 3 means 3rd fastest lap holder). Defaults to None.
+        status (Optional[int], optional): Limit results to a specific race outcome
+            (e.g. 1 means finished). This is fairly useless since you cant know in
+            advance what the statusIds are. Defaults to None.
+        columns (Optional[list[str]], optional): Only select and return these columns
+            (e.g. ["year", "round"]). Defaults to None (all columns).
+        compact (bool, optional): Return categorical strings, downcast numbers and
+            parsed dates to reduce the memory footprint. Defaults to False.
+        chunk_size (int, optional): Number of rows fetched at once.
+            Defaults to CHUNK_SIZE.
+        by_race (bool, optional): Yield one DataFrame per race instead of one per
+            chunk, requires the year and round columns. Defaults to False.
+
+    Returns:
+        Iterator[pd.DataFrame]: Pandas DataFrames with consecutive race results.
+    """
+
+    params = {
+        "year": year,
+        "race": race,
+        "start_year": start_year,
+        "end_year": end_year,
+        "circuit": circuit,
+        "constructor": constructor,
+        "driver": driver,
+        "grid": grid,
+        "result": result,
+        "fastest": fastest,
+        "status": status,
+    }
+    selected = project(_RACE_RESULTS_COLUMNS, columns)
+    return stream(
+        _race_results_sql(shape(params), selected),
+        params,
+        selected,
+        compact,
+        chunk_size,
+        ["year", "round"] if by_race else None,
+    )
+
+
+# Unique sort key of the keyset paginated race results
+_RACE_RESULTS_KEYS = (
+    Column("ra.year", "after_year"),
+    Column("ra.round", "after_round"),
+    Column("re.positionOrder", "after_position"),
+    Column("re.resultId", "after_result"),
+)
+
+
+@instrumented
+def race_results_page(
+    *,
+    year: Optional[int] = None,
+    race: Optional[int] = None,
+    start_year: Optional[int] = None,
+    end_year: Optional[int] = None,
+    circuit: Optional[str] = None,
+    constructor: Optional[str] = None,
+    driver: Optional[str] = None,
+    grid: Optional[int] = None,
+    result: Optional[int] = None,
+    fastest: Optional[int] = None,
+    status: Optional[int] = None,
+    columns: Optional[list[str]] = None,
+    compact: bool = False,
+    limit: int = PAGE_SIZE,
+    token: Optional[str] = None,
+) -> Page:
+    """
+    Obtain one page of the race results for the specified query. Pages continue after
+    the last row of the previous page (keyset pagination), so unlike offset they cost
+    the same however deep they are. Always reads from SQLite, the columnar cache is
+    not used.
+
+        page = ergast.race_results_page(start_year=2010)
+        while page.token:
+            page = ergast.race_results_page(start_year=2010, token=page.token)
+
+    Args:
+        year (Optional[int], optional): Season calendar year. Should be from 2003
+            onwards. Defaults to None.
+        race (Optional[int], optional): Race round in the selected calendar year.
+            Defaults to None.
+        start_year (Optional[int], optional): Limit results to seasons from this year
+            onwards (inclusive). Defaults to None.
+        end_year (Optional[int], optional): Limit results to seasons up to this year
+            (inclusive). Defaults to None.
+        circuit (Optional[str], optional): Limit results to a specified circuit
+            (e.g. monaco). Defaults to None.
+        constructor (Optional[str], optional): Limit results to a specified constructor
+            (e.g. renault). Defaults to None.
+        driver (Optional[str], optional): Limit results to a specific driver
+            (e.g. alonso). Defaults to None.
+        grid (Optional[int], optional): Limit results to a specific starting grid
+            position. Defaults to None.
+        result (Optional[int], optional): Limit results to a specific finishing
+            position. Defaults to None.
+        fastest (Optional[int], optional): Limit results to a specific fastest lap rank
+            (e.g. 3 means 3rd fastest lap holder). Defaults to None.
+        status (Optional[int], optional): Limit results to a specific race outcome
+            (e.g. 1 means finished). This is fairly useless since you cant know in
+            advance what the statusIds are. Defaults to None.
+        columns (Optional[list[str]], optional): Only select and return these columns
+            (e.g. ["year", "round"]). Defaults to None (all columns).
+        compact (bool, optional): Return categorical strings, downcast numbers and
+            parsed dates to reduce the memory footprint. Defaults to False.
+        limit (int, optional): Number of results per page. Defaults to PAGE_SIZE.
+        token (Optional[str], optional): Continuation token of the previous page, only
+            valid with the same filters. Defaults to None (first page).
+
+    Raises:
+        ValueError: limit is not positive or the token belongs to another query.
+
+    Returns:
+        Page: Pandas DataFrame with the page of race results and the token of the
+            next page, None on the last page.
+    """
+
+    params = {
+        "year": year,
+        "race": race,
+        "start_year": start_year,
+        "end_year": end_year,
+        "circuit": circuit,
+        "constructor": constructor,
+        "driver": driver,
+        "grid": grid,
+        "result": result,
+        "fastest": fastest,
+        "status": status,
+    }
+    selected = project(_RACE_RESULTS_COLUMNS, columns)
+    return fetch_page(
+        _race_results_sql, params, selected, _RACE_RESULTS_KEYS, limit, token, compact
+    )
+
+
+_QUALIFYING_RESULTS_COLUMNS = [
+    Column("ra.year", "year", INT16),
+    Column("ra.round", "round", INT16),
+    Column("ra.name", "raceName", CATEGORY),
+    Column("ra.date", "date", DATE),
+    Column("ra.time", "time", CATEGORY),
+    Column("ra.url", "url", CATEGORY),
+    Column("ci.circuitRef", "circuitId", CATEGORY),
+    Column("ci.name", "circuitName", CATEGORY),
+    Column("ci.location", "locality", CATEGORY),
+    Column("ci.country", "country", CATEGORY),
+    Column("ci.url", "circuitUrl", CATEGORY),
+    Column("ci.lat", "lat", FLOAT32),
+    Column("ci.lng", "long", FLOAT32),
+    Column("ci.alt", "altitude", INT16),
+    Column("qu.number", "carNumber", INT16),
+    Column("qu.position", "position", INT16),
+    Column("qu.q1", "q1", CATEGORY),
+    Column("qu.q2", "q2", CATEGORY),
+    Column("qu.q3", "q3", CATEGORY),
+    Column("dr.driverRef", "driverId", CATEGORY),
+    Column("dr.number", "driverNumber", INT16),
+    Column("dr.code", "driverCode", CATEGORY),
+    Column("dr.forename", "givenName", CATEGORY),
+    Column("dr.surname", "familyName", CATEGORY),
+    Column("dr.dob", "dateOfBirth", DATE),
+    Column("dr.nationality", "nationality", CATEGORY),
+    Column("dr.url", "driverUrl", CATEGORY),
+    Column("co.constructorRef", "constructorId", CATEGORY),
+    Column("co.name", "constructorName", CATEGORY),
+    Column("co.nationality", "constructorNationality", CATEGORY),
+    Column("co.url", "constructorUrl", CATEGORY),
+]
+
+
+@template(_QUALIFYING_RESULTS_COLUMNS)
+def _qualifying_results_sql(f: Shape, select: str) -> str:
     query = textwrap.dedent(
         f"""
-        SELECT
-        ra.year, ra.round, ra.name, ra.date, ra.time, ra.url, 
-        ci.circuitRef, ci.name, ci.location, ci.country, ci.url, ci.lat, ci.lng, ci.alt,
-        re.grid, re.positionText, re.positionOrder, re.number, re.points, re.laps, re.time, re.milliseconds, re.rank, re.fastestLap, re.fastestLapTime, re.fastestLapSpeed,
-        dr.driverRef, dr.number, dr.code, dr.forename, dr.surname, dr.dob, dr.nationality, dr.url,
-        st.statusId, st.status,
-        co.constructorRef, co.name, co.nationality, co.url
-        FROM races ra, circuits ci, results re, drivers dr, constructors co, status st
+        SELECT {select}
+        FROM races ra, circuits ci, qualifying qu, drivers dr, constructors co
+        {", results re" if f & {"grid", "result", "status", "fastest"} else ""}
         WHERE ra.circuitId=ci.circuitId
-        AND ra.raceId=re.raceId
-        AND re.driverId=dr.driverId
-        AND re.constructorId=co.constructorId
-        AND re.statusId=st.statusId
-        {f"AND ra.year='{year}'" if year else ""}
-        {f"AND ra.round='{race}'" if race else ""}
-        {f"AND ci.circuitRef='{circuit}'" if circuit else ""}
-        {f"AND co.constructorRef='{constructor}'" if constructor else ""}
-        {f"AND dr.driverRef='{driver}'" if driver else ""}
-        {f"AND re.statusId='{status}'" if status else ""}
-        {f"AND re.grid='{grid}'" if grid else ""}
-        {f"AND re.rank='{fastest}'" if fastest else ""}
-        {f"AND re.positionText='{result}'" if result else ""}
-        ORDER BY ra.year, ra.round, re.positionOrder
-        {f"LIMIT {offset}, {limit}" if offset and limit else ""}
+        AND qu.raceId=ra.raceId
+        AND qu.driverId=dr.driverId
+        AND qu.constructorId=co.constructorId
+        {"AND re.raceId=qu.raceId AND re.driverId=qu.driverId AND re.constructorId=qu.constructorId" if f & {"grid", "result", "status", "fastest"} else ""}
+        {"AND qu.raceId=:race_id" if "race_id" in f else ""}
+        {"AND ra.year=:year" if "year" in f else ""}
+        {"AND ra.round=:race" if "race" in f else ""}
+        {"AND ci.circuitRef=:circuit" if "circuit" in f else ""}
+        {"AND co.constructorRef=:constructor" if "constructor" in f else ""}
+        {"AND dr.driverRef=:driver" if "driver" in f else ""}
+        {"AND re.statusId=:status" if "status" in f else ""}
+        {"AND re.grid=:grid" if "grid" in f else ""}
+        {"AND re.rank=:fastest" if "fastest" in f else ""}
+        {"AND re.positionText=CAST(:result AS TEXT)" if "result" in f else ""}
+        ORDER BY ra.year, ra.round, qu.position
+        {paginate(f)}
         """
     )
-
-    cur = con.cursor()
-    res = cur.execute(query).fetchall()
-    cur.close()
-
-    df = pd.DataFrame(
-        res,
-        columns=[
-            "year",
-            "round",
-            "raceName",
-            "date",
-            "time",
-            "url",
-            "circuitId",
-            "circuitName",
-            "locality",
-            "country",
-            "circuitUrl",
-            "lat",
-            "long",
-            "altitude",
-            "grid",
-            "positionText",
-            "position",
-            "carNumber",
-            "points",
-            "laps",
-            "time",
-            "timeMillis",
-            "fastestLapRank",
-            "fastestLap",
-            "fastestLapTime",
-            "fastestLapSpeed",
-            "driverId",
-            "driverNumber",
-            "driverCode",
-            "givenName",
-            "familyName",
-            "dateOfBirth",
-            "nationality",
-            "driverUrl",
-            "statusId",
-            "status",
-            "constructorId",
-            "constructorName",
-            "constructorNationality",
-            "constructorUrl",
-        ],
-    )
-    return df
+    return query
 
 
+@instrumented
+@memoize
 def qualifying_results(
     *,
     year: Optional[int] = None,
@@ -414,6 +776,8 @@ def qualifying_results(
     result: Optional[int] = None,
     fastest: Optional[int] = None,
     status: Optional[int] = None,
+    columns: Optional[list[str]] = None,
+    compact: bool = False,
     offset: Optional[int] = None,
     limit: Optional[int] = None,
 ) -> pd.DataFrame:
@@ -446,93 +810,89 @@ def qualifying_results(
         status (Optional[int], optional): Limit results to a specific race outcome
             (e.g. 1 means finished). This is fairly useless since you cant know in
             advance what the statusIds are. Defaults to None.
-        offset (Optional[int], optional): If specified along with limit will return
-            paginated results. Defaults to None.
-        limit (Optional[int], optional): If specified along with offset will return
-            paginated results. Defaults to None.
+        columns (Optional[list[str]], optional): Only select and return these columns
+            (e.g. ["year", "round"]). Defaults to None (all columns).
+        compact (bool, optional): Return categorical strings, downcast numbers and
+            parsed dates to reduce the memory footprint. Defaults to False.
+        offset (Optional[int], optional): Skip this many results, usually along with
+            limit. Defaults to None.
+        limit (Optional[int], optional): Return at most this many results.
+            Defaults to None.
 
     Returns:
         pd.DataFrame: Pandas DataFrame with qualifying results for the given criteria.
     """
 
+    params = {
+        "year": year,
+        "race": race,
+        "circuit": circuit,
+        "constructor": constructor,
+        "driver": driver,
+        "grid": grid,
+        "result": result,
+        "fastest": fastest,
+        "status": status,
+        "offset": offset,
+        "limit": limit,
+    }
+    selected = project(_QUALIFYING_RESULTS_COLUMNS, columns)
+    race_id = raceindex.resolve(year, race, circuit)
+    if race_id is not None:  # Filter the fact table by raceId directly
+        params.update(year=None, race=None, circuit=None, race_id=race_id)
+    return fetch(
+        _qualifying_results_sql(shape(params), selected), params, selected, compact
+    )
+
+
+_DRIVER_STANDINGS_COLUMNS = [
+    Column("d.driverId", "driverInternalId", INT16),
+    Column("d.driverRef", "driverId", CATEGORY),
+    Column("d.number", "permanentNumber", INT16),
+    Column("d.code", "driverCode", CATEGORY),
+    Column("d.forename", "givenName", CATEGORY),
+    Column("d.surname", "familyName", CATEGORY),
+    Column("d.dob", "dateOfBirth", DATE),
+    Column("d.nationality", "nationality", CATEGORY),
+    Column("d.url", "url", CATEGORY),
+    Column("ds.points", "points", FLOAT32),
+    Column("ds.position", "position", INT16),
+    Column("ds.positionText", "positionText", CATEGORY),
+    Column("ds.wins", "wins", INT16),
+    Column("r.year", "year", INT16),
+    Column("r.round", "round", INT16),
+]
+
+
+@template(_DRIVER_STANDINGS_COLUMNS)
+def _driver_standings_sql(f: Shape, select: str) -> str:
     query = textwrap.dedent(
         f"""
-        SELECT
-            ra.year, ra.round, ra.name, ra.date, ra.time, ra.url, 
-            ci.circuitRef, ci.name, ci.location, ci.country, ci.url, ci.lat, ci.lng, ci.alt,
-            qu.number, qu.position, qu.q1, qu.q2, qu.q3,
-            dr.driverRef, dr.number, dr.code, dr.forename, dr.surname, dr.dob, dr.nationality, dr.url,
-            co.constructorRef, co.name, co.nationality, co.url
-        FROM races ra, circuits ci, qualifying qu, drivers dr, constructors co
-        {", results re" if grid or result or status or fastest else ""}
-        WHERE ra.circuitId=ci.circuitId
-        AND qu.raceId=ra.raceId
-        AND qu.driverId=dr.driverId
-        AND qu.constructorId=co.constructorId
-        {"AND re.raceId=qu.raceId AND re.driverId=qu.driverId AND re.constructorId=qu.constructorId" if grid or result or status or fastest else ""}
-        {f"AND ra.year='{year}'" if year else ""}
-        {f"AND ra.round='{race}'" if race else ""}
-        {f"AND ci.circuitRef='{circuit}'" if circuit else ""}
-        {f"AND co.constructorRef='{constructor}'" if constructor else ""}
-        {f"AND dr.driverRef='{driver}'" if driver else ""}
-        {f"AND re.statusId='{status}'" if status else ""}
-        {f"AND re.grid='{grid}'" if grid else ""}
-        {f"AND re.rank='{fastest}'" if fastest else ""}
-        {f"AND re.positionText='{result}'" if result else ""}
-        ORDER BY ra.year, ra.round, qu.position
-        {f"LIMIT {offset}, {limit}" if offset and limit else ""}
+        SELECT DISTINCT {select}
+        FROM drivers d, driverStandings ds, races r
+        WHERE ds.raceId=r.raceId AND ds.driverId=d.driverId
+        {"AND ds.positionText=CAST(:driverStanding AS TEXT)" if "driverStanding" in f else ""}
+        {"AND d.driverRef=:driver" if "driver" in f else ""}
+        {"AND ds.raceId=:race_id" if "race_id" in f else ""}
+        {"AND r.year=:year" if "year" in f else ""}
+        {"AND r.round=:race" if "race" in f else ("" if "race_id" in f else "AND (r.year, r.round) IN (SELECT year, MAX(round) FROM races GROUP BY year)")}
+        ORDER BY r.year, ds.position
+        {paginate(f)}
         """
     )
-
-    cur = con.cursor()
-    res = cur.execute(query).fetchall()
-    cur.close()
-
-    df = pd.DataFrame(
-        res,
-        columns=[
-            "year",
-            "round",
-            "raceName",
-            "date",
-            "time",
-            "url",
-            "circuitId",
-            "circuitName",
-            "locality",
-            "country",
-            "circuitUrl",
-            "lat",
-            "long",
-            "altitude",
-            "carNumber",
-            "position",
-            "q1",
-            "q2",
-            "q3",
-            "driverId",
-            "driverNumber",
-            "driverCode",
-            "givenName",
-            "familyName",
-            "dateOfBirth",
-            "nationality",
-            "driverUrl",
-            "constructorId",
-            "constructorName",
-            "constructorNationality",
-            "constructorUrl",
-        ],
-    )
-    return df
+    return query
 
 
+@instrumented
+@memoize
 def driver_standings(
     *,
     year: Optional[int] = None,
     race: Optional[int] = None,
     driver: Optional[str] = None,
     driverStanding: Optional[int] = None,
+    columns: Optional[list[str]] = None,
+    compact: bool = False,
     offset: Optional[int] = None,
     limit: Optional[int] = None,
 ) -> pd.DataFrame:
@@ -547,65 +907,82 @@ def driver_standings(
         driverStanding (Optional[int], optional): Limit results by a final WDC position
             (e.g. only drivers that have finished a season in 3rd place).
             Defaults to None.
-        offset (Optional[int], optional): If specified along with limit will return
-            paginated results. Defaults to None.
-        limit (Optional[int], optional): If specified along with offset will return
-            paginated results. Defaults to None.
+        columns (Optional[list[str]], optional): Only select and return these columns
+            (e.g. ["year", "round"]). Defaults to None (all columns).
+        compact (bool, optional): Return categorical strings, downcast numbers and
+            parsed dates to reduce the memory footprint. Defaults to False.
+        offset (Optional[int], optional): Skip this many results, usually along with
+            limit. Defaults to None.
+        limit (Optional[int], optional): Return at most this many results.
+            Defaults to None.
 
     Returns:
         pd.DataFrame: Pandas DataFrame with list of drive standings for the given
             criteria.
     """
 
+    params = {
+        "year": year,
+        "race": race,
+        "driver": driver,
+        "driverStanding": driverStanding,
+        "offset": offset,
+        "limit": limit,
+    }
+    selected = project(_DRIVER_STANDINGS_COLUMNS, columns)
+    if year:  # Filter the standings by raceId instead of the latest round subquery
+        race_id = (
+            raceindex.race_id(year, race) if race else raceindex.standings_race_id(year)
+        )
+        params.update(year=None, race=None, race_id=race_id)
+    return fetch(
+        _driver_standings_sql(shape(params), selected), params, selected, compact
+    )
+
+
+_CONSTRUCTOR_STANDINGS_COLUMNS = [
+    Column("c.constructorRef", "constructorId", CATEGORY),
+    Column("c.name", "constructorName", CATEGORY),
+    Column("c.nationality", "nationality", CATEGORY),
+    Column("c.url", "url", CATEGORY),
+    Column("cs.points", "points", FLOAT32),
+    Column("cs.position", "position", INT16),
+    Column("cs.positionText", "positionText", CATEGORY),
+    Column("cs.wins", "wins", INT16),
+    Column("r.year", "year", INT16),
+    Column("r.round", "round", INT16),
+]
+
+
+@template(_CONSTRUCTOR_STANDINGS_COLUMNS)
+def _constructor_standings_sql(f: Shape, select: str) -> str:
     query = textwrap.dedent(
         f"""
-        SELECT DISTINCT
-        d.driverId, d.driverRef, d.number, d.code, d.forename, d.surname, d.dob, d.nationality, d.url,
-        ds.points, ds.position, ds.positionText, ds.wins, r.year, r.round
-        FROM drivers d, driverStandings ds, races r
-        WHERE ds.raceId=r.raceId AND ds.driverId=d.driverId
-        {f"AND ds.positionText='{driverStanding}'" if driverStanding else ""}
-        {f"AND d.driverRef='{driver}'" if driver else ""}
-        {f"AND r.year='{year}'" if year else ""}
-        {f"AND r.round='{race}'" if race else (f"AND r.round=(SELECT MAX(round) FROM driverStandings ds, races r WHERE ds.raceId=r.raceId AND r.year='{year}')" if year else "AND (r.year, r.round) IN (SELECT year, MAX(round) FROM races GROUP BY year)")}
-        ORDER BY r.year, ds.position
-        {f"LIMIT {offset}, {limit}" if offset and limit else ""}
+        SELECT DISTINCT {select}
+        FROM constructors c, constructorStandings cs, races r
+        WHERE cs.raceId=r.raceId AND cs.constructorId=c.constructorId
+        {"AND cs.positionText=CAST(:constructorStanding AS TEXT)" if "constructorStanding" in f else ""}
+        {"AND c.constructorRef=:constructor" if "constructor" in f else ""}
+        {"AND cs.raceId=:race_id" if "race_id" in f else ""}
+        {"AND r.year=:year" if "year" in f else ""}
+        {"AND r.round=:race" if "race" in f else ("" if "race_id" in f else "AND (r.year, r.round) IN (SELECT year, MAX(round) FROM races GROUP BY year)")}
+        ORDER BY r.year, cs.position
+        {paginate(f)}
         """
     )
-
-    cur = con.cursor()
-    res = cur.execute(query).fetchall()
-    cur.close()
-
-    df = pd.DataFrame(
-        res,
-        columns=[
-            "driverInternalId",
-            "driverId",
-            "permanentNumber",
-            "driverCode",
-            "givenName",
-            "familyName",
-            "dateOfBirth",
-            "nationality",
-            "url",
-            "points",
-            "position",
-            "positionText",
-            "wins",
-            "year",
-            "round",
-        ],
-    )
-    return df
+    return query
 
 
+@instrumented
+@memoize
 def constructor_standings(
     *,
     year: Optional[int] = None,
     race: Optional[int] = None,
     constructor: Optional[str] = None,
     constructorStanding: Optional[int] = None,
+    columns: Optional[list[str]] = None,
+    compact: bool = False,
     offset: Optional[int] = None,
     limit: Optional[int] = None,
 ) -> pd.DataFrame:
@@ -621,55 +998,112 @@ def constructor_standings(
         constructorStanding (Optional[int], optional): Limit results by a final
             CDC finishing position (e.g. only constructors that have finished in 3rd
             place). Defaults to None.
-        offset (Optional[int], optional): If specified along with limit will return
-            paginated results. Defaults to None.
-        limit (Optional[int], optional): If specified along with offset will return
-            paginated results. Defaults to None.
+        columns (Optional[list[str]], optional): Only select and return these columns
+            (e.g. ["year", "round"]). Defaults to None (all columns).
+        compact (bool, optional): Return categorical strings, downcast numbers and
+            parsed dates to reduce the memory footprint. Defaults to False.
+        offset (Optional[int], optional): Skip this many results, usually along with
+            limit. Defaults to None.
+        limit (Optional[int], optional): Return at most this many results.
+            Defaults to None.
 
     Returns:
         pd.DataFrame: Pandas DataFrame with list of constructor standings for the given
             criteria.
     """
 
+    params = {
+        "year": year,
+        "race": race,
+        "constructor": constructor,
+        "constructorStanding": constructorStanding,
+        "offset": offset,
+        "limit": limit,
+    }
+    selected = project(_CONSTRUCTOR_STANDINGS_COLUMNS, columns)
+    if year:  # Filter the standings by raceId instead of the latest round subquery
+        race_id = (
+            raceindex.race_id(year, race) if race else raceindex.standings_race_id(year)
+        )
+        params.update(year=None, race=None, race_id=race_id)
+    return fetch(
+        _constructor_standings_sql(shape(params), selected), params, selected, compact
+    )
+
+
+_DRIVER_INFORMATION_COLUMNS = [
+    Column("dr.driverRef", "driverId", CATEGORY),
+    Column("dr.number", "permanentNumber", INT16),
+    Column("dr.code", "driverCode", CATEGORY),
+    Column("dr.forename", "givenName", CATEGORY),
+    Column("dr.surname", "familyName", CATEGORY),
+    Column("dr.dob", "dateOfBirth", DATE),
+    Column("dr.nationality", "nationality", CATEGORY),
+    Column("dr.url", "url", CATEGORY),
+]
+
+
+@template(_DRIVER_INFORMATION_COLUMNS)
+def _driver_information_sql(f: Shape, select: str) -> str:
     query = textwrap.dedent(
         f"""
-        SELECT DISTINCT
-            c.constructorRef, c.name, c.nationality, c.url,
-            cs.points, cs.position, cs.positionText, cs.wins,
-            r.year, r.round
-        FROM constructors c, constructorStandings cs, races r
-        WHERE cs.raceId=r.raceId AND cs.constructorId=c.constructorId
-        {f"AND cs.positionText='{constructorStanding}'" if constructorStanding else ""}
-        {f"AND c.constructorRef='{constructor}'" if constructor else ""}
-        {f"AND r.year='{year}'" if year else ""}
-        {f"AND r.round='{race}'" if race else (f"AND r.round=(SELECT MAX(round) FROM driverStandings ds, races r WHERE ds.raceId=r.raceId AND r.year='{year}')" if year else "AND (r.year, r.round) IN (SELECT year, MAX(round) FROM races GROUP BY year)")}
-        ORDER BY r.year, cs.position
-        {f"LIMIT {offset}, {limit}" if offset and limit else ""}
+        SELECT DISTINCT {select}
+        FROM drivers dr
+        {", results re" if f & {"year", "constructor", "status", "grid", "result", "circuit", "fastest"} else ""}
+        {", races ra" if f & {"year", "circuit", "driverStanding", "constructorStanding"} else ""}
+        {", driverStandings ds" if f & {"driverStanding", "constructorStanding"} else ""}
+        {", constructorStandings cs" if "constructorStanding" in f else ""}
+        {", circuits ci" if "circuit" in f else ""}
+        {", constructors co" if "constructor" in f else ""}
+        WHERE TRUE
         """
     )
 
-    cur = con.cursor()
-    res = cur.execute(query).fetchall()
-    cur.close()
-
-    df = pd.DataFrame(
-        res,
-        columns=[
-            "constructorId",
-            "constructorName",
-            "nationality",
-            "url",
-            "points",
-            "position",
-            "positionText",
-            "wins",
-            "year",
-            "round",
-        ],
+    if f & {"driverStanding", "constructorStanding"}:
+        query = textwrap.dedent(
+            f"""
+            {query}
+            {"AND dr.driverId=re.driverId" if f & {"year", "constructor"} else ""}
+            {"AND re.raceId=ra.raceId" if "year" in f else ""}
+            {"AND re.constructorId=co.constructorId AND co.constructorRef=:constructor" if "constructor" in f else ""}
+            {"AND dr.driverRef=:driver" if "driver" in f else ""}
+            {"AND ds.positionText=CAST(:driverStanding AS TEXT)" if "driverStanding" in f else ""}
+            AND ds.raceId=ra.raceId
+            AND dr.driverId=ds.driverId
+            {"AND cs.raceId=ra.raceId AND cs.positionText=CAST(:constructorStanding AS TEXT)" if "constructorStanding" in f else ""}
+            {"AND co.constructorId=cs.constructorId" if {"constructor", "constructorStanding"} <= f else ""}
+            """
+        )
+    else:
+        query = textwrap.dedent(
+            f"""
+            {query}
+            {"AND dr.driverId=re.driverId" if f & {"year", "constructor", "status", "grid", "result", "circuit", "fastest"} else ""}
+            {"AND re.raceId=ra.raceId" if f & {"year", "circuit"} else ""}
+            {" AND ra.circuitId=ci.circuitId AND ci.circuitRef=:circuit" if "circuit" in f else ""}
+            {"AND re.constructorId=co.constructorId AND co.constructorRef=:constructor" if "constructor" in f else ""}
+            {"AND re.statusId=:status" if "status" in f else ""}
+            {"AND re.grid=:grid" if "grid" in f else ""}
+            {"AND re.rank=:fastest" if "fastest" in f else ""}
+            {"AND re.positionText=CAST(:result AS TEXT)" if "result" in f else ""}
+            {"AND dr.driverRef=:driver" if "driver" in f else ""}
+            """
+        )
+
+    query = textwrap.dedent(
+        f"""
+        {query}
+        {"AND ra.year=:year" if "year" in f else ""}
+        {"AND ra.round=:race" if "race" in f else (("AND ra.round=(SELECT MAX(round) FROM races WHERE races.year=:year)" if "year" in f else "AND (ra.year, ra.round) IN (SELECT year, MAX(round) FROM races GROUP BY year)") if f & {"driverStanding", "constructorStanding"} else "")}
+        ORDER BY dr.surname
+        {paginate(f)}
+        """
     )
-    return df
+    return query
 
 
+@instrumented
+@memoize
 def driver_information(
     *,
     year: Optional[int] = None,
@@ -683,6 +1117,8 @@ def driver_information(
     status: Optional[int] = None,
     constructorStanding: Optional[int] = None,
     driverStanding: Optional[int] = None,
+    columns: Optional[list[str]] = None,
+    compact: bool = False,
     offset: Optional[int] = None,
     limit: Optional[int] = None,
 ) -> pd.DataFrame:
@@ -716,10 +1152,14 @@ def driver_information(
         driverStanding (Optional[int], optional): Limit results by a final WDC position
             (e.g. only drivers that have finished a season in 3rd place).
             Defaults to None.
-        offset (Optional[int], optional): If specified along with limit will return
-            paginated results. Defaults to None.
-        limit (Optional[int], optional): If specified along with offset will return
-            paginated results. Defaults to None.
+        columns (Optional[list[str]], optional): Only select and return these columns
+            (e.g. ["year", "round"]). Defaults to None (all columns).
+        compact (bool, optional): Return categorical strings, downcast numbers and
+            parsed dates to reduce the memory footprint. Defaults to False.
+        offset (Optional[int], optional): Skip this many results, usually along with
+            limit. Defaults to None.
+        limit (Optional[int], optional): Return at most this many results.
+            Defaults to None.
 
     Raises:
         ValueError: Cannot combine standings with circuit, grid, result or status qualifiers.
@@ -735,83 +1175,73 @@ def driver_information(
             "Bad Request: Cannot combine standings with circuit, grid, result or status qualifiers."
         )
 
-    query = textwrap.dedent(
-        f"""
-        SELECT DISTINCT
-        dr.driverRef, dr.number, dr.code, dr.forename, dr.surname, dr.dob, dr.nationality, dr.url
-        FROM drivers dr
-        {", results re" if year or constructor or status or grid or result or circuit or fastest else ""}
-        {", races ra" if year or circuit or driverStanding or constructorStanding else ""}
-        {", driverStandings ds" if driverStanding or constructorStanding else ""}
-        {", constructorStandings cs" if constructorStanding else ""}
-        {", circuits ci" if circuit else ""}
-        {", constructors co" if constructor else ""}
-        WHERE TRUE
-        """
+    params = {
+        "year": year,
+        "race": race,
+        "circuit": circuit,
+        "constructor": constructor,
+        "driver": driver,
+        "grid": grid,
+        "result": result,
+        "fastest": fastest,
+        "status": status,
+        "constructorStanding": constructorStanding,
+        "driverStanding": driverStanding,
+        "offset": offset,
+        "limit": limit,
+    }
+    selected = project(_DRIVER_INFORMATION_COLUMNS, columns)
+    return fetch(
+        _driver_information_sql(shape(params), selected), params, selected, compact
     )
 
-    if driverStanding or constructorStanding:
-        query = textwrap.dedent(
-            f"""
-            {query}
-            {"AND dr.driverId=re.driverId" if year or constructor else ""}
-            {"AND re.raceId=ra.raceId" if year else ""}
-            {f"AND re.constructorId=co.constructorId AND co.constructorRef='{constructor}'" if constructor else ""}
-            {f"AND dr.driverRef='{driver}'" if driver else ""}
-            {f"AND ds.positionText='{driverStanding}'" if driverStanding else ""}
-            AND ds.raceId=ra.raceId
-            AND dr.driverId=ds.driverId
-            {f"AND cs.raceId=ra.raceId AND cs.positionText='{constructorStanding}'" if constructorStanding else ""}
-            {"AND co.constructorId=cs.constructorId" if constructor and constructorStanding else ""}
-            """
-        )
-    else:
-        query = textwrap.dedent(
-            f"""
-            {query}
-            {"AND dr.driverId=re.driverId" if year or constructor or status or grid or result or circuit or fastest else ""}
-            {"AND re.raceId=ra.raceId" if year or circuit else ""}
-            {f" AND ra.circuitId=ci.circuitId AND ci.circuitRef='{circuit}'" if circuit else ""}
-            {f"AND re.constructorId=co.constructorId AND co.constructorRef='{constructor}'" if constructor else ""}
-            {f"AND re.statusId='{status}'" if status else ""}
-            {f"AND re.grid='{grid}'" if grid else ""}
-            {f"AND re.rank='{fastest}'" if fastest else ""}
-            {f"AND re.positionText='{result}'" if result else ""}
-            {f"AND dr.driverRef='{driver}'" if driver else ""}
-            """
-        )
 
+_CONSTRUCTOR_INFORMATION_COLUMNS = [
+    Column("constructors.constructorRef", "constructorId", CATEGORY),
+    Column("constructors.name", "constructorName", CATEGORY),
+    Column("constructors.nationality", "nationality", CATEGORY),
+    Column("constructors.url", "url", CATEGORY),
+]
+
+
+@template(_CONSTRUCTOR_INFORMATION_COLUMNS)
+def _constructor_information_sql(f: Shape, select: str) -> str:
     query = textwrap.dedent(
         f"""
-        {query}
-        {f"AND ra.year='{year}'" if year else ""}
-        {f"AND ra.round='{race}'" if race else ((f"AND ra.round=(SELECT MAX(round) FROM races WHERE races.year='{year}')" if year else "AND (ra.year, ra.round) IN (SELECT year, MAX(round) FROM races GROUP BY year)") if driverStanding or constructorStanding else "")}
-        ORDER BY dr.surname
-        {f"LIMIT {offset}, {limit}" if offset and limit else ""}
+        SELECT DISTINCT {select}
+        FROM constructors
+        {", results" if f & {"year", "driver", "status", "grid", "result", "circuit", "fastest"} else ""}
+        {", races" if f & {"year", "circuit", "driverStanding", "constructorStanding"} else ""}
+        {", driverStandings" if "driverStanding" in f or {"constructorStanding", "driver"} <= f else ""}
+        {", constructorStandings" if "constructorStanding" in f else ""}
+        {", circuits" if "circuit" in f else ""}
+        {", drivers" if "driver" in f else ""}
+        WHERE TRUE
+        {"AND constructors.constructorId=results.constructorId" if f & {"year", "driver", "status", "grid", "result", "circuit", "fastest"} else ""}
+        {"AND results.raceId=races.raceId" if f & {"year", "circuit"} else ""}
+        {"AND races.circuitId=circuits.circuitId AND circuits.circuitRef=:circuit" if "circuit" in f else ""}
+        {"AND results.driverId=drivers.driverId AND drivers.driverRef=:driver" if "driver" in f else ""}
+        {"AND results.statusId=:status" if "status" in f else ""}
+        {"AND results.grid=:grid" if "grid" in f else ""}
+        {"AND results.rank=:fastest" if "fastest" in f else ""}
+        {"AND results.positionText=CAST(:result AS TEXT)" if "result" in f else ""}
+        {"AND constructors.constructorRef=:constructor" if "constructor" in f else ""}
+        {"AND driverStandings.positionText=CAST(:driverStanding AS TEXT) AND driverStandings.constructorId=constructors.constructorId" if "driverStanding" in f else ""}
+        {"AND driverStandings.raceId=races.raceId" if "driverStanding" in f or {"constructorStanding", "driver"} <= f else ""}
+        {"AND drivers.driverId=driverStandings.driverId" if f & {"driverStanding", "constructorStanding"} and "driver" in f else ""}
+        {"AND constructorStandings.positionText=CAST(:constructorStanding AS TEXT) AND constructorStandings.constructorId=constructors.constructorId AND constructorStandings.raceId=races.raceId" if "constructorStanding" in f else ""}
+        {"AND driverStandings.constructorId=constructorStandings.constructorId" if {"constructorStanding", "driver"} <= f else ""}
+        {"AND races.year=:year" if "year" in f else ""}
+        {"AND races.round=:race" if "race" in f else (("AND races.round=(SELECT MAX(round) FROM races WHERE races.year=:year)" if "year" in f else "AND (races.year, races.round) IN (SELECT year, MAX(round) FROM races GROUP BY year)") if f & {"driverStanding", "constructorStanding"} else "")}
+        ORDER BY constructors.name
+        {paginate(f)}
         """
     )
-
-    cur = con.cursor()
-    res = cur.execute(query).fetchall()
-    ress = json.dumps(res)
-    cur.close()
-
-    df = pd.DataFrame(
-        res,
-        columns=[
-            "driverId",
-            "permanentNumber",
-            "driverCode",
-            "givenName",
-            "familyName",
-            "dateOfBirth",
-            "nationality",
-            "url",
-        ],
-    )
-    return df
+    return query
 
 
+@instrumented
+@memoize
 def constructor_information(
     *,
     year: Optional[int] = None,
@@ -825,6 +1255,8 @@ def constructor_information(
     status: Optional[int] = None,
     constructorStanding: Optional[int] = None,
     driverStanding: Optional[int] = None,
+    columns: Optional[list[str]] = None,
+    compact: bool = False,
     offset: Optional[int] = None,
     limit: Optional[int] = None,
 ) -> pd.DataFrame:
@@ -858,10 +1290,14 @@ def constructor_information(
         driverStanding (Optional[int], optional): Limit results by a final WDC position
             (e.g. only drivers that have finished a season in 3rd place).
             Defaults to None.
-        offset (Optional[int], optional): If specified along with limit will return
-            paginated results. Defaults to None.
-        limit (Optional[int], optional): If specified along with offset will return
-            paginated results. Defaults to None.
+        columns (Optional[list[str]], optional): Only select and return these columns
+            (e.g. ["year", "round"]). Defaults to None (all columns).
+        compact (bool, optional): Return categorical strings, downcast numbers and
+            parsed dates to reduce the memory footprint. Defaults to False.
+        offset (Optional[int], optional): Skip this many results, usually along with
+            limit. Defaults to None.
+        limit (Optional[int], optional): Return at most this many results.
+            Defaults to None.
 
     Raises:
         ValueError: Cannot combine standings with circuit, grid, result or status qualifiers.
@@ -876,50 +1312,69 @@ def constructor_information(
             "Cannot combine standings with circuit, grid, result or status qualifiers."
         )
 
+    params = {
+        "year": year,
+        "race": race,
+        "circuit": circuit,
+        "constructor": constructor,
+        "driver": driver,
+        "grid": grid,
+        "result": result,
+        "fastest": fastest,
+        "status": status,
+        "constructorStanding": constructorStanding,
+        "driverStanding": driverStanding,
+        "offset": offset,
+        "limit": limit,
+    }
+    selected = project(_CONSTRUCTOR_INFORMATION_COLUMNS, columns)
+    return fetch(
+        _constructor_information_sql(shape(params), selected), params, selected, compact
+    )
+
+
+_CIRCUIT_INFORMATION_COLUMNS = [
+    Column("ci.circuitRef", "circuitId", CATEGORY),
+    Column("ci.name", "circuitName", CATEGORY),
+    Column("ci.location", "locality", CATEGORY),
+    Column("ci.country", "country", CATEGORY),
+    Column("ci.lat", "lat", FLOAT32),
+    Column("ci.lng", "long", FLOAT32),
+    Column("ci.url", "url", CATEGORY),
+]
+
+
+@template(_CIRCUIT_INFORMATION_COLUMNS)
+def _circuit_information_sql(f: Shape, select: str) -> str:
     query = textwrap.dedent(
         f"""
-        SELECT DISTINCT
-            constructors.constructorRef, constructors.name, constructors.nationality, constructors.url
-        FROM constructors
-        {", results" if year or driver or status or grid or result or circuit or fastest else ""}
-        {", races" if year or circuit or driverStanding or constructorStanding else ""}
-        {", driverStandings" if driverStanding or (constructorStanding and driver) else ""}
-        {", constructorStandings" if constructorStanding else ""}
-        {", circuits" if circuit else ""}
-        {", drivers" if driver else ""}
+        SELECT DISTINCT {select}
+        FROM circuits ci
+        {", races ra" if f & {"year", "driver", "constructor", "status", "grid", "fastest", "result"} else ""}
+        {", results re" if f & {"driver", "constructor", "status", "grid", "fastest", "result"} else ""}
+        {", drivers dr" if "driver" in f else ""}
+        {", constructors co" if "constructor" in f else ""}
         WHERE TRUE
-        {"AND constructors.constructorId=results.constructorId" if year or driver or status or grid or result or circuit or fastest else ""}
-        {"AND results.raceId=races.raceId" if year or circuit else ""}
-        {f"AND races.circuitId=circuits.circuitId AND circuits.circuitRef='{circuit}'" if circuit else ""}
-        {f"AND results.driverId=drivers.driverId AND drivers.driverRef='{driver}'" if driver else ""}
-        {f"AND results.statusId='{status}'" if status else ""}
-        {f"AND results.grid='{grid}'" if grid else ""}
-        {f"AND results.rank='{fastest}'" if fastest else ""}
-        {f"AND results.positionText='{result}'" if result else ""}
-        {f"AND constructors.constructorRef='{constructor}'" if constructor else ""}
-        {f"AND driverStandings.positionText='{driverStanding}' AND driverStandings.constructorId=constructors.constructorId" if driverStanding else ""}
-        {"AND driverStandings.raceId=races.raceId" if driverStanding or (constructorStanding and driver) else ""}
-        {"AND drivers.driverId=driverStandings.driverId" if (driverStanding or constructorStanding) and driver else ""}
-        {f"AND constructorStandings.positionText='{constructorStanding}' AND constructorStandings.constructorId=constructors.constructorId AND constructorStandings.raceId=races.raceId" if constructorStanding else ""}
-        {"AND driverStandings.constructorId=constructorStandings.constructorId" if constructorStanding and driver else ""}
-        {f"AND races.year='{year}'" if year else ""}
-        {f"AND races.round='{race}'" if race else ((f"AND races.round=(SELECT MAX(round) FROM races WHERE races.year='{year}')" if year else "AND (races.year, races.round) IN (SELECT year, MAX(round) FROM races GROUP BY year)") if driverStanding or constructorStanding else "")}
-        ORDER BY constructors.name
-        {f"LIMIT {offset}, {limit}" if offset and limit else ""}
+        {"AND ra.circuitId=ci.circuitId" if f & {"year", "driver", "constructor", "status", "grid", "fastest", "result"} else ""}
+        {"AND ci.circuitRef=:circuit" if "circuit" in f else ""}
+        {"AND re.raceId=ra.raceId" if f & {"driver", "constructor", "status", "grid", "fastest", "result"} else ""}
+        {"AND re.constructorId=co.constructorId AND co.constructorRef=:constructor" if "constructor" in f else ""}
+        {"AND re.driverId=dr.driverId AND dr.driverRef=:driver" if "driver" in f else ""}
+        {"AND re.statusId=:status" if "status" in f else ""}
+        {"AND re.grid=:grid" if "grid" in f else ""}
+        {"AND re.rank=:fastest" if "fastest" in f else ""}
+        {"AND re.positionText=CAST(:result AS TEXT)" if "result" in f else ""}
+        {"AND ra.year=:year" if "year" in f else ""}
+        {"AND ra.round=:race" if "race" in f else ""}
+        ORDER BY ci.circuitRef
+        {paginate(f)}
         """
     )
-
-    cur = con.cursor()
-    res = cur.execute(query).fetchall()
-    cur.close()
-
-    df = pd.DataFrame(
-        res,
-        columns=["constructorId", "constructorName", "nationality", "url"],
-    )
-    return df
+    return query
 
 
+@instrumented
+@memoize
 def circuit_information(
     *,
     year: Optional[int] = None,
@@ -931,6 +1386,8 @@ def circuit_information(
     result: Optional[int] = None,
     fastest: Optional[int] = None,
     status: Optional[int] = None,
+    columns: Optional[list[str]] = None,
+    compact: bool = False,
     offset: Optional[int] = None,
     limit: Optional[int] = None,
 ) -> pd.DataFrame:
@@ -958,60 +1415,78 @@ def circuit_information(
         status (Optional[int], optional): Limit results to a specific race outcome
             (e.g. 1 means finished). This is fairly useless since you cant know in
             advance what the statusIds are. Defaults to None.
-        offset (Optional[int], optional): If specified along with limit will return
-            paginated results. Defaults to None.
-        limit (Optional[int], optional): If specified along with offset will return
-            paginated results. Defaults to None.
+        columns (Optional[list[str]], optional): Only select and return these columns
+            (e.g. ["year", "round"]). Defaults to None (all columns).
+        compact (bool, optional): Return categorical strings, downcast numbers and
+            parsed dates to reduce the memory footprint. Defaults to False.
+        offset (Optional[int], optional): Skip this many results, usually along with
+            limit. Defaults to None.
+        limit (Optional[int], optional): Return at most this many results.
+            Defaults to None.
 
     Returns:
         pd.DataFrame: Pandas DataFrame with circuit list for the given criteria.
     """
 
+    params = {
+        "year": year,
+        "race": race,
+        "circuit": circuit,
+        "constructor": constructor,
+        "driver": driver,
+        "grid": grid,
+        "result": result,
+        "fastest": fastest,
+        "status": status,
+        "offset": offset,
+        "limit": limit,
+    }
+    selected = project(_CIRCUIT_INFORMATION_COLUMNS, columns)
+    return fetch(
+        _circuit_information_sql(shape(params), selected), params, selected, compact
+    )
+
+
+_FINISHING_STATUS_COLUMNS = [
+    Column("st.statusId", "statusId", INT16),
+    Column("st.status", "status", CATEGORY),
+    Column("COUNT(*)", "count", INT32),
+]
+
+
+@template(_FINISHING_STATUS_COLUMNS)
+def _finishing_status_sql(f: Shape, select: str) -> str:
     query = textwrap.dedent(
         f"""
-        SELECT DISTINCT
-            ci.circuitRef, ci.name, ci.location, ci.country, ci.lat, ci.lng, ci.url
-        FROM circuits ci
-        {", races ra" if year or driver or constructor or status or grid or fastest or result else ""}
-        {", results re" if driver or constructor or status or grid or fastest or result else ""}
-        {", drivers dr" if driver else ""}
-        {", constructors co" if constructor else ""}
+        SELECT {select}
+        FROM status st
+        {", races ra" if f & {"year", "race", "circuit"} else ""}
+        , results re
+        {", drivers dr" if "driver" in f else ""}
+        {", constructors co" if "constructor" in f else ""}
+        {", circuits ci" if "circuit" in f else ""}
         WHERE TRUE
-        {"AND ra.circuitId=ci.circuitId" if year or driver or constructor or status or grid or fastest or result else ""}
-        {f"AND ci.circuitRef='{circuit}'" if circuit else ""}
-        {"AND re.raceId=ra.raceId" if driver or constructor or status or grid or fastest or result else ""}
-        {f"AND re.constructorId=co.constructorId AND co.constructorRef='{constructor}'" if constructor else ""}
-        {f"AND re.driverId=dr.driverId AND dr.driverRef='{driver}'" if driver else ""}
-        {f"AND re.statusId='{status}'" if status else ""}
-        {f"AND re.grid='{grid}'" if grid else ""}
-        {f"AND re.rank='{fastest}'" if fastest else ""}
-        {f"AND re.positionText='{result}'" if result else ""}
-        {f"AND ra.year='{year}'" if year else ""}
-        {f"AND ra.round='{race}'" if race else ""}
-        ORDER BY ci.circuitRef
-        {f"LIMIT {offset}, {limit}" if offset and limit else ""}
+        {"AND st.statusId=:status" if "status" in f else ""}
+        AND re.statusId=st.statusId
+        {"AND re.raceId=ra.raceId" if f & {"year", "race", "circuit"} else ""}
+        {"AND re.raceId=:race_id" if "race_id" in f else ""}
+        {"AND re.constructorId=co.constructorId AND co.constructorRef=:constructor" if "constructor" in f else ""}
+        {"AND re.driverId=dr.driverId AND dr.driverRef=:driver" if "driver" in f else ""}
+        {"AND ra.circuitId=ci.circuitId AND ci.circuitRef=:circuit" if "circuit" in f else ""}
+        {"AND re.grid=:grid" if "grid" in f else ""}
+        {"AND re.rank=:fastest" if "fastest" in f else ""}
+        {"AND re.positionText=CAST(:result AS TEXT)" if "result" in f else ""}
+        {"AND ra.year=:year" if "year" in f else ""}
+        {"AND ra.round=:race" if "race" in f else ""}
+        GROUP BY st.statusId, st.status ORDER BY st.statusId
+        {paginate(f)}
         """
     )
-
-    cur = con.cursor()
-    res = cur.execute(query).fetchall()
-    cur.close()
-
-    df = pd.DataFrame(
-        res,
-        columns=[
-            "circuitId",
-            "circuitName",
-            "locality",
-            "country",
-            "lat",
-            "long",
-            "url",
-        ],
-    )
-    return df
+    return query
 
 
+@instrumented
+@memoize
 def finishing_status(
     *,
     year: Optional[int] = None,
@@ -1023,6 +1498,8 @@ def finishing_status(
     result: Optional[int] = None,
     fastest: Optional[int] = None,
     status: Optional[int] = None,
+    columns: Optional[list[str]] = None,
+    compact: bool = False,
     offset: Optional[int] = None,
     limit: Optional[int] = None,
 ) -> pd.DataFrame:
@@ -1048,214 +1525,655 @@ def finishing_status(
         status (Optional[int], optional): Limit results to a specific race outcome
             (e.g. 1 means finished). This is fairly useless since you cant know in
             advance what the statusIds are. Defaults to None.
-        offset (Optional[int], optional): If specified along with limit will return
-            paginated results. Defaults to None.
-        limit (Optional[int], optional): If specified along with offset will return
-            paginated results. Defaults to None.
+        columns (Optional[list[str]], optional): Only select and return these columns
+            (e.g. ["year", "round"]). Defaults to None (all columns).
+        compact (bool, optional): Return categorical strings, downcast numbers and
+            parsed dates to reduce the memory footprint. Defaults to False.
+        offset (Optional[int], optional): Skip this many results, usually along with
+            limit. Defaults to None.
+        limit (Optional[int], optional): Return at most this many results.
+            Defaults to None.
 
     Returns:
         pd.DataFrame: Pandas DataFrame with race status codes for the given criteria.
     """
 
+    params = {
+        "year": year,
+        "race": race,
+        "circuit": circuit,
+        "constructor": constructor,
+        "driver": driver,
+        "grid": grid,
+        "result": result,
+        "fastest": fastest,
+        "status": status,
+        "offset": offset,
+        "limit": limit,
+    }
+    selected = project(_FINISHING_STATUS_COLUMNS, columns)
+    race_id = raceindex.resolve(year, race, circuit)
+    if race_id is not None:  # Filter the fact table by raceId directly
+        params.update(year=None, race=None, circuit=None, race_id=race_id)
+    return fetch(
+        _finishing_status_sql(shape(params), selected), params, selected, compact
+    )
+
+
+_LAP_TIMES_COLUMNS = [
+    Column("ra.year", "year", INT16),
+    Column("ra.round", "round", INT16),
+    Column("ra.name", "raceName", CATEGORY),
+    Column("ra.date", "date", DATE),
+    Column("ra.time", "time", CATEGORY),
+    Column("ra.url", "url", CATEGORY),
+    Column("ci.circuitRef", "circuitId", CATEGORY),
+    Column("ci.name", "circuitName", CATEGORY),
+    Column("ci.location", "locality", CATEGORY),
+    Column("ci.country", "country", CATEGORY),
+    Column("ci.url", "circuitUrl", CATEGORY),
+    Column("ci.lat", "lat", FLOAT32),
+    Column("ci.lng", "long", FLOAT32),
+    Column("ci.alt", "altitude", INT16),
+    Column("dr.driverRef", "driverId", CATEGORY),
+    Column("la.lap", "lap", INT16),
+    Column("la.position", "position", INT16),
+    Column("la.time", "lapTime", CATEGORY),
+    Column("la.milliseconds", "millis", INT32),
+]
+
+
+@template(_LAP_TIMES_COLUMNS)
+def _lap_times_sql(f: Shape, select: str) -> str:
     query = textwrap.dedent(
         f"""
-        SELECT DISTINCT st.statusId, st.status, COUNT(*)
-        FROM status st
-        {", races ra" if year or race or circuit else ""}
-        , results re
-        {", drivers dr" if driver else ""}
-        {", constructors co" if constructor else ""}
-        {", circuits ci" if circuit else ""}
-        WHERE TRUE
-        {f"AND st.statusId='{status}'" if status else ""}
-        AND re.statusId=st.statusId
-        {"AND re.raceId=ra.raceId" if year or race or circuit else ""}
-        {f"AND re.constructorId=co.constructorId AND co.constructorRef='{constructor}'" if constructor else ""}
-        {f"AND re.driverId=dr.driverId AND dr.driverRef='{driver}'" if driver else ""}
-        {f"AND ra.circuitId=ci.circuitId AND ci.circuitRef='{circuit}'" if circuit else ""}
-        {f"AND re.grid='{grid}'" if grid else ""}
-        {f"AND re.rank='{fastest}'" if fastest else ""}
-        {f"AND re.positionText='{result}'" if result else ""}
-        {f"AND ra.year='{year}'" if year else ""}
-        {f"AND ra.round='{race}'" if race else ""}
-        GROUP BY st.statusId ORDER BY st.statusId
-        {f"LIMIT {offset}, {limit}" if offset and limit else ""} 
+        SELECT {select}
+        FROM lapTimes la, races ra, circuits ci, drivers dr
+        WHERE ra.circuitId=ci.circuitId
+            AND la.driverId=dr.driverId
+            AND la.raceId=ra.raceId
+            {"AND la.raceId=:race_id" if "race_id" in f else ""}
+            {"AND ra.year=:year" if "year" in f else ""}
+            {"AND ra.round=:race" if "race" in f else ""}
+            {"AND ra.year>=:start_year" if "start_year" in f else ""}
+            {"AND ra.year<=:end_year" if "end_year" in f else ""}
+            {"AND la.lap=:lap" if "lap" in f else ""}
+            {"AND dr.driverRef=:driver" if "driver" in f else ""}
+            {"AND (ra.year, ra.round) >= (:after_year, :after_round) AND (ra.year, ra.round, la.lap, la.position, la.driverId) > (:after_year, :after_round, :after_lap, :after_position, :after_driver)" if "after_year" in f else ""}
+        ORDER BY ra.year, ra.round, la.lap, la.position{", la.driverId" if "keyset" in f else ""}
+        {paginate(f)}
         """
     )
-
-    cur = con.cursor()
-    res = cur.execute(query).fetchall()
-    cur.close()
-
-    df = pd.DataFrame(
-        res,
-        columns=[
-            "statusId",
-            "status",
-            "count",
-        ],
-    )
-    return df
+    return query
 
 
+@instrumented
+@memoize
 def lap_times(
-    year: int,
-    race: int,
+    year: Optional[int] = None,
+    race: Optional[int] = None,
     *,
+    start_year: Optional[int] = None,
+    end_year: Optional[int] = None,
     lap: Optional[int] = None,
     driver: Optional[str] = None,
+    columns: Optional[list[str]] = None,
+    compact: bool = False,
     offset: Optional[int] = None,
     limit: Optional[int] = None,
 ) -> pd.DataFrame:
     """
     Lap time data is available from the 1996 season onwards.
-    Lap time queries require the season, round and lap number to be specified.
+    Lap time queries usually specify the season and round. If they are omitted, laps
+    for every race (optionally limited to a range of seasons) are returned in a single
+    query, ordered by season and round so they can be grouped by year/round.
 
     Args:
-        year (int): Season calendar year, should be from 1996 onwards.
-        race (int): Race round in the selected calendar year.
+        year (Optional[int], optional): Season calendar year, should be from 1996
+            onwards. Defaults to None.
+        race (Optional[int], optional): Race round in the selected calendar year.
+            Defaults to None.
+        start_year (Optional[int], optional): Limit results to seasons from this year
+            onwards (inclusive). Defaults to None.
+        end_year (Optional[int], optional): Limit results to seasons up to this year
+            (inclusive). Defaults to None.
         lap (Optional[int], optional): Limit results to a specific lap. Defaults to None.
         driver (Optional[str], optional): Limit results to a specific driver
             (e.g. alonso). Defaults to None.
-        offset (Optional[int], optional): If specified along with limit will return
-            paginated results. Defaults to None.
-        limit (Optional[int], optional): If specified along with offset will return
-            paginated results. Defaults to None.
+        columns (Optional[list[str]], optional): Only select and return these columns
+            (e.g. ["year", "round"]). Defaults to None (all columns).
+        compact (bool, optional): Return categorical strings, downcast numbers and
+            parsed dates to reduce the memory footprint. Defaults to False.
+        offset (Optional[int], optional): Skip this many results, usually along with
+            limit. Defaults to None.
+        limit (Optional[int], optional): Return at most this many results.
+            Defaults to None.
 
     Returns:
         pd.DataFrame: Pandas DataFrame with race laps for the given criteria.
     """
 
+    params = {
+        "year": year,
+        "race": race,
+        "start_year": start_year,
+        "end_year": end_year,
+        "lap": lap,
+        "driver": driver,
+        "offset": offset,
+        "limit": limit,
+    }
+    selected = project(_LAP_TIMES_COLUMNS, columns)
+    if columnar.is_enabled():
+        return columnar.read(
+            "lap_times",
+            _lap_times_sql,
+            _LAP_TIMES_COLUMNS,
+            selected,
+            year=year,
+            start_year=start_year,
+            end_year=end_year,
+            filters={"round": race, "lap": lap, "driverId": driver},
+            offset=offset,
+            limit=limit,
+            compact=compact,
+        )
+    race_id = raceindex.resolve(year, race)
+    if race_id is not None:  # Filter the fact table by raceId directly
+        params.update(year=None, race=None, race_id=race_id)
+    return fetch(_lap_times_sql(shape(params), selected), params, selected, compact)
+
+
+@instrumented
+def iter_lap_times(
+    year: Optional[int] = None,
+    race: Optional[int] = None,
+    *,
+    start_year: Optional[int] = None,
+    end_year: Optional[int] = None,
+    lap: Optional[int] = None,
+    driver: Optional[str] = None,
+    columns: Optional[list[str]] = None,
+    compact: bool = False,
+    chunk_size: int = CHUNK_SIZE,
+    by_race: bool = False,
+) -> Iterator[pd.DataFrame]:
+    """
+    Streams the lap times for the specified query. Rows are fetched chunk_size at a
+    time, so the whole history can be processed with bounded memory. Always reads
+    from SQLite, the columnar cache is not used.
+
+    Args:
+        year (Optional[int], optional): Season calendar year, should be from 1996
+            onwards. Defaults to None.
+        race (Optional[int], optional): Race round in the selected calendar year.
+            Defaults to None.
+        start_year (Optional[int], optional): Limit results to seasons from this year
+            onwards (inclusive). Defaults to None.
+        end_year (Optional[int], optional): Limit results to seasons up to this year
+            (inclusive). Defaults to None.
+        lap (Optional[int], optional): Limit results to a specific lap. Defaults to None.
+        driver (Optional[str], optional): Limit results to a specific driver
+            (e.g. alonso). Defaults to None.
+        columns (Optional[list[str]], optional): Only select and return these columns
+            (e.g. ["year", "round"]). Defaults to None (all columns).
+        compact (bool, optional): Return categorical strings, downcast numbers and
+            parsed dates to reduce the memory footprint. Defaults to False.
+        chunk_size (int, optional): Number of rows fetched at once.
+            Defaults to CHUNK_SIZE.
+        by_race (bool, optional): Yield one DataFrame per race instead of one per
+            chunk, requires the year and round columns. Defaults to False.
+
+    Returns:
+        Iterator[pd.DataFrame]: Pandas DataFrames with consecutive lap times.
+    """
+
+    params = {
+        "year": year,
+        "race": race,
+        "start_year": start_year,
+        "end_year": end_year,
+        "lap": lap,
+        "driver": driver,
+    }
+    selected = project(_LAP_TIMES_COLUMNS, columns)
+    return stream(
+        _lap_times_sql(shape(params), selected),
+        params,
+        selected,
+        compact,
+        chunk_size,
+        ["year", "round"] if by_race else None,
+    )
+
+
+# Unique sort key of the keyset paginated lap times
+_LAP_TIMES_KEYS = (
+    Column("ra.year", "after_year"),
+    Column("ra.round", "after_round"),
+    Column("la.lap", "after_lap"),
+    Column("la.position", "after_position"),
+    Column("la.driverId", "after_driver"),
+)
+
+
+@instrumented
+def lap_times_page(
+    year: Optional[int] = None,
+    race: Optional[int] = None,
+    *,
+    start_year: Optional[int] = None,
+    end_year: Optional[int] = None,
+    lap: Optional[int] = None,
+    driver: Optional[str] = None,
+    columns: Optional[list[str]] = None,
+    compact: bool = False,
+    limit: int = PAGE_SIZE,
+    token: Optional[str] = None,
+) -> Page:
+    """
+    Obtain one page of the lap times for the specified query. Pages continue after
+    the last row of the previous page (keyset pagination), so unlike offset they cost
+    the same however deep they are. Always reads from SQLite, the columnar cache is
+    not used.
+
+    Args:
+        year (Optional[int], optional): Season calendar year, should be from 1996
+            onwards. Defaults to None.
+        race (Optional[int], optional): Race round in the selected calendar year.
+            Defaults to None.
+        start_year (Optional[int], optional): Limit results to seasons from this year
+            onwards (inclusive). Defaults to None.
+        end_year (Optional[int], optional): Limit results to seasons up to this year
+            (inclusive). Defaults to None.
+        lap (Optional[int], optional): Limit results to a specific lap. Defaults to None.
+        driver (Optional[str], optional): Limit results to a specific driver
+            (e.g. alonso). Defaults to None.
+        columns (Optional[list[str]], optional): Only select and return these columns
+            (e.g. ["year", "round"]). Defaults to None (all columns).
+        compact (bool, optional): Return categorical strings, downcast numbers and
+            parsed dates to reduce the memory footprint. Defaults to False.
+        limit (int, optional): Number of lap times per page. Defaults to PAGE_SIZE.
+        token (Optional[str], optional): Continuation token of the previous page, only
+            valid with the same filters. Defaults to None (first page).
+
+    Raises:
+        ValueError: limit is not positive or the token belongs to another query.
+
+    Returns:
+        Page: Pandas DataFrame with the page of lap times and the token of the next
+            page, None on the last page.
+    """
+
+    params = {
+        "year": year,
+        "race": race,
+        "start_year": start_year,
+        "end_year": end_year,
+        "lap": lap,
+        "driver": driver,
+    }
+    selected = project(_LAP_TIMES_COLUMNS, columns)
+    return fetch_page(
+        _lap_times_sql, params, selected, _LAP_TIMES_KEYS, limit, token, compact
+    )
+
+
+_LAP_CUMULATIVE_COLUMNS = [
+    Column("ra.year", "year", INT16),
+    Column("ra.round", "round", INT16),
+    Column("dr.driverRef", "driverId", CATEGORY),
+    Column("lc.lap", "lap", INT16),
+    Column("lc.milliseconds", "millis", INT32),
+    Column("lc.cumulativeMilliseconds", "cumulativeMillis", INT32),
+    Column("lc.gapMilliseconds", "gapMillis", INT32),
+]
+
+
+@template(_LAP_CUMULATIVE_COLUMNS)
+def _lap_cumulative_sql(f: Shape, select: str) -> str:
     query = textwrap.dedent(
         f"""
-        SELECT
-            ra.year, ra.round, ra.name, ra.date, ra.time, ra.url, 
-            ci.circuitRef, ci.name, ci.location, ci.country, ci.url, ci.lat, ci.lng, ci.alt,
-            dr.driverRef,
-            la.lap, la.position, la.time, la.milliseconds
-        FROM lapTimes la, races ra, circuits ci, drivers dr
-        WHERE ra.circuitId=ci.circuitId
-            AND la.driverId=dr.driverId
-            AND la.raceId=ra.raceId
-            AND ra.year='{year}'
-            AND ra.round='{race}'
-            {f"AND la.lap='{lap}'" if lap else ""}
-            {f"AND dr.driverRef='{driver}'" if driver else ""}
-        ORDER BY la.lap, la.position
-        {f"LIMIT {offset}, {limit}" if offset and limit else ""}
+        SELECT {select}
+        FROM lapCumulative lc, races ra, drivers dr
+        WHERE lc.raceId=ra.raceId
+            AND lc.driverId=dr.driverId
+            {"AND lc.raceId=:race_id" if "race_id" in f else ""}
+            {"AND ra.year=:year" if "year" in f else ""}
+            {"AND ra.round=:race" if "race" in f else ""}
+            {"AND ra.year>=:start_year" if "start_year" in f else ""}
+            {"AND ra.year<=:end_year" if "end_year" in f else ""}
+            {"AND lc.lap=:lap" if "lap" in f else ""}
+            {"AND dr.driverRef=:driver" if "driver" in f else ""}
+        ORDER BY ra.year, ra.round, lc.lap, lc.cumulativeMilliseconds
+        {paginate(f)}
         """
     )
+    return query
+
+
+@instrumented
+@memoize
+def lap_cumulative(
+    year: Optional[int] = None,
+    race: Optional[int] = None,
+    *,
+    start_year: Optional[int] = None,
+    end_year: Optional[int] = None,
+    lap: Optional[int] = None,
+    driver: Optional[str] = None,
+    columns: Optional[list[str]] = None,
+    compact: bool = False,
+    offset: Optional[int] = None,
+    limit: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Obtain the cumulative race time of every driver and the gap to the leader at the
+    end of every lap, ordered by lap and race position. Reads the derived
+    lapCumulative table, which has to be built first with ergast.cumulative.
+
+    Args:
+        year (Optional[int], optional): Season calendar year, should be from 1996
+            onwards. Defaults to None.
+        race (Optional[int], optional): Race round in the selected calendar year.
+            Defaults to None.
+        start_year (Optional[int], optional): Limit results to seasons from this year
+            onwards (inclusive). Defaults to None.
+        end_year (Optional[int], optional): Limit results to seasons up to this year
+            (inclusive). Defaults to None.
+        lap (Optional[int], optional): Limit results to a specific lap. Defaults to None.
+        driver (Optional[str], optional): Limit results to a specific driver
+            (e.g. alonso). Defaults to None.
+        columns (Optional[list[str]], optional): Only select and return these columns
+            (e.g. ["year", "round"]). Defaults to None (all columns).
+        compact (bool, optional): Return categorical strings, downcast numbers and
+            parsed dates to reduce the memory footprint. Defaults to False.
+        offset (Optional[int], optional): Skip this many results, usually along with
+            limit. Defaults to None.
+        limit (Optional[int], optional): Return at most this many results.
+            Defaults to None.
+
+    Returns:
+        pd.DataFrame: Pandas DataFrame with cumulative lap times for the given
+            criteria.
+    """
+
+    params = {
+        "year": year,
+        "race": race,
+        "start_year": start_year,
+        "end_year": end_year,
+        "lap": lap,
+        "driver": driver,
+        "offset": offset,
+        "limit": limit,
+    }
+    race_id = raceindex.resolve(year, race)
+    if race_id is not None:  # Filter the fact table by raceId directly
+        params.update(year=None, race=None, race_id=race_id)
+    selected = project(_LAP_CUMULATIVE_COLUMNS, columns)
+    return fetch(
+        _lap_cumulative_sql(shape(params), selected), params, selected, compact
+    )
+
+
+@instrumented
+def iter_lap_cumulative(
+    year: Optional[int] = None,
+    race: Optional[int] = None,
+    *,
+    start_year: Optional[int] = None,
+    end_year: Optional[int] = None,
+    lap: Optional[int] = None,
+    driver: Optional[str] = None,
+    columns: Optional[list[str]] = None,
+    compact: bool = False,
+    chunk_size: int = CHUNK_SIZE,
+    by_race: bool = False,
+) -> Iterator[pd.DataFrame]:
+    """
+    Streams the cumulative lap times for the specified query (see lap_cumulative).
+    Rows are fetched chunk_size at a time, so the whole history can be processed with
+    bounded memory.
+
+    Args:
+        year (Optional[int], optional): Season calendar year, should be from 1996
+            onwards. Defaults to None.
+        race (Optional[int], optional): Race round in the selected calendar year.
+            Defaults to None.
+        start_year (Optional[int], optional): Limit results to seasons from this year
+            onwards (inclusive). Defaults to None.
+        end_year (Optional[int], optional): Limit results to seasons up to this year
+            (inclusive). Defaults to None.
+        lap (Optional[int], optional): Limit results to a specific lap. Defaults to None.
+        driver (Optional[str], optional): Limit results to a specific driver
+            (e.g. alonso). Defaults to None.
+        columns (Optional[list[str]], optional): Only select and return these columns
+            (e.g. ["year", "round"]). Defaults to None (all columns).
+        compact (bool, optional): Return categorical strings, downcast numbers and
+            parsed dates to reduce the memory footprint. Defaults to False.
+        chunk_size (int, optional): Number of rows fetched at once.
+            Defaults to CHUNK_SIZE.
+        by_race (bool, optional): Yield one DataFrame per race instead of one per
+            chunk, requires the year and round columns. Defaults to False.
+
+    Returns:
+        Iterator[pd.DataFrame]: Pandas DataFrames with consecutive cumulative lap
+            times.
+    """
+
+    params = {
+        "year": year,
+        "race": race,
+        "start_year": start_year,
+        "end_year": end_year,
+        "lap": lap,
+        "driver": driver,
+    }
+    selected = project(_LAP_CUMULATIVE_COLUMNS, columns)
+    return stream(
+        _lap_cumulative_sql(shape(params), selected),
+        params,
+        selected,
+        compact,
+        chunk_size,
+        ["year", "round"] if by_race else None,
+    )
+
 
-    cur = con.cursor()
-    res = cur.execute(query).fetchall()
-    cur.close()
-
-    df = pd.DataFrame(
-        res,
-        columns=[
-            "year",
-            "round",
-            "raceName",
-            "date",
-            "time",
-            "url",
-            "circuitId",
-            "circuitName",
-            "locality",
-            "country",
-            "circuitUrl",
-            "lat",
-            "long",
-            "altitude",
-            "driverId",
-            "lap",
-            "position",
-            "lapTime",
-            "millis",
-        ],
+_PIT_STOPS_COLUMNS = [
+    Column("ra.year", "year", INT16),
+    Column("ra.round", "round", INT16),
+    Column("ra.name", "raceName", CATEGORY),
+    Column("ra.date", "date", DATE),
+    Column("ra.time", "time", CATEGORY),
+    Column("ra.url", "url", CATEGORY),
+    Column("ci.circuitRef", "circuitId", CATEGORY),
+    Column("ci.name", "circuitName", CATEGORY),
+    Column("ci.location", "locality", CATEGORY),
+    Column("ci.country", "country", CATEGORY),
+    Column("ci.url", "circuitUrl", CATEGORY),
+    Column("ci.lat", "lat", FLOAT32),
+    Column("ci.lng", "long", FLOAT32),
+    Column("ci.alt", "altitude", INT16),
+    Column("dr.driverRef", "driverId", CATEGORY),
+    Column("pi.stop", "pitstop", INT16),
+    Column("pi.lap", "lap", INT16),
+    Column("pi.time", "localTime", CATEGORY),  # TODO: I dont like this tbh
+    Column("pi.duration", "pitstopDuration", CATEGORY),
+    Column("pi.milliseconds", "durationMilliseconds", INT32),
+]
+
+
+@template(_PIT_STOPS_COLUMNS)
+def _pit_stops_sql(f: Shape, select: str) -> str:
+    query = textwrap.dedent(
+        f"""
+        SELECT {select}
+        FROM pitStops pi, races ra, circuits ci, drivers dr
+        WHERE ra.circuitId=ci.circuitId
+            AND pi.driverId=dr.driverId
+            AND pi.raceId=ra.raceId
+            {"AND pi.raceId=:race_id" if "race_id" in f else ""}
+            {"AND ra.year=:year" if "year" in f else ""}
+            {"AND ra.round=:race" if "race" in f else ""}
+            {"AND ra.year>=:start_year" if "start_year" in f else ""}
+            {"AND ra.year<=:end_year" if "end_year" in f else ""}
+            {"AND pi.stop=:pitstop" if "pitstop" in f else ""}
+            {"AND pi.lap=:lap" if "lap" in f else ""}
+            {"AND dr.driverRef=:driver" if "driver" in f else ""}
+        ORDER BY ra.year, ra.round, pi.time, pi.driverId, pi.stop
+        {paginate(f)}
+        """
     )
-    return df
+    return query
 
 
+@instrumented
+@memoize
 def pit_stops(
-    year: int,
-    race: int,
+    year: Optional[int] = None,
+    race: Optional[int] = None,
     *,
+    start_year: Optional[int] = None,
+    end_year: Optional[int] = None,
     pitstop: Optional[int] = None,
     lap: Optional[int] = None,
     driver: Optional[str] = None,
+    columns: Optional[list[str]] = None,
+    compact: bool = False,
     offset: Optional[int] = None,
     limit: Optional[int] = None,
 ) -> pd.DataFrame:
     """
     Pit stop data is available from the 2012 season onwards.
-    Pit stop queries require a season and a round to be specified.
+    Pit stop queries usually specify a season and a round. If they are omitted, stops
+    for every race (optionally limited to a range of seasons) are returned in a single
+    query, ordered by season and round so they can be grouped by year/round.
 
     Args:
-        year (int): Season calendar year, should be from 2012 onwards.
-        race (int): Race round in the selected calendar year.
+        year (Optional[int], optional): Season calendar year, should be from 2012
+            onwards. Defaults to None.
+        race (Optional[int], optional): Race round in the selected calendar year.
+            Defaults to None.
+        start_year (Optional[int], optional): Limit results to seasons from this year
+            onwards (inclusive). Defaults to None.
+        end_year (Optional[int], optional): Limit results to seasons up to this year
+            (inclusive). Defaults to None.
         pitstop (Optional[int], optional): The number of pitstop (e.g. 3 will only
             return the third pitstop for each driver). Defaults to None.
         lap (Optional[int], optional): Limit result to a single specified lap.
             Defaults to None.
         driver (Optional[str], optional): Limit results to a specific driver
             (e.g. alonso). Defaults to None.
-        offset (Optional[int], optional): If specified along with limit will return
-            paginated results. Defaults to None.
-        limit (Optional[int], optional): If specified along with offset will return
-            paginated results. Defaults to None.
+        columns (Optional[list[str]], optional): Only select and return these columns
+            (e.g. ["year", "round"]). Defaults to None (all columns).
+        compact (bool, optional): Return categorical strings, downcast numbers and
+            parsed dates to reduce the memory footprint. Defaults to False.
+        offset (Optional[int], optional): Skip this many results, usually along with
+            limit. Defaults to None.
+        limit (Optional[int], optional): Return at most this many results.
+            Defaults to None.
 
     Returns:
         pd.DataFrame: Pandas DataFrame with pitstops for the given criteria.
     """
 
-    query = textwrap.dedent(
-        f"""
-        SELECT
-            ra.year, ra.round, ra.name, ra.date, ra.time, ra.url, 
-            ci.circuitRef, ci.name, ci.location, ci.country, ci.url, ci.lat, ci.lng, ci.alt,
-            dr.driverRef,
-            pi.stop, pi.lap, pi.time, pi.duration, pi.milliseconds
-        FROM pitStops pi, races ra, circuits ci, drivers dr
-        WHERE ra.circuitId=ci.circuitId
-            AND pi.driverId=dr.driverId
-            AND pi.raceId=ra.raceId
-            AND ra.year='{year}' AND ra.round='{race}'
-            {f"AND pi.stop='{pitstop}'" if pitstop else ""}
-            {f"AND pi.lap='{lap}'" if lap else ""}
-            {f"AND dr.driverRef='{driver}'" if driver else ""}
-        ORDER BY pi.time
-        {f"LIMIT {offset}, {limit}" if offset and limit else ""}
-        """
-    )
+    params = {
+        "year": year,
+        "race": race,
+        "start_year": start_year,
+        "end_year": end_year,
+        "pitstop": pitstop,
+        "lap": lap,
+        "driver": driver,
+        "offset": offset,
+        "limit": limit,
+    }
+    selected = project(_PIT_STOPS_COLUMNS, columns)
+    if columnar.is_enabled():
+        return columnar.read(
+            "pit_stops",
+            _pit_stops_sql,
+            _PIT_STOPS_COLUMNS,
+            selected,
+            year=year,
+            start_year=start_year,
+            end_year=end_year,
+            filters={"round": race, "pitstop": pitstop, "lap": lap, "driverId": driver},
+            offset=offset,
+            limit=limit,
+            compact=compact,
+        )
+    race_id = raceindex.resolve(year, race)
+    if race_id is not None:  # Filter the fact table by raceId directly
+        params.update(year=None, race=None, race_id=race_id)
+    return fetch(_pit_stops_sql(shape(params), selected), params, selected, compact)
+
+
+@instrumented
+def iter_pit_stops(
+    year: Optional[int] = None,
+    race: Optional[int] = None,
+    *,
+    start_year: Optional[int] = None,
+    end_year: Optional[int] = None,
+    pitstop: Optional[int] = None,
+    lap: Optional[int] = None,
+    driver: Optional[str] = None,
+    columns: Optional[list[str]] = None,
+    compact: bool = False,
+    chunk_size: int = CHUNK_SIZE,
+    by_race: bool = False,
+) -> Iterator[pd.DataFrame]:
+    """
+    Streams the pit stops for the specified query. Rows are fetched chunk_size at a
+    time, so the whole history can be processed with bounded memory. Always reads
+    from SQLite, the columnar cache is not used.
+
+    Args:
+        year (Optional[int], optional): Season calendar year, should be from 2012
+            onwards. Defaults to None.
+        race (Optional[int], optional): Race round in the selected calendar year.
+            Defaults to None.
+        start_year (Optional[int], optional): Limit results to seasons from this year
+            onwards (inclusive). Defaults to None.
+        end_year (Optional[int], optional): Limit results to seasons up to this year
+            (inclusive). Defaults to None.
+        pitstop (Optional[int], optional): The number of pitstop (e.g. 3 will only
+            return the third pitstop for each driver). Defaults to None.
+        lap (Optional[int], optional): Limit result to a single specified lap.
+            Defaults to None.
+        driver (Optional[str], optional): Limit results to a specific driver
+            (e.g. alonso). Defaults to None.
+        columns (Optional[list[str]], optional): Only select and return these columns
+            (e.g. ["year", "round"]). Defaults to None (all columns).
+        compact (bool, optional): Return categorical strings, downcast numbers and
+            parsed dates to reduce the memory footprint. Defaults to False.
+        chunk_size (int, optional): Number of rows fetched at once.
+            Defaults to CHUNK_SIZE.
+        by_race (bool, optional): Yield one DataFrame per race instead of one per
+            chunk, requires the year and round columns. Defaults to False.
+
+    Returns:
+        Iterator[pd.DataFrame]: Pandas DataFrames with consecutive pit stops.
+    """
 
-    cur = con.cursor()
-    res = cur.execute(query).fetchall()
-    cur.close()
-
-    df = pd.DataFrame(
-        res,
-        columns=[
-            "year",
-            "round",
-            "raceName",
-            "date",
-            "time",
-            "url",
-            "circuitId",
-            "circuitName",
-            "locality",
-            "country",
-            "circuitUrl",
-            "lat",
-            "long",
-            "altitude",
-            "driverId",
-            "pitstop",
-            "lap",
-            "localTime",  # TODO: I dont like this tbh
-            "pitstopDuration",
-            "durationMilliseconds",
-        ],
+    params = {
+        "year": year,
+        "race": race,
+        "start_year": start_year,
+        "end_year": end_year,
+        "pitstop": pitstop,
+        "lap": lap,
+        "driver": driver,
+    }
+    selected = project(_PIT_STOPS_COLUMNS, columns)
+    return stream(
+        _pit_stops_sql(shape(params), selected),
+        params,
+        selected,
+        compact,
+        chunk_size,
+        ["year", "round"] if by_race else None,
     )
-    return df
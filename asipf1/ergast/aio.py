@@ -0,0 +1,120 @@
+"""
+Asyncio variants of the ergast endpoints.
+
+Every endpoint is mirrored as a coroutine with the same signature, which runs the
+query on a bounded thread pool so it never blocks the event loop. Each worker thread
+keeps its own read-only connection (see ergast.db.get_connection). Concurrent calls
+with the same normalized arguments are coalesced into a single execution, every
+caller receives its own copy of the result.
+
+    import ergast.aio
+
+    laps = await ergast.aio.lap_times(2022, 1)
+"""
+import asyncio
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, wraps
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+import ergast
+import pandas as pd
+from ergast.memo import call_key
+
+MAX_WORKERS = 4  # Number of queries executed at once
+
+_executor: Optional[ThreadPoolExecutor] = None
+_max_workers = MAX_WORKERS
+_inflight: dict[tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Future] = {}
+_lock = threading.Lock()
+
+
+def configure(*, max_workers: int) -> None:
+    """
+    Changes the number of worker threads, running queries are allowed to finish.
+
+    Args:
+        max_workers (int): Maximum number of queries executed at once.
+
+    Raises:
+        ValueError: max_workers is not positive.
+    """
+    global _executor, _max_workers
+
+    if max_workers <= 0:
+        raise ValueError("At least one worker is required.")
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        _executor = None
+        _max_workers = max_workers
+
+
+def shutdown() -> None:
+    """Waits for the running queries and stops the worker threads."""
+    global _executor
+
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Obtain the worker pool, creating it on first use."""
+    global _executor
+
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(_max_workers, thread_name_prefix="ergast")
+        return _executor
+
+
+def _coroutine(
+    endpoint: Callable[..., pd.DataFrame]
+) -> Callable[..., Awaitable[pd.DataFrame]]:
+    """
+    Turns an ergast endpoint into a coroutine executed on the worker pool.
+
+    Args:
+        endpoint (Callable[..., pd.DataFrame]): Ergast endpoint.
+
+    Returns:
+        Callable[..., Awaitable[pd.DataFrame]]: Coroutine function with the signature
+            of the endpoint.
+    """
+    signature = inspect.signature(endpoint)
+
+    @wraps(endpoint)
+    async def call(*args: Any, **kwargs: Any) -> pd.DataFrame:
+        loop = asyncio.get_running_loop()
+        key = (loop, call_key(endpoint, signature, args, kwargs))
+
+        future = _inflight.get(key)
+        if future is None:  # No identical query running, start one
+            future = loop.run_in_executor(
+                _get_executor(), partial(endpoint, *args, **kwargs)
+            )
+            _inflight[key] = future
+            future.add_done_callback(lambda _: _inflight.pop(key, None))
+
+        # Shielded, so a cancelled caller does not cancel the query of the others
+        df = await asyncio.shield(future)
+        return df.copy()
+
+    return call
+
+
+season_list = _coroutine(ergast.season_list)
+race_schedule = _coroutine(ergast.race_schedule)
+race_results = _coroutine(ergast.race_results)
+qualifying_results = _coroutine(ergast.qualifying_results)
+driver_standings = _coroutine(ergast.driver_standings)
+constructor_standings = _coroutine(ergast.constructor_standings)
+driver_information = _coroutine(ergast.driver_information)
+constructor_information = _coroutine(ergast.constructor_information)
+circuit_information = _coroutine(ergast.circuit_information)
+finishing_status = _coroutine(ergast.finishing_status)
+lap_times = _coroutine(ergast.lap_times)
+pit_stops = _coroutine(ergast.pit_stops)
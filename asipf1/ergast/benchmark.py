@@ -0,0 +1,151 @@
+"""
+Micro-benchmark of the ergast result materialization paths and backends.
+
+Compares building the DataFrame from the fetchall() row tuples (fetch) with decoding
+the rows into per column NumPy arrays (fetch_arrays) for the full history queries of
+the biggest endpoints. With --backends it instead compares running the same queries
+on SQLite and on DuckDB (see ergast.duck), attached to the database image or reading
+its Parquet export. Run from the repository root with:
+
+    PYTHONPATH=asipf1 python -m ergast.benchmark [--database PATH] [--repeat N]
+        [--backends] [--parquet FOLDER]
+"""
+import argparse
+import statistics
+import time
+import tracemalloc
+from typing import Callable, NamedTuple, Optional
+
+import ergast
+import pandas as pd
+from ergast import db
+from ergast.db import DATABASE_FILE_PATH
+from ergast.query import Columns, fetch, fetch_arrays, project, shape
+
+ENDPOINTS = ["lap_times", "race_results"]
+
+
+class Result(NamedTuple):
+    endpoint: str
+    path: str  # Materialization path or backend
+    rows: int
+    seconds: float  # Median wall time
+    peak: int  # Peak traced memory in bytes
+
+
+def measure(
+    materialize: Callable[[str, dict, Columns], pd.DataFrame],
+    endpoint: str,
+    repeat: int,
+) -> tuple[int, float, int]:
+    """
+    Times the full history query of an endpoint with one materialization path.
+
+    Args:
+        materialize (Callable[[str, dict, Columns], pd.DataFrame]): fetch or
+            fetch_arrays.
+        endpoint (str): Name of the ergast endpoint (e.g. lap_times).
+        repeat (int): Number of timed runs.
+
+    Returns:
+        tuple[int, float, int]: Number of rows, median seconds and peak bytes.
+    """
+    selected = project(getattr(ergast, f"_{endpoint.upper()}_COLUMNS"))
+    query = getattr(ergast, f"_{endpoint}_sql")(shape({}), selected)
+
+    materialize(query, {}, selected)  # Warm up the page cache and statement cache
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df = materialize(query, {}, selected)
+        times.append(time.perf_counter() - start)
+        del df
+
+    tracemalloc.start()
+    rows = len(materialize(query, {}, selected).index)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rows, statistics.median(times), peak
+
+
+def run(database: str = DATABASE_FILE_PATH, repeat: int = 5) -> list[Result]:
+    """
+    Benchmarks both materialization paths and prints the comparison.
+
+    Args:
+        database (str, optional): Path to the SQLite database image.
+            Defaults to DATABASE_FILE_PATH.
+        repeat (int, optional): Number of timed runs per path. Defaults to 5.
+
+    Returns:
+        list[Result]: Measurements of every endpoint and path.
+    """
+    db.configure(database=database)
+    results = []
+    for endpoint in ENDPOINTS:
+        for materialize in (fetch, fetch_arrays):
+            rows, seconds, peak = measure(materialize, endpoint, repeat)
+            results.append(Result(endpoint, materialize.__name__, rows, seconds, peak))
+    report(results)
+    return results
+
+
+def run_backends(
+    database: str = DATABASE_FILE_PATH, parquet: Optional[str] = None, repeat: int = 5
+) -> list[Result]:
+    """
+    Benchmarks the full history queries on both backends and prints the comparison.
+    The peak memory only traces Python allocations, not the memory of the engines.
+
+    Args:
+        database (str, optional): Path to the SQLite database image.
+            Defaults to DATABASE_FILE_PATH.
+        parquet (Optional[str], optional): Folder with the Parquet export read by
+            DuckDB. Defaults to None (attach the database image).
+        repeat (int, optional): Number of timed runs per backend. Defaults to 5.
+
+    Returns:
+        list[Result]: Measurements of every endpoint and backend.
+    """
+    results = []
+    try:
+        for backend in db.BACKENDS:
+            db.configure(
+                database=database,
+                backend=backend,
+                parquet=parquet if backend == "duckdb" and parquet else "",
+            )
+            for endpoint in ENDPOINTS:
+                rows, seconds, peak = measure(fetch_arrays, endpoint, repeat)
+                results.append(Result(endpoint, backend, rows, seconds, peak))
+    finally:
+        db.configure(backend="sqlite", parquet="")
+    report(results)
+    return results
+
+
+def report(results: list[Result]) -> None:
+    """Prints the measurements as a table."""
+    print(f"{'endpoint':<14}{'path':<14}{'rows':>10}{'median ms':>12}{'peak MiB':>10}")
+    for result in results:
+        print(
+            f"{result.endpoint:<14}{result.path:<14}{result.rows:>10}"
+            f"{result.seconds * 1000:>12.1f}{result.peak / 2**20:>10.1f}"
+        )
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database", default=DATABASE_FILE_PATH)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--backends", action="store_true", help="Compare backends")
+    parser.add_argument("--parquet", help="Parquet export read by DuckDB")
+    args = parser.parse_args(argv)
+    if args.backends:
+        run_backends(args.database, args.parquet, args.repeat)
+    else:
+        run(args.database, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
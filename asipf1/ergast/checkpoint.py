@@ -0,0 +1,187 @@
+"""
+Checkpoint store of the per race results of the analyses.
+
+Every race result is stored in the checkpoints.sqlite file under the name of the
+analysis, the raceId and a digest of the race's source rows, and is committed as soon
+as the race is computed. Regenerating a dataset then only recomputes the races that
+are new or whose source rows changed (e.g. after updating the dump), and an
+interrupted run resumes with the races it did not finish. The digests are stored too,
+keyed on the database file version (see ergast.db.source), so the source rows are
+only hashed again after the database file changed.
+"""
+import hashlib
+import pickle
+import sqlite3
+from contextlib import closing
+from typing import Any, Collection, Optional, Sequence
+
+from ergast import raceindex
+from ergast.db import DATA_FOLDER_PATH, get_connection, source
+
+CHECKPOINT_FILE_PATH = DATA_FOLDER_PATH + "/checkpoints.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    analysis TEXT NOT NULL,
+    raceId INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    result BLOB NOT NULL,
+    PRIMARY KEY (analysis, raceId)
+);
+CREATE TABLE IF NOT EXISTS digests (
+    tables TEXT NOT NULL,
+    raceId INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    PRIMARY KEY (tables, raceId)
+);
+"""
+
+
+def race_digests(
+    tables: Sequence[str], race_ids: Optional[Collection[int]] = None
+) -> dict[int, str]:
+    """
+    Hashes the rows of every race in the given tables.
+
+    Args:
+        tables (Sequence[str]): Tables with a raceId column, e.g. lapTimes.
+        race_ids (Optional[Collection[int]], optional): Only hash these races.
+            Defaults to None (every race).
+
+    Returns:
+        dict[int, str]: raceId -> SHA-256 digest of its rows, races without any row
+            are left out.
+    """
+    where, params = "", []
+    if race_ids is not None:
+        params = sorted(race_ids)
+        where = f" WHERE raceId IN ({', '.join('?' * len(params))})"
+    rows: dict[int, list[str]] = {}
+    con = get_connection()
+    for table in tables:
+        for row in con.execute(f'SELECT raceId, * FROM "{table}"{where}', params):
+            rows.setdefault(row[0], []).append(f"{table}{row[1:]!r}")
+
+    # The rows are sorted so the digest does not depend on the storage order
+    return {
+        race_id: hashlib.sha256("\n".join(sorted(race_rows)).encode()).hexdigest()
+        for race_id, race_rows in rows.items()
+    }
+
+
+class Store:
+    """Per race results of an analysis, valid while the source rows are unchanged."""
+
+    def __init__(
+        self,
+        analysis: str,
+        tables: Sequence[str],
+        version: int = 1,
+        path: str = CHECKPOINT_FILE_PATH,
+    ) -> None:
+        """
+        Args:
+            analysis (str): Name of the analysis, e.g. gap_dnf.
+            tables (Sequence[str]): Tables the per race results are computed from.
+            version (int, optional): Version of the analysis, bump it whenever the
+                per race computation changes. Defaults to 1.
+            path (str, optional): Path to the checkpoint file.
+                Defaults to CHECKPOINT_FILE_PATH.
+        """
+        self.analysis = analysis
+        self.path = path
+        self._version = version
+        self._tables = tables
+        self._digests: dict[int, str] = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        con = sqlite3.connect(self.path)
+        con.executescript(_SCHEMA)
+        return con
+
+    def _load_digests(self, con: sqlite3.Connection, race_ids: set[int]) -> None:
+        """
+        Obtain the digests of the races, only hashing the source rows of the races
+        without a digest of the current database file version.
+        """
+        tables, current = ",".join(self._tables), repr(source())
+        self._digests |= {
+            race_id: digest
+            for race_id, digest in con.execute(
+                "SELECT raceId, digest FROM digests WHERE tables=? AND source=?",
+                (tables, current),
+            )
+            if race_id in race_ids
+        }
+        missing = race_ids.difference(self._digests)
+        if not missing:
+            return
+
+        # Races without any source row are stored with an empty digest
+        digests = dict.fromkeys(missing, "") | race_digests(self._tables, missing)
+        with con:
+            con.executemany(
+                "INSERT OR REPLACE INTO digests VALUES (?, ?, ?, ?)",
+                [(tables, race_id, current, d) for race_id, d in digests.items()],
+            )
+        self._digests.update(digests)
+
+    def _digest(self, race_id: int) -> str:
+        return f"{self._version}:{self._digests.get(race_id, '')}"
+
+    def load(self, races: Sequence[tuple[int, int]]) -> dict[tuple[int, int], Any]:
+        """
+        Obtain the stored results of the races whose source rows are unchanged, the
+        source rows are only hashed again after the database file changed.
+
+        Args:
+            races (Sequence[tuple[int, int]]): Year and round of the races.
+
+        Returns:
+            dict[tuple[int, int], Any]: (year, round) -> result of the race.
+        """
+        race_ids = raceindex.get_index().race_ids
+        selected = {race_ids[key] for key in races if key in race_ids}
+        with closing(self._connect()) as con:
+            self._digests = {}
+            self._load_digests(con, selected)
+            stored = {
+                race_id: (digest, result)
+                for race_id, digest, result in con.execute(
+                    "SELECT raceId, digest, result FROM checkpoints WHERE analysis=?",
+                    (self.analysis,),
+                )
+                if race_id in selected
+            }
+
+        results = {}
+        for key in races:
+            race_id = race_ids.get(key)
+            if race_id in stored and stored[race_id][0] == self._digest(race_id):
+                results[key] = pickle.loads(stored[race_id][1])
+        return results
+
+    def save(self, race: tuple[int, int], result: Any) -> None:
+        """
+        Stores and commits the result of a race, replacing the previous one. The
+        source rows of a race that was not loaded before are hashed first.
+
+        Args:
+            race (tuple[int, int]): Year and round of the race.
+            result (Any): Picklable result of the race.
+        """
+        race_id = raceindex.get_index().race_ids[race]
+        with closing(self._connect()) as con:
+            if race_id not in self._digests:
+                self._load_digests(con, {race_id})
+            with con:
+                con.execute(
+                    "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?)",
+                    (
+                        self.analysis,
+                        race_id,
+                        self._digest(race_id),
+                        pickle.dumps(result),
+                    ),
+                )
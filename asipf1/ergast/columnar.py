@@ -0,0 +1,395 @@
+"""
+Optional columnar cache of the denormalized ergast query results.
+
+When enabled, lap_times, pit_stops and race_results materialize their output once per
+season into Parquet files and serve later calls by memory-mapping and filtering those
+files, skipping SQLite and the Python tuple construction. The cache is wiped whenever
+the database file changes, the files of an endpoint whenever its query or columns
+change. The cache is shared by the worker processes of ergast.parallel, validating it
+holds a lock file next to the cache folder. Requires the optional pyarrow dependency
+(>= 14).
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+import pandas as pd
+from ergast.db import DATA_FOLDER_PATH, database_path, get_connection
+from ergast.query import (
+    INT16,
+    INT32,
+    Column,
+    Columns,
+    Shape,
+    counting,
+    downcast,
+    fetch,
+    shape,
+    unique_names,
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows, locked with msvcrt instead
+    fcntl = None
+    import msvcrt
+
+COLUMNAR_FOLDER_PATH = DATA_FOLDER_PATH + "/columnar"
+SOURCE_FILE_NAME = "source.json"
+
+_folder: Optional[Path] = None
+_lock = threading.Lock()
+
+
+def enable(folder: str = COLUMNAR_FOLDER_PATH) -> None:
+    """
+    Enables the columnar cache.
+
+    Args:
+        folder (str, optional): Folder in which the Parquet files are stored.
+            Defaults to COLUMNAR_FOLDER_PATH.
+
+    Raises:
+        ImportError: pyarrow is not installed.
+    """
+    global _folder
+
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise ImportError("The columnar cache requires pyarrow to be installed.") from e
+    _folder = Path(folder)
+
+
+def disable() -> None:
+    """Disables the columnar cache, the files are kept on disk."""
+    global _folder
+
+    _folder = None
+
+
+def is_enabled() -> bool:
+    return _folder is not None
+
+
+def folder() -> Path:
+    """Obtain the folder of the Parquet files, the default one while disabled."""
+    return _folder if _folder is not None else Path(COLUMNAR_FOLDER_PATH)
+
+
+def _source_fingerprint() -> dict[str, Any]:
+    """
+    Identifies the current database file, any change to it invalidates the cache.
+
+    Returns:
+        dict[str, Any]: Database path, size and modification time.
+    """
+    path = database_path()
+    stat = path.stat()
+    return {"path": str(path), "size": stat.st_size, "mtime": stat.st_mtime_ns}
+
+
+@contextmanager
+def _folder_lock(folder: Path) -> Iterator[None]:
+    """
+    Serializes the validation of a cache folder across threads and processes, the
+    lock file is kept next to the folder since the folder itself may be wiped.
+
+    Args:
+        folder (Path): Cache folder.
+    """
+    folder.parent.mkdir(parents=True, exist_ok=True)
+    with _lock, open(folder.parent / f".{folder.name}.lock", "a+b") as file:
+        if fcntl is not None:
+            fcntl.flock(file, fcntl.LOCK_EX)  # Released when the file is closed
+            yield
+            return
+        file.seek(0)
+        while True:
+            try:
+                msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+                break
+            except OSError:  # Gives up after 10 attempts, keep waiting
+                continue
+        try:
+            yield
+        finally:
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _validate(folder: Path) -> None:
+    """
+    Wipes the cached files if they were materialized from a different database file.
+
+    Args:
+        folder (Path): Cache folder.
+    """
+    fingerprint = _source_fingerprint()
+    source_file = folder / SOURCE_FILE_NAME
+    with _folder_lock(folder):
+        if source_file.exists():
+            source = json.loads(source_file.read_text())
+            source.pop("endpoints", None)  # Validated per endpoint
+            if source == fingerprint:
+                return
+        if folder.exists():
+            shutil.rmtree(folder)
+        folder.mkdir(parents=True, exist_ok=True)
+        source_file.write_text(json.dumps(fingerprint))
+
+
+def _endpoint_fingerprint(
+    build_sql: Callable[[Shape], str], columns: list[Column]
+) -> dict[str, Any]:
+    """
+    Identifies the query and the columns of the season files of an endpoint, any
+    change to them invalidates the cached files of the endpoint.
+
+    Args:
+        build_sql (Callable[[Shape], str]): SQL template builder of the endpoint.
+        columns (list[Column]): Every column the endpoint can return.
+
+    Returns:
+        dict[str, Any]: SHA-256 digest of the season query and the column names.
+    """
+    sql = build_sql(shape({"year": 1}))  # Same shape as the materialized seasons
+    return {
+        "sql": hashlib.sha256(sql.encode()).hexdigest(),
+        "columns": unique_names([column.name for column in columns]),
+    }
+
+
+def _validate_endpoint(
+    folder: Path,
+    endpoint: str,
+    build_sql: Callable[[Shape], str],
+    columns: list[Column],
+) -> None:
+    """
+    Wipes the cached files of an endpoint if they were materialized by a different
+    query or with different columns, the fingerprints are kept in the source file.
+
+    Args:
+        folder (Path): Cache folder.
+        endpoint (str): Name of the ergast endpoint.
+        build_sql (Callable[[Shape], str]): SQL template builder of the endpoint.
+        columns (list[Column]): Every column the endpoint can return.
+    """
+    fingerprint = _endpoint_fingerprint(build_sql, columns)
+    source_file = folder / SOURCE_FILE_NAME
+    with _folder_lock(folder):
+        source = json.loads(source_file.read_text())
+        endpoints = source.setdefault("endpoints", {})
+        if endpoints.get(endpoint) == fingerprint:
+            return
+        if (folder / endpoint).exists():
+            shutil.rmtree(folder / endpoint)
+        endpoints[endpoint] = fingerprint
+        source_file.write_text(json.dumps(source))
+
+
+def _season_file(
+    folder: Path,
+    endpoint: str,
+    season: int,
+    build_sql: Callable[[Shape], str],
+    columns: list[Column],
+) -> Path:
+    """
+    Obtain the Parquet file of an endpoint season, materializing it if needed.
+
+    Args:
+        folder (Path): Cache folder.
+        endpoint (str): Name of the ergast endpoint.
+        season (int): Season calendar year.
+        build_sql (Callable[[Shape], str]): SQL template builder of the endpoint.
+        columns (list[Column]): Every column the endpoint can return.
+
+    Returns:
+        Path: Path to the Parquet file.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    path = folder / endpoint / f"{season}.parquet"
+    if not path.exists():
+        params = {"year": season}
+        with counting(False):  # Materialized even while an endpoint is counted
+            df = fetch(build_sql(shape(params)), params, columns)
+        df.columns = unique_names([column.name for column in columns])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique per process and thread, concurrent writers replace the same file
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp_path)
+        os.replace(tmp_path, path)
+    return path
+
+
+def season_files(
+    endpoint: str,
+    build_sql: Callable[[Shape], str],
+    columns: list[Column],
+    *,
+    year: Optional[int] = None,
+    start_year: Optional[int] = None,
+    end_year: Optional[int] = None,
+    cache_folder: Optional[Path] = None,
+) -> list[Path]:
+    """
+    Obtain the Parquet files of the selected seasons of an endpoint, materializing
+    the missing ones. Their columns have the unique names (see unique_names).
+
+    Args:
+        endpoint (str): Name of the ergast endpoint (e.g. lap_times).
+        build_sql (Callable[[Shape], str]): SQL template builder of the endpoint.
+        columns (list[Column]): Every column the endpoint can return.
+        year (Optional[int], optional): Season calendar year. Defaults to None.
+        start_year (Optional[int], optional): First season (inclusive).
+            Defaults to None.
+        end_year (Optional[int], optional): Last season (inclusive). Defaults to None.
+        cache_folder (Optional[Path], optional): Cache folder. Defaults to None
+            (see folder).
+
+    Returns:
+        list[Path]: Paths to the Parquet files in season order.
+    """
+    cache_folder = cache_folder or folder()
+    _validate(cache_folder)
+    _validate_endpoint(cache_folder, endpoint, build_sql, columns)
+    seasons = [
+        season
+        for (season,) in get_connection().execute(
+            "SELECT DISTINCT year FROM races ORDER BY year"
+        )
+        if (not year or season == year)
+        and (not start_year or season >= start_year)
+        and (not end_year or season <= end_year)
+    ]
+    return [
+        _season_file(cache_folder, endpoint, season, build_sql, columns)
+        for season in seasons
+    ]
+
+
+def _subset_types(table: Any, selected: Columns) -> Any:
+    """
+    Casts the columns of a subset of the season rows to the types pandas infers from
+    the same rows fetched from SQLite, the season files keep the types of the whole
+    season (e.g. an integer column with NULLs in the season but not in the subset is
+    int64 again, a column with only NULLs in the subset is an object column of None).
+    """
+    import pyarrow as pa
+
+    for i, column in enumerate(selected):
+        array = table.column(i)
+        if array.null_count == len(array):
+            table = table.set_column(i, table.field(i).name, pa.nulls(len(array)))
+        elif (
+            column.dtype in (INT16, INT32)  # Stored as float64 when a season has NULLs
+            and pa.types.is_floating(array.type)
+            and array.null_count == 0
+        ):
+            try:
+                table = table.set_column(i, table.field(i).name, array.cast(pa.int64()))
+            except pa.ArrowInvalid:  # Not integral, kept as floats like SQLite REALs
+                pass
+    return table.replace_schema_metadata(None)  # The pandas dtypes of the season
+
+
+def read(
+    endpoint: str,
+    build_sql: Callable[[Shape], str],
+    columns: list[Column],
+    selected: Columns,
+    *,
+    year: Optional[int] = None,
+    start_year: Optional[int] = None,
+    end_year: Optional[int] = None,
+    filters: Optional[dict[str, Any]] = None,
+    offset: Optional[int] = None,
+    limit: Optional[int] = None,
+    compact: bool = False,
+) -> pd.DataFrame:
+    """
+    Serves an endpoint call from the per season Parquet files.
+
+    Args:
+        endpoint (str): Name of the ergast endpoint (e.g. lap_times).
+        build_sql (Callable[[Shape], str]): SQL template builder of the endpoint, used
+            to materialize missing season files.
+        columns (list[Column]): Every column the endpoint can return.
+        selected (Columns): Columns to read and return.
+        year (Optional[int], optional): Season calendar year. Defaults to None.
+        start_year (Optional[int], optional): First season (inclusive).
+            Defaults to None.
+        end_year (Optional[int], optional): Last season (inclusive). Defaults to None.
+        filters (Optional[dict[str, Any]], optional): Column name -> value equality
+            filters, unset (falsy) values are ignored. Defaults to None.
+        offset (Optional[int], optional): Skip this many results, usually along with
+            limit. Defaults to None.
+        limit (Optional[int], optional): Return at most this many results.
+            Defaults to None.
+        compact (bool, optional): Convert the columns to their compact dtypes.
+            Defaults to False.
+
+    Returns:
+        pd.DataFrame: Pandas DataFrame identical to the one built from SQLite.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+
+    if _folder is None:
+        raise RuntimeError("The columnar cache is not enabled.")
+    files = season_files(
+        endpoint,
+        build_sql,
+        columns,
+        year=year,
+        start_year=start_year,
+        end_year=end_year,
+        cache_folder=_folder,
+    )
+    names = unique_names([column.name for column in columns])
+    fields = [names[columns.index(column)] for column in selected]
+    filter_fields: dict[str, tuple[str, Any]] = {}
+    for column, unique_name in zip(columns, names):
+        value = (filters or {}).get(column.name)
+        if value and column.name not in filter_fields:  # First occurrence only
+            filter_fields[column.name] = (unique_name, value)
+    read_fields = list(dict.fromkeys(fields + [f for f, _ in filter_fields.values()]))
+
+    tables = [
+        pq.read_table(path, columns=read_fields, memory_map=True) for path in files
+    ]
+    if not tables:
+        return pd.DataFrame([], columns=[column.name for column in selected])
+    table = pa.concat_tables(tables, promote_options="permissive")
+
+    for field_name, value in filter_fields.values():
+        field = table.schema.field(field_name)
+        if pa.types.is_null(field.type):  # Column without any values
+            table = table.slice(0, 0)
+            continue
+        value = pa.scalar(value).cast(field.type)
+        table = table.filter(pc.equal(table[field_name], value))
+    if offset is not None or limit is not None:
+        table = table.slice(offset or 0, limit)
+
+    table = table.select(fields)
+    if not table.num_rows:  # Like a DataFrame of no SQLite rows
+        df = pd.DataFrame([], columns=[column.name for column in selected])
+    else:
+        if filter_fields or offset is not None or limit is not None:
+            table = _subset_types(table, selected)
+        df = table.to_pandas()
+        df.columns = [column.name for column in selected]
+    if compact:
+        downcast(df, selected)
+    return df
@@ -0,0 +1,160 @@
+"""
+Builds the derived lapCumulative table in the f1db.sqlite image.
+
+For every lap time it stores the cumulative race time of the driver and the gap to the
+leader at the end of that lap, so the gap analysis reads them with an indexed lookup
+instead of summing the lap times of every race on every run. Only races whose lap
+times are new or changed since the last build are (re)computed. Run from the
+repository root with:
+
+    PYTHONPATH=asipf1 python -m ergast.cumulative [--database PATH] [--rebuild]
+"""
+import argparse
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from ergast.db import DATABASE_FILE_PATH, get_connection, source, table_names
+
+TABLE = "lapCumulative"
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS {TABLE} (
+    raceId INTEGER NOT NULL,
+    driverId INTEGER NOT NULL,
+    lap INTEGER NOT NULL,
+    milliseconds INTEGER,
+    cumulativeMilliseconds INTEGER,
+    gapMilliseconds INTEGER,
+    PRIMARY KEY (raceId, driverId, lap)
+);
+CREATE INDEX IF NOT EXISTS idx_{TABLE}_raceId_lap
+    ON {TABLE} (raceId, lap, cumulativeMilliseconds);
+"""
+
+# Races with a lap time that is not materialized as is (new, changed or moved to
+# another driver or lap) or with a materialized lap time that was removed
+_STALE_RACES = f"""
+SELECT raceId FROM (
+    SELECT raceId, driverId, lap, milliseconds FROM lapTimes
+    EXCEPT
+    SELECT raceId, driverId, lap, milliseconds FROM {TABLE}
+)
+UNION
+SELECT raceId FROM (
+    SELECT raceId, driverId, lap, milliseconds FROM {TABLE}
+    EXCEPT
+    SELECT raceId, driverId, lap, milliseconds FROM lapTimes
+)
+"""
+
+# The leader is the driver with the lowest cumulative time at the end of the lap
+_INSERT = f"""
+INSERT INTO {TABLE}
+SELECT raceId, driverId, lap, milliseconds, cumulative,
+    cumulative - MIN(cumulative) OVER (PARTITION BY raceId, lap)
+FROM (
+    SELECT raceId, driverId, lap, milliseconds, SUM(milliseconds)
+        OVER (PARTITION BY raceId, driverId ORDER BY lap) AS cumulative
+    FROM lapTimes
+    WHERE raceId IN (SELECT raceId FROM temp.staleRaces)
+)
+"""
+
+_built: dict[tuple, bool] = {}
+_lock = threading.Lock()
+
+
+def is_built() -> bool:
+    """
+    Checks whether the configured database (or its Parquet export) has an up to date
+    lapCumulative table. A table that misses lap time changes made since it was built
+    is not used, the check runs once per database file version.
+
+    Returns:
+        bool: The table exists and matches the lap times.
+    """
+    key = source()
+    with _lock:
+        if key not in _built:
+            _built[key] = TABLE in table_names() and not _is_stale()
+        return _built[key]
+
+
+def _is_stale() -> bool:
+    """Checks whether any race of the lapCumulative table differs from lapTimes."""
+    (stale,) = get_connection().execute(f"SELECT EXISTS ({_STALE_RACES})").fetchone()
+    if stale:
+        print(
+            f"{TABLE} is out of date, reading lapTimes instead. Rebuild it with "
+            "`python -m ergast.cumulative`."
+        )
+    return bool(stale)
+
+
+def build(con: sqlite3.Connection, rebuild: bool = False) -> int:
+    """
+    Creates the lapCumulative table and (re)computes the races that are new or whose
+    lap times changed since the last build.
+
+    Args:
+        con (sqlite3.Connection): Writable database connection.
+        rebuild (bool, optional): Recompute every race. Defaults to False.
+
+    Returns:
+        int: Number of (re)computed races.
+    """
+    if rebuild:
+        con.execute(f"DROP TABLE IF EXISTS {TABLE}")
+    con.executescript(_SCHEMA)
+    con.execute("CREATE TEMP TABLE staleRaces (raceId INTEGER PRIMARY KEY)")
+    try:
+        con.execute(f"INSERT INTO temp.staleRaces {_STALE_RACES}")
+        (count,) = con.execute("SELECT COUNT(*) FROM temp.staleRaces").fetchone()
+        con.execute(
+            f"DELETE FROM {TABLE} WHERE raceId IN (SELECT raceId FROM temp.staleRaces)"
+        )
+        con.execute(_INSERT)
+        con.commit()
+    finally:
+        con.execute("DROP TABLE temp.staleRaces")
+    if count:
+        con.execute(f"ANALYZE {TABLE}")
+    return count
+
+
+def provision(database: str = DATABASE_FILE_PATH, rebuild: bool = False) -> int:
+    """
+    Builds the lapCumulative table of a database image and reports the progress.
+
+    Args:
+        database (str, optional): Path to the SQLite database image.
+            Defaults to DATABASE_FILE_PATH.
+        rebuild (bool, optional): Recompute every race. Defaults to False.
+
+    Returns:
+        int: Number of (re)computed races.
+    """
+    con = sqlite3.connect(database)
+    try:
+        start = time.perf_counter()
+        count = build(con, rebuild)
+        (rows,) = con.execute(f"SELECT COUNT(*) FROM {TABLE}").fetchone()
+    finally:
+        con.close()
+    seconds = time.perf_counter() - start
+    print(f"{TABLE}: {count} races (re)computed in {seconds:.2f}s, {rows} rows")
+    return count
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database", default=DATABASE_FILE_PATH)
+    parser.add_argument("--rebuild", action="store_true")
+    args = parser.parse_args(argv)
+    provision(args.database, args.rebuild)
+
+
+if __name__ == "__main__":
+    main()
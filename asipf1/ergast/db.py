@@ -1,6 +1,210 @@
+import os
 import sqlite3
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional, Union
+
+if TYPE_CHECKING:
+    from ergast import duck
 
 DATA_FOLDER_PATH = "data"
 DATABASE_FILE_PATH = DATA_FOLDER_PATH + "/f1db.sqlite"
 
-con = sqlite3.connect(DATABASE_FILE_PATH)
+# Connection tuning, see https://www.sqlite.org/pragma.html
+MMAP_SIZE = 256 * 1024 * 1024  # Bytes of the database file to memory-map
+CACHE_SIZE = -64 * 1024  # Negative values are in KiB, e.g. 64 MiB page cache
+
+BACKENDS = ("sqlite", "duckdb")  # See ergast.duck for the duckdb backend
+
+_settings: dict[str, Any] = {
+    "database": DATABASE_FILE_PATH,
+    "mmap_size": MMAP_SIZE,
+    "cache_size": CACHE_SIZE,
+    "backend": "sqlite",
+    "parquet": None,
+}
+_generation = 0  # Bumped by configure() so threads reopen their connections
+_local = threading.local()
+_inherited: list[Any] = []  # Connections of the parent process in a forked child
+
+
+def _discard_connection() -> None:
+    """
+    Makes a forked child open its own connection, the one inherited from the parent is
+    kept referenced so it is neither used nor closed in the child, see
+    https://www.sqlite.org/howtocorrupt.html (section 2.6)
+    """
+    con = getattr(_local, "con", None)
+    if con is not None:
+        _inherited.append(con)
+        _local.con = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_discard_connection)
+
+
+def configure(
+    *,
+    database: Optional[str] = None,
+    mmap_size: Optional[int] = None,
+    cache_size: Optional[int] = None,
+    backend: Optional[str] = None,
+    parquet: Optional[str] = None,
+) -> None:
+    """
+    Changes the connection pool settings. Every thread reopens its connection with the
+    new settings on its next query.
+
+    Args:
+        database (Optional[str], optional): Path to the SQLite database image.
+            Defaults to None (unchanged).
+        mmap_size (Optional[int], optional): PRAGMA mmap_size in bytes, 0 disables
+            memory-mapped I/O. Defaults to None (unchanged).
+        cache_size (Optional[int], optional): PRAGMA cache_size, positive values are
+            pages and negative values are KiB. Defaults to None (unchanged).
+        backend (Optional[str], optional): Database engine running the queries, one
+            of BACKENDS. Defaults to None (unchanged).
+        parquet (Optional[str], optional): Folder with the Parquet export read by the
+            duckdb backend instead of the database image, an empty string reads the
+            database image again. Defaults to None (unchanged).
+
+    Raises:
+        ValueError: Unknown backend.
+    """
+    global _generation
+
+    if backend is not None and backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend}, expected one of {BACKENDS}.")
+
+    if database is not None:
+        _settings["database"] = database
+    if mmap_size is not None:
+        _settings["mmap_size"] = mmap_size
+    if cache_size is not None:
+        _settings["cache_size"] = cache_size
+    if backend is not None:
+        _settings["backend"] = backend
+    if parquet is not None:
+        _settings["parquet"] = parquet or None
+    _generation += 1
+
+
+def settings() -> dict[str, Any]:
+    """
+    Obtain a copy of the connection settings, e.g. to configure worker processes.
+
+    Returns:
+        dict[str, Any]: Keyword arguments of configure().
+    """
+    return dict(_settings)
+
+
+def backend() -> str:
+    """Obtain the name of the configured backend, one of BACKENDS."""
+    return _settings["backend"]
+
+
+def database_path() -> Path:
+    """
+    Obtain the absolute path of the configured database image.
+
+    Returns:
+        Path: Path to the SQLite database image.
+    """
+    return Path(_settings["database"]).resolve()
+
+
+def source() -> tuple[str, int, str, Optional[str]]:
+    """
+    Identifies the data the connections read, it changes along with the database file
+    and the backend settings.
+
+    Returns:
+        tuple[str, int, str, Optional[str]]: Database path, its modification time in
+            nanoseconds, backend and Parquet folder.
+    """
+    path = database_path()
+    return (str(path), path.stat().st_mtime_ns, backend(), _settings["parquet"])
+
+
+def connect(database: Optional[str] = None) -> sqlite3.Connection:
+    """
+    Opens a new read-only connection to the database image.
+
+    Args:
+        database (Optional[str], optional): Path to the SQLite database image.
+            Defaults to None (the configured database).
+
+    Returns:
+        sqlite3.Connection: Read-only SQLite connection.
+    """
+    path = Path(database).resolve() if database else database_path()
+    con = sqlite3.connect(f"{path.as_uri()}?mode=ro", uri=True)
+    con.execute(f"PRAGMA mmap_size={int(_settings['mmap_size'])}")
+    con.execute(f"PRAGMA cache_size={int(_settings['cache_size'])}")
+    return con
+
+
+def get_connection() -> Union[sqlite3.Connection, "duck.Connection"]:
+    """
+    Obtain the read-only connection of the calling thread. Connections are opened
+    lazily on first use and are never shared between threads, so the ergast endpoints
+    can be called from thread pools. SQLite releases the GIL while executing queries.
+
+    Returns:
+        Union[sqlite3.Connection, duck.Connection]: Read-only connection of the
+            current thread to the configured backend.
+    """
+    con = getattr(_local, "con", None)
+    if con is None or _local.generation != _generation:
+        if con is not None:
+            con.close()
+        if _settings["backend"] == "duckdb":
+            from ergast import duck
+
+            con = duck.connect(database_path(), _settings["parquet"])
+        else:
+            con = connect()
+        _local.con = con
+        _local.generation = _generation
+    return con
+
+
+def close() -> None:
+    """Closes the connection of the calling thread, if it has one."""
+    con = getattr(_local, "con", None)
+    if con is not None:
+        con.close()
+        _local.con = None
+
+
+def table_names() -> set[str]:
+    """
+    Obtain the names of the tables the configured backend can query.
+
+    Returns:
+        set[str]: Table names.
+    """
+    con = get_connection()
+    if isinstance(con, sqlite3.Connection):
+        rows = con.execute("SELECT name FROM sqlite_master WHERE type='table'")
+        return {name for (name,) in rows}
+    return con.table_names()
+
+
+def explain(query: str, params: dict[str, Any]) -> list[str]:
+    """
+    Obtain the query plan of a query on the configured backend.
+
+    Args:
+        query (str): SQL query with named placeholders.
+        params (dict[str, Any]): Query parameters.
+
+    Returns:
+        list[str]: Query plan, one line per step.
+    """
+    con = get_connection()
+    if isinstance(con, sqlite3.Connection):
+        return [row[3] for row in con.execute(f"EXPLAIN QUERY PLAN {query}", params)]
+    return con.explain(query, params)
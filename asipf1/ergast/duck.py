@@ -0,0 +1,253 @@
+"""
+DuckDB backend of the ergast endpoints.
+
+Runs the same endpoint queries through an embedded DuckDB database, which scans and
+aggregates column-at-a-time instead of row-at-a-time. DuckDB either attaches the
+f1db.sqlite image (through its sqlite extension, which DuckDB downloads on first use)
+or reads a Parquet export of it, which works offline. Date and time columns are
+exposed as text, like SQLite stores them, so the endpoints return identical
+DataFrames. Requires the optional duckdb dependency. Enable it with:
+
+    ergast.db.configure(backend="duckdb")  # or backend="duckdb", parquet=PARQUET_FOLDER
+
+Export the Parquet files from the repository root with:
+
+    PYTHONPATH=asipf1 python -m ergast.duck [--database PATH] [--folder PATH]
+"""
+import argparse
+import re
+import sqlite3
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterator, Optional, Sequence, Union
+
+import pandas as pd
+
+try:
+    import duckdb
+except ImportError:  # Optional dependency, only needed by the duckdb backend
+    duckdb = None
+
+PARQUET_FOLDER_PATH = "data/parquet"
+TEXT_TYPES = ("DATE", "TIME", "TIMESTAMP")  # Read as text like SQLite returns them
+
+_PARAMETER = re.compile(r"(?<![:\w]):(\w+)")  # Named SQLite parameter, e.g. :year
+_SQLITE_CATALOG = "f1db"
+
+Params = Union[dict[str, Any], Sequence[Any]]
+
+
+@lru_cache(maxsize=None)
+def translate(query: str) -> tuple[str, tuple[str, ...]]:
+    """
+    Translates an SQLite endpoint query to DuckDB.
+
+    Args:
+        query (str): SQLite query with named placeholders (e.g. :year).
+
+    Returns:
+        tuple[str, tuple[str, ...]]: DuckDB query with $ placeholders (e.g. $year)
+            and the names of the used parameters, DuckDB rejects unused ones.
+    """
+    names = tuple(dict.fromkeys(_PARAMETER.findall(query)))
+    query = _PARAMETER.sub(r"$\1", query)
+    query = query.replace("LIMIT -1 OFFSET", "OFFSET")  # No negative limits
+    return query, names
+
+
+class Cursor:
+    """DB-API like cursor translating the SQLite queries of the endpoints."""
+
+    def __init__(self, cur: Any) -> None:
+        self._cur = cur
+
+    def execute(self, query: str, params: Params = ()) -> "Cursor":
+        query, names = translate(query)
+        if isinstance(params, dict):
+            params = {name: params[name] for name in names}
+        self._cur.execute(query, params or None)
+        return self
+
+    def __iter__(self) -> Iterator[tuple]:
+        return iter(self._cur.fetchone, None)
+
+    def fetchone(self) -> Optional[tuple]:
+        return self._cur.fetchone()
+
+    def fetchmany(self, size: int) -> list[tuple]:
+        return self._cur.fetchmany(size)
+
+    def fetchall(self) -> list[tuple]:
+        return self._cur.fetchall()
+
+    def close(self) -> None:
+        self._cur.close()
+
+
+class Connection:
+    """DuckDB connection with the sqlite3.Connection methods used by the endpoints."""
+
+    def __init__(self, con: Any) -> None:
+        self._con = con
+
+    def cursor(self) -> Cursor:
+        # Every cursor is a separate DuckDB connection to the same database, so a
+        # streamed result is not invalidated by queries running in between
+        return Cursor(self._con.cursor())
+
+    def execute(self, query: str, params: Params = ()) -> Cursor:
+        return self.cursor().execute(query, params)
+
+    def table_names(self) -> set[str]:
+        rows = self._con.execute("SELECT view_name FROM duckdb_views()").fetchall()
+        return {name for (name,) in rows}
+
+    def explain(self, query: str, params: dict[str, Any]) -> list[str]:
+        query, names = translate(query)
+        rows = self._con.execute(
+            f"EXPLAIN {query}", {name: params[name] for name in names} or None
+        ).fetchall()
+        return [line for _, plan in rows for line in plan.splitlines()]
+
+    def close(self) -> None:
+        self._con.close()
+
+
+def _require_duckdb() -> None:
+    if duckdb is None:
+        raise ImportError("The duckdb backend requires duckdb to be installed.")
+
+
+def connect(database: Path, parquet: Optional[str] = None) -> Connection:
+    """
+    Opens an in-memory DuckDB database exposing every table of the f1db image as a
+    view, read from the attached SQLite file or from its Parquet export.
+
+    Args:
+        database (Path): Path to the SQLite database image.
+        parquet (Optional[str], optional): Folder with the Parquet export (see
+            export). Defaults to None (attach the SQLite file).
+
+    Raises:
+        ImportError: duckdb or its sqlite extension (when attaching the SQLite file)
+            is not installed.
+        FileNotFoundError: The Parquet folder does not contain any table.
+
+    Returns:
+        Connection: DuckDB connection.
+    """
+    _require_duckdb()
+    con = duckdb.connect()
+    if parquet:
+        files = sorted(Path(parquet).glob("*.parquet"))
+        if not files:
+            raise FileNotFoundError(f"No Parquet export found in {parquet}.")
+        for file in files:
+            con.execute(
+                f"CREATE VIEW \"{file.stem}\" AS SELECT * FROM read_parquet('{file}')"
+            )
+        return Connection(con)
+
+    try:
+        con.execute("LOAD sqlite")  # Installed from the DuckDB repository if missing
+    except duckdb.Error as e:
+        con.close()
+        raise ImportError(
+            "Attaching the SQLite file requires the DuckDB sqlite extension, which "
+            f"could not be loaded ({str(e).splitlines()[0]}). Export the database "
+            "to Parquet with `python -m ergast.duck` and configure the backend with "
+            "parquet=PARQUET_FOLDER_PATH instead."
+        ) from e
+    con.execute(f"ATTACH '{database}' AS {_SQLITE_CATALOG} (TYPE sqlite, READ_ONLY)")
+    columns = con.execute(
+        "SELECT table_name, column_name, data_type FROM information_schema.columns "
+        "WHERE table_catalog=? ORDER BY table_name, ordinal_position",
+        [_SQLITE_CATALOG],
+    ).fetchall()
+    tables: dict[str, list[str]] = {}
+    for table, column, data_type in columns:
+        text = data_type in TEXT_TYPES
+        tables.setdefault(table, []).append(
+            f'CAST("{column}" AS VARCHAR) AS "{column}"' if text else f'"{column}"'
+        )
+    for table, select in tables.items():
+        con.execute(
+            f'CREATE VIEW "{table}" AS SELECT {", ".join(select)} '
+            f'FROM {_SQLITE_CATALOG}."{table}"'
+        )
+    return Connection(con)
+
+
+def _dtype(declared: str) -> str:
+    """Obtain the pandas dtype of a declared SQLite column type (type affinity)."""
+    declared = declared.upper()
+    if "INT" in declared:
+        return "Int64"
+    if any(name in declared for name in ("REAL", "FLOA", "DOUB")):
+        return "Float64"
+    return "object"  # Text, dates and times are kept as stored
+
+
+def export(database: str, folder: str = PARQUET_FOLDER_PATH) -> list[str]:
+    """
+    Exports every table of the database image to one Parquet file per table, with
+    the column types SQLite declares.
+
+    Args:
+        database (str): Path to the SQLite database image.
+        folder (str, optional): Folder the Parquet files are written to.
+            Defaults to PARQUET_FOLDER_PATH.
+
+    Raises:
+        ImportError: duckdb is not installed.
+
+    Returns:
+        list[str]: Names of the exported tables.
+    """
+    _require_duckdb()
+    Path(folder).mkdir(parents=True, exist_ok=True)
+    source = sqlite3.connect(f"{Path(database).resolve().as_uri()}?mode=ro", uri=True)
+    target = duckdb.connect()
+    try:
+        tables = [
+            name
+            for (name,) in source.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' "
+                "AND name NOT LIKE 'sqlite_%'"
+            )
+        ]
+        for table in tables:
+            info = source.execute(f'PRAGMA table_info("{table}")').fetchall()
+            rows = source.execute(f'SELECT * FROM "{table}"').fetchall()
+            values = list(zip(*rows)) if rows else [()] * len(info)
+            df = pd.DataFrame(
+                {
+                    column[1]: pd.array(list(value), dtype=_dtype(column[2]))
+                    for column, value in zip(info, values)
+                }
+            )
+            target.register("export", df)
+            target.execute(
+                f"COPY (SELECT * FROM export) TO '{Path(folder) / table}.parquet' "
+                "(FORMAT parquet)"
+            )
+            target.unregister("export")
+    finally:
+        source.close()
+        target.close()
+    return tables
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    from ergast.db import DATABASE_FILE_PATH
+
+    parser = argparse.ArgumentParser(description="Exports f1db.sqlite to Parquet.")
+    parser.add_argument("--database", default=DATABASE_FILE_PATH)
+    parser.add_argument("--folder", default=PARQUET_FOLDER_PATH)
+    args = parser.parse_args(argv)
+    tables = export(args.database, args.folder)
+    print(f"Exported {len(tables)} tables to {args.folder}: {', '.join(tables)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Provisions the indexes used by the ergast endpoints in the f1db.sqlite image.
+
+The image produced by mysql-to-sqlite3 only keeps the primary keys, therefore per race
+lookups of lapTimes, pitStops and results are full table scans. Run from the repository
+root with:
+
+    PYTHONPATH=asipf1 python -m ergast.indexes [--database PATH] [--dry-run]
+"""
+import argparse
+import sqlite3
+from typing import Any, Optional
+
+import ergast
+from ergast.db import DATABASE_FILE_PATH
+from ergast.query import shape
+
+# Index name -> (table, columns). Columns after the filtered ones make the index
+# covering, so the per race queries never have to touch the table itself.
+INDEXES = {
+    "idx_races_year_round": ("races", ["year", "round", "raceId", "circuitId"]),
+    "idx_races_circuitId": ("races", ["circuitId"]),
+    "idx_lapTimes_raceId_lap": (
+        "lapTimes",
+        ["raceId", "lap", "position", "driverId", "milliseconds", "time"],
+    ),
+    "idx_pitStops_raceId_time": (
+        "pitStops",
+        ["raceId", "time", "driverId", "stop", "lap", "duration", "milliseconds"],
+    ),
+    "idx_results_raceId_statusId": ("results", ["raceId", "statusId"]),
+    "idx_results_driverId": ("results", ["driverId"]),
+    "idx_results_constructorId": ("results", ["constructorId"]),
+    "idx_qualifying_raceId": ("qualifying", ["raceId", "position"]),
+    "idx_driverStandings_raceId": ("driverStandings", ["raceId", "driverId"]),
+    "idx_constructorStandings_raceId": (
+        "constructorStandings",
+        ["raceId", "constructorId"],
+    ),
+    "idx_drivers_driverRef": ("drivers", ["driverRef"]),
+    "idx_constructors_constructorRef": ("constructors", ["constructorRef"]),
+    "idx_circuits_circuitRef": ("circuits", ["circuitRef"]),
+}
+
+
+def missing_indexes(con: sqlite3.Connection) -> list[str]:
+    """
+    Inspects the database and lists the indexes that are not yet created.
+
+    Args:
+        con (sqlite3.Connection): Database connection.
+
+    Returns:
+        list[str]: Names of the missing indexes whose tables exist.
+    """
+    existing = {
+        name
+        for (name,) in con.execute("SELECT name FROM sqlite_master WHERE type='index'")
+    }
+    tables = {
+        name
+        for (name,) in con.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    }
+    return [
+        name
+        for name, (table, _) in INDEXES.items()
+        if name not in existing and table in tables
+    ]
+
+
+def create_indexes(con: sqlite3.Connection, names: list[str]) -> None:
+    """
+    Creates the given indexes and refreshes the query planner statistics.
+
+    Args:
+        con (sqlite3.Connection): Writable database connection.
+        names (list[str]): Names of the indexes from INDEXES to create.
+    """
+    for name in names:
+        table, columns = INDEXES[name]
+        con.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"
+        )
+    con.execute("ANALYZE")
+    con.commit()
+
+
+def sample_queries(con: sqlite3.Connection) -> list[tuple[str, dict[str, Any]]]:
+    """
+    Obtain representative endpoint calls for the latest race which has lap times.
+
+    Args:
+        con (sqlite3.Connection): Database connection.
+
+    Returns:
+        list[tuple[str, dict[str, Any]]]: Endpoint names and their parameters.
+    """
+    latest = con.execute(
+        "SELECT raceId, year, round FROM races "
+        "WHERE raceId IN (SELECT raceId FROM lapTimes) "
+        "ORDER BY year DESC, round DESC LIMIT 1"
+    ).fetchone()
+    race_id, year, race = latest if latest else (None, None, None)
+    # The endpoints filter single races by raceId (see ergast.raceindex)
+    standings = con.execute(
+        "SELECT r.raceId FROM driverStandings ds, races r "
+        "WHERE ds.raceId=r.raceId AND r.year=? ORDER BY r.round DESC LIMIT 1",
+        (year,),
+    ).fetchone()
+    standings_race_id = standings[0] if standings else None
+
+    return [
+        ("season_list", {"year": year}),
+        ("race_schedule", {"year": year}),
+        ("race_results", {"race_id": race_id}),
+        ("qualifying_results", {"race_id": race_id}),
+        ("driver_standings", {"race_id": standings_race_id}),
+        ("constructor_standings", {"race_id": standings_race_id}),
+        ("driver_information", {"year": year}),
+        ("constructor_information", {"year": year}),
+        ("circuit_information", {"year": year}),
+        ("finishing_status", {"race_id": race_id}),
+        ("lap_times", {"race_id": race_id}),
+        ("pit_stops", {"race_id": race_id}),
+    ]
+
+
+def explain(con: sqlite3.Connection, endpoint: str, params: dict[str, Any]) -> str:
+    """
+    Obtain the EXPLAIN QUERY PLAN output of an endpoint call.
+
+    Args:
+        con (sqlite3.Connection): Database connection.
+        endpoint (str): Name of the ergast endpoint (e.g. lap_times).
+        params (dict[str, Any]): Endpoint parameters.
+
+    Returns:
+        str: Query plan, one step per line indented by its depth.
+    """
+    query = getattr(ergast, f"_{endpoint}_sql")(shape(params))
+    depths: dict[int, int] = {0: -1}
+    lines = []
+    for node, parent, _, detail in con.execute(f"EXPLAIN QUERY PLAN {query}", params):
+        depths[node] = depths.get(parent, -1) + 1
+        lines.append("  " * depths[node] + detail)
+    return "\n".join(lines)
+
+
+def provision(
+    database: str = DATABASE_FILE_PATH, dry_run: bool = False
+) -> dict[str, tuple[str, str]]:
+    """
+    Creates the missing indexes and reports the query plans before and after.
+
+    Args:
+        database (str, optional): Path to the SQLite database image.
+            Defaults to DATABASE_FILE_PATH.
+        dry_run (bool, optional): Only report the missing indexes and current plans.
+            Defaults to False.
+
+    Returns:
+        dict[str, tuple[str, str]]: Endpoint name -> (plan before, plan after).
+    """
+    con = sqlite3.connect(database)
+    try:
+        missing = missing_indexes(con)
+        print(f"Missing indexes: {', '.join(missing) if missing else 'none'}")
+
+        samples = sample_queries(con)
+        before = {name: explain(con, name, params) for name, params in samples}
+        if missing and not dry_run:
+            create_indexes(con, missing)
+        after = {name: explain(con, name, params) for name, params in samples}
+    finally:
+        con.close()
+
+    plans = {name: (before[name], after[name]) for name, _ in samples}
+    for name, params in samples:
+        print(f"\n=== {name}({params})")
+        print(f"--- before:\n{plans[name][0]}")
+        print(f"--- after:\n{plans[name][1]}")
+    return plans
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database", default=DATABASE_FILE_PATH)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+    provision(args.database, args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+Opt-in instrumentation of the ergast endpoints.
+
+When enabled, every endpoint call records its wall time split into SQL execute, row
+fetch and DataFrame build, along with the number of fetched rows and the size of the
+built DataFrames. Queries slower than the explain threshold additionally capture their
+query plan in a bounded slow query log. The statistics are aggregated per
+endpoint and can be dumped as JSON.
+
+    import ergast
+
+    ergast.instrument.enable(explain_threshold=0.1)
+    ...
+    print(ergast.instrument.summary()["lap_times"])
+    ergast.instrument.dump("data/query_stats.json")
+"""
+import json
+import threading
+import time
+from collections import deque
+from functools import partial, wraps
+from pathlib import Path
+from typing import Any, Callable, Iterator, NamedTuple, Optional
+
+import pandas as pd
+from ergast.db import explain
+
+MAX_SLOW_QUERIES = 100  # Number of slow queries kept in the log
+
+
+class EndpointStats(NamedTuple):
+    calls: int
+    queries: int
+    total: float  # Seconds, wall time of the calls
+    execute: float  # Seconds spent executing the SQL
+    fetch: float  # Seconds spent fetching the rows
+    build: float  # Seconds spent building the DataFrames
+    rows: int  # Fetched rows
+    bytes: int  # Memory of the built DataFrames
+    slowest: float  # Seconds, wall time of the slowest call
+
+    @property
+    def other(self) -> float:
+        """Seconds outside of the queries, e.g. memoization, copies and file reads."""
+        return self.total - self.execute - self.fetch - self.build
+
+
+class SlowQuery(NamedTuple):
+    endpoint: str
+    query: str
+    params: dict[str, Any]
+    seconds: float  # Execute and fetch time
+    plan: str  # Query plan of the backend, one line per step
+
+
+class _Call:
+    """Statistics of the endpoint call running on the current thread."""
+
+    def __init__(self, endpoint: str) -> None:
+        self.endpoint = endpoint
+
+    def query(
+        self,
+        query: str,
+        params: dict[str, Any],
+        execute: float,
+        fetch: float,
+        build: float,
+        rows: int,
+        nbytes: int,
+    ) -> None:
+        """
+        Records a query executed by the endpoint.
+
+        Args:
+            query (str): SQL query with named placeholders.
+            params (dict[str, Any]): Query parameters.
+            execute (float): Seconds spent executing the SQL.
+            fetch (float): Seconds spent fetching the rows.
+            build (float): Seconds spent building the DataFrames.
+            rows (int): Number of fetched rows.
+            nbytes (int): Memory of the built DataFrames (see frame_bytes).
+        """
+        threshold = _settings["explain_threshold"]
+        if threshold is not None and execute + fetch >= threshold:
+            slow = SlowQuery(
+                self.endpoint,
+                query,
+                {name: value for name, value in params.items() if value is not None},
+                execute + fetch,
+                "\n".join(explain(query, params)),
+            )
+            with _lock:
+                _slow.append(slow)
+        with _lock:
+            stats = _endpoint_stats(self.endpoint)
+            stats["queries"] += 1
+            stats["execute"] += execute
+            stats["fetch"] += fetch
+            stats["build"] += build
+            stats["rows"] += rows
+            stats["bytes"] += nbytes
+
+
+_settings: dict[str, Any] = {"enabled": False, "explain_threshold": None}
+_stats: dict[str, dict[str, Any]] = {}
+_slow: deque[SlowQuery] = deque(maxlen=MAX_SLOW_QUERIES)
+_local = threading.local()
+_lock = threading.Lock()
+
+
+def enable(*, explain_threshold: Optional[float] = None) -> None:
+    """
+    Enables the instrumentation, the statistics collected so far are kept.
+
+    Args:
+        explain_threshold (Optional[float], optional): Capture the query plan of
+            queries whose execute and fetch time exceeds this many seconds.
+            Defaults to None (no query plans).
+    """
+    _settings["enabled"] = True
+    _settings["explain_threshold"] = explain_threshold
+
+
+def disable() -> None:
+    """Disables the instrumentation, the statistics collected so far are kept."""
+    _settings["enabled"] = False
+
+
+def is_enabled() -> bool:
+    return _settings["enabled"]
+
+
+def reset() -> None:
+    """Removes the collected statistics and the slow query log."""
+    with _lock:
+        _stats.clear()
+        _slow.clear()
+
+
+def current() -> Optional[_Call]:
+    """Obtain the instrumented endpoint call running on the current thread."""
+    calls = getattr(_local, "calls", None)
+    return calls[-1] if calls else None
+
+
+def frame_bytes(df: pd.DataFrame) -> int:
+    """Obtain the memory of a DataFrame, including the Python objects it holds."""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def _endpoint_stats(endpoint: str) -> dict[str, Any]:
+    """Obtain the mutable statistics of an endpoint, the lock has to be held."""
+    if endpoint not in _stats:
+        _stats[endpoint] = dict.fromkeys(EndpointStats._fields, 0)
+    return _stats[endpoint]
+
+
+def _record_call(endpoint: str, seconds: float) -> None:
+    with _lock:
+        stats = _endpoint_stats(endpoint)
+        stats["calls"] += 1
+        stats["total"] += seconds
+        stats["slowest"] = max(stats["slowest"], seconds)
+
+
+def _run(call: _Call, function: Callable[[], Any]) -> Any:
+    """Runs the function with the call as the current call of the thread."""
+    if getattr(_local, "calls", None) is None:
+        _local.calls = []
+    _local.calls.append(call)
+    try:
+        return function()
+    finally:
+        _local.calls.pop()
+
+
+def _timed(call: _Call, iterator: Iterator[Any]) -> Iterator[Any]:
+    """Instruments the iterator of a streaming endpoint, timing every next()."""
+    seconds = 0.0
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = _run(call, partial(next, iterator))
+            except StopIteration:
+                return
+            finally:
+                seconds += time.perf_counter() - start
+            yield item
+    finally:
+        _record_call(call.endpoint, seconds)
+
+
+def instrumented(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Instruments an ergast endpoint, a no-op while the instrumentation is disabled.
+
+    Args:
+        endpoint (Callable[..., Any]): Ergast endpoint returning a DataFrame or an
+            iterator of DataFrames.
+
+    Returns:
+        Callable[..., Any]: Endpoint recording its statistics.
+    """
+
+    @wraps(endpoint)
+    def call(*args: Any, **kwargs: Any) -> Any:
+        if not _settings["enabled"]:
+            return endpoint(*args, **kwargs)
+
+        current = _Call(endpoint.__name__)
+        start = time.perf_counter()
+        result = _run(current, partial(endpoint, *args, **kwargs))
+        if isinstance(result, Iterator):  # Streaming, the work happens while iterating
+            return _timed(current, result)
+        _record_call(current.endpoint, time.perf_counter() - start)
+        return result
+
+    return call
+
+
+def summary() -> dict[str, EndpointStats]:
+    """
+    Obtain the aggregated statistics of every called endpoint.
+
+    Returns:
+        dict[str, EndpointStats]: Endpoint name -> statistics.
+    """
+    with _lock:
+        return {name: EndpointStats(**stats) for name, stats in sorted(_stats.items())}
+
+
+def slow_queries() -> list[SlowQuery]:
+    """
+    Obtain the slow query log, oldest first.
+
+    Returns:
+        list[SlowQuery]: Queries over the explain threshold with their plans.
+    """
+    with _lock:
+        return list(_slow)
+
+
+def dump(path: str) -> None:
+    """
+    Writes the statistics of every endpoint and the slow query log as JSON.
+
+    Args:
+        path (str): Path of the JSON file.
+    """
+    report = {
+        "endpoints": {
+            name: {**stats._asdict(), "other": stats.other}
+            for name, stats in summary().items()
+        },
+        "slow_queries": [query._asdict() for query in slow_queries()],
+    }
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(report, file, indent=2, default=str)
@@ -0,0 +1,256 @@
+"""
+Polars LazyFrame output of the ergast endpoints.
+
+lap_times, pit_stops and race_results scan the per season Parquet files of the
+columnar cache (see ergast.columnar, missing seasons are materialized on first use),
+so the filters, selects and aggregations composed on top of them are pushed down into
+the Parquet scan by the Polars optimizer. The other endpoints are small and wrap their
+DataFrame. Column names are unique, a repeated name gets a .N suffix (e.g. time.1).
+Requires the optional polars dependency.
+
+    import ergast.lazy
+    import polars as pl
+
+    ergast.lazy.lap_times(start_year=2020).filter(pl.col("lap") == 1).collect()
+"""
+from typing import Any, Callable, Optional
+
+import ergast
+import pandas as pd
+from ergast import columnar
+from ergast.query import Column, Shape, unique_names
+
+try:
+    import polars as pl
+except ImportError:  # Optional dependency, only needed by the lazy output
+    pl = None
+
+SEASONAL = ("lap_times", "pit_stops", "race_results")  # Scanned from Parquet
+
+
+def _scan(
+    endpoint: str,
+    build_sql: Callable[[Shape], str],
+    columns: list[Column],
+    year: Optional[int],
+    start_year: Optional[int],
+    end_year: Optional[int],
+    filters: dict[str, Any],
+) -> "pl.LazyFrame":
+    """
+    Scans the Parquet files of the selected seasons of an endpoint.
+
+    Args:
+        endpoint (str): Name of the ergast endpoint (e.g. lap_times).
+        build_sql (Callable[[Shape], str]): SQL template builder of the endpoint.
+        columns (list[Column]): Every column the endpoint can return.
+        year (Optional[int]): Season calendar year.
+        start_year (Optional[int]): First season (inclusive).
+        end_year (Optional[int]): Last season (inclusive).
+        filters (dict[str, Any]): Column name -> value equality filters, None
+            values are ignored (0 and empty strings filter like any other value).
+
+    Raises:
+        ImportError: polars is not installed.
+        ValueError: A filter is not a column of the endpoint or of the scanned files.
+
+    Returns:
+        pl.LazyFrame: Lazy scan of the seasons with the filters applied.
+    """
+    if pl is None:
+        raise ImportError("The lazy output requires polars to be installed.")
+    names = unique_names([column.name for column in columns])
+    unknown = [name for name in filters if name not in names]
+    if unknown:
+        raise ValueError(f"Unknown {endpoint} filter columns: {', '.join(unknown)}.")
+
+    files = columnar.season_files(
+        endpoint,
+        build_sql,
+        columns,
+        year=year,
+        start_year=start_year,
+        end_year=end_year,
+    )
+    if not files:
+        return pl.LazyFrame(schema=names)
+
+    # Seasons without any value in a column store it as null, relaxed to the others
+    lf = pl.concat([pl.scan_parquet(path) for path in files], how="vertical_relaxed")
+    schema = lf.collect_schema()
+    for name, value in filters.items():
+        if value is None:
+            continue
+        if name not in schema:  # Stale cache files written with other columns
+            raise ValueError(
+                f"The {endpoint} files do not have a {name} column, rebuild the "
+                "columnar cache."
+            )
+        # Compared like SQLite does, e.g. positionText with a number
+        lf = lf.filter(pl.col(name) == pl.lit(value).cast(schema[name]))
+    return lf
+
+
+def lap_times(
+    year: Optional[int] = None,
+    race: Optional[int] = None,
+    *,
+    start_year: Optional[int] = None,
+    end_year: Optional[int] = None,
+    lap: Optional[int] = None,
+    driver: Optional[str] = None,
+) -> "pl.LazyFrame":
+    """
+    Obtain a lazy scan of the lap times, see ergast.lap_times.
+
+    Args:
+        year (Optional[int], optional): Season calendar year. Defaults to None.
+        race (Optional[int], optional): Race round in the selected calendar year.
+            Defaults to None.
+        start_year (Optional[int], optional): First season (inclusive).
+            Defaults to None.
+        end_year (Optional[int], optional): Last season (inclusive). Defaults to None.
+        lap (Optional[int], optional): Limit results to a specific lap.
+            Defaults to None.
+        driver (Optional[str], optional): Limit results to a specific driver.
+            Defaults to None.
+
+    Returns:
+        pl.LazyFrame: Lap times in race, lap and position order.
+    """
+    return _scan(
+        "lap_times",
+        ergast._lap_times_sql,
+        ergast._LAP_TIMES_COLUMNS,
+        year,
+        start_year,
+        end_year,
+        {"round": race, "lap": lap, "driverId": driver},
+    )
+
+
+def pit_stops(
+    year: Optional[int] = None,
+    race: Optional[int] = None,
+    *,
+    start_year: Optional[int] = None,
+    end_year: Optional[int] = None,
+    pitstop: Optional[int] = None,
+    lap: Optional[int] = None,
+    driver: Optional[str] = None,
+) -> "pl.LazyFrame":
+    """
+    Obtain a lazy scan of the pit stops, see ergast.pit_stops.
+
+    Args:
+        year (Optional[int], optional): Season calendar year. Defaults to None.
+        race (Optional[int], optional): Race round in the selected calendar year.
+            Defaults to None.
+        start_year (Optional[int], optional): First season (inclusive).
+            Defaults to None.
+        end_year (Optional[int], optional): Last season (inclusive). Defaults to None.
+        pitstop (Optional[int], optional): Limit results to a specific stop number.
+            Defaults to None.
+        lap (Optional[int], optional): Limit results to a specific lap.
+            Defaults to None.
+        driver (Optional[str], optional): Limit results to a specific driver.
+            Defaults to None.
+
+    Returns:
+        pl.LazyFrame: Pit stops in race and time order.
+    """
+    return _scan(
+        "pit_stops",
+        ergast._pit_stops_sql,
+        ergast._PIT_STOPS_COLUMNS,
+        year,
+        start_year,
+        end_year,
+        {"round": race, "pitstop": pitstop, "lap": lap, "driverId": driver},
+    )
+
+
+def race_results(
+    *,
+    year: Optional[int] = None,
+    race: Optional[int] = None,
+    start_year: Optional[int] = None,
+    end_year: Optional[int] = None,
+    circuit: Optional[str] = None,
+    constructor: Optional[str] = None,
+    driver: Optional[str] = None,
+    grid: Optional[int] = None,
+    result: Optional[int] = None,
+    fastest: Optional[int] = None,
+    status: Optional[int] = None,
+) -> "pl.LazyFrame":
+    """
+    Obtain a lazy scan of the race results, see ergast.race_results.
+
+    Args:
+        year (Optional[int], optional): Season calendar year. Defaults to None.
+        race (Optional[int], optional): Race round in the selected calendar year.
+            Defaults to None.
+        start_year (Optional[int], optional): First season (inclusive).
+            Defaults to None.
+        end_year (Optional[int], optional): Last season (inclusive). Defaults to None.
+        circuit (Optional[str], optional): Limit results to a specific circuit.
+            Defaults to None.
+        constructor (Optional[str], optional): Limit results to a specific
+            constructor. Defaults to None.
+        driver (Optional[str], optional): Limit results to a specific driver.
+            Defaults to None.
+        grid (Optional[int], optional): Limit results to a specific starting grid
+            position. Defaults to None.
+        result (Optional[int], optional): Limit results to a specific finishing
+            position. Defaults to None.
+        fastest (Optional[int], optional): Limit results to a specific fastest lap
+            rank. Defaults to None.
+        status (Optional[int], optional): Limit results to a specific finishing
+            status. Defaults to None.
+
+    Returns:
+        pl.LazyFrame: Race results in race and finishing order.
+    """
+    return _scan(
+        "race_results",
+        ergast._race_results_sql,
+        ergast._RACE_RESULTS_COLUMNS,
+        year,
+        start_year,
+        end_year,
+        {
+            "round": race,
+            "circuitId": circuit,
+            "constructorId": constructor,
+            "driverId": driver,
+            "statusId": status,
+            "grid": grid,
+            "fastestLapRank": fastest,
+            "positionText": result,
+        },
+    )
+
+
+def scan(endpoint: str, **params: Any) -> "pl.LazyFrame":
+    """
+    Obtain the result of any ergast endpoint as a LazyFrame.
+
+    Args:
+        endpoint (str): Name of the ergast endpoint (e.g. driver_standings).
+        **params (Any): Endpoint parameters, the seasonal endpoints do not take
+            columns, offset, limit and compact (select and slice the LazyFrame).
+
+    Raises:
+        ImportError: polars is not installed.
+
+    Returns:
+        pl.LazyFrame: Endpoint result.
+    """
+    if endpoint in SEASONAL:
+        return globals()[endpoint](**params)
+    if pl is None:
+        raise ImportError("The lazy output requires polars to be installed.")
+    df: pd.DataFrame = getattr(ergast, endpoint)(**params)
+    df.columns = unique_names(list(df.columns))
+    return pl.from_pandas(df).lazy()
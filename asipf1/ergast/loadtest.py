@@ -0,0 +1,150 @@
+"""
+Load test of the local Ergast API server (see ergast.server).
+
+Every client thread keeps one keep-alive connection and requests the paths round-robin,
+then the requests per second and latency percentiles are reported. With --etag the
+clients poll with If-None-Match like a cache-aware consumer would. Start the server
+first, then run from the repository root with:
+
+    PYTHONPATH=asipf1 python -m ergast.loadtest [--url URL] [--requests N]
+        [--concurrency N] [--etag] [PATH ...]
+"""
+import argparse
+import http.client
+import statistics
+import threading
+import time
+from collections import Counter
+from typing import NamedTuple, Optional
+from urllib.parse import urlsplit
+
+from ergast.server import HOST, PORT
+
+URL = f"http://{HOST}:{PORT}"
+PATHS = [
+    "/api/f1/seasons.json",
+    "/api/f1/current.json",
+    "/api/f1/current/last/results.json",
+    "/api/f1/current/last/qualifying.json",
+    "/api/f1/current/last/laps.json?limit=100",
+    "/api/f1/current/last/pitstops.json",
+    "/api/f1/current/driverStandings.json",
+    "/api/f1/current/constructorStandings.json",
+    "/api/f1/circuits.json",
+    "/api/f1/status.json",
+]
+
+
+class Report(NamedTuple):
+    requests: int
+    seconds: float
+    statuses: dict[int, int]
+    latencies: list[float]  # Seconds, sorted
+
+    @property
+    def rps(self) -> float:
+        return self.requests / self.seconds if self.seconds else 0.0
+
+    def percentile(self, p: float) -> float:
+        index = min(len(self.latencies) - 1, int(len(self.latencies) * p / 100))
+        return self.latencies[index] if self.latencies else 0.0
+
+
+def _client(
+    url: str,
+    paths: list[str],
+    count: int,
+    etag: bool,
+    statuses: Counter,
+    latencies: list[float],
+) -> None:
+    """Sends count requests over one keep-alive connection."""
+    address = urlsplit(url)
+    con = http.client.HTTPConnection(address.hostname, address.port, timeout=30)
+    etags: dict[str, str] = {}
+    local_statuses: Counter = Counter()
+    local_latencies = []
+    try:
+        for i in range(count):
+            path = paths[i % len(paths)]
+            headers = {"If-None-Match": etags[path]} if etag and path in etags else {}
+            start = time.perf_counter()
+            con.request("GET", path, headers=headers)
+            response = con.getresponse()
+            response.read()
+            local_latencies.append(time.perf_counter() - start)
+            local_statuses[response.status] += 1
+            if response.getheader("ETag"):
+                etags[path] = response.getheader("ETag")
+    finally:
+        con.close()
+    statuses.update(local_statuses)
+    latencies.extend(local_latencies)
+
+
+def run(
+    url: str = URL,
+    paths: Optional[list[str]] = None,
+    requests: int = 10_000,
+    concurrency: int = 8,
+    etag: bool = False,
+) -> Report:
+    """
+    Runs the load test and prints the report.
+
+    Args:
+        url (str, optional): Base URL of the server. Defaults to URL.
+        paths (Optional[list[str]], optional): Requested paths. Defaults to None
+            (PATHS).
+        requests (int, optional): Total number of requests. Defaults to 10_000.
+        concurrency (int, optional): Number of client threads. Defaults to 8.
+        etag (bool, optional): Send If-None-Match with the last ETag of each path.
+            Defaults to False.
+
+    Returns:
+        Report: Number of requests, duration, status counts and latencies.
+    """
+    paths = paths or PATHS
+    statuses: Counter = Counter()
+    latencies: list[float] = []
+    threads = [
+        threading.Thread(
+            target=_client,
+            args=(url, paths, requests // concurrency, etag, statuses, latencies),
+        )
+        for _ in range(concurrency)
+    ]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+
+    latencies.sort()
+    report = Report(len(latencies), seconds, dict(statuses), latencies)
+    print(f"{report.requests} requests in {report.seconds:.2f}s")
+    print(f"{report.rps:.0f} requests/sec")
+    print(
+        f"latency p50 {report.percentile(50) * 1000:.2f}ms, "
+        f"p99 {report.percentile(99) * 1000:.2f}ms, "
+        f"mean {statistics.fmean(latencies or [0]) * 1000:.2f}ms"
+    )
+    print(f"statuses {report.statuses}")
+    return report
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="*")
+    parser.add_argument("--url", default=URL)
+    parser.add_argument("--requests", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--etag", action="store_true")
+    args = parser.parse_args(argv)
+    run(args.url, args.paths, args.requests, args.concurrency, args.etag)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+In-process LRU memoization of the ergast endpoints.
+
+Analyses fetch the same data repeatedly within one run (e.g. season_list or the race
+results of a race), so endpoint results are kept in an LRU cache bounded by the number
+of entries and their total memory, keyed on the normalized call arguments and the data
+source. Results larger than a quarter of the memory bound (e.g. full history lap
+times) are not cached. Callers always receive their own copy of the cached DataFrame
+and the cache clears itself whenever the database file changes.
+"""
+import inspect
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Hashable, NamedTuple, Optional
+
+import pandas as pd
+from ergast import columnar
+from ergast.db import source
+from ergast.query import is_counting
+
+MAX_SIZE = 64  # Number of cached endpoint results
+MAX_BYTES = 256 * 2**20  # Total memory of the cached endpoint results
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+    maxbytes: int
+    currbytes: int
+
+
+_cache: OrderedDict[Hashable, tuple[pd.DataFrame, int]] = OrderedDict()
+_stats = {"hits": 0, "misses": 0, "maxsize": MAX_SIZE, "maxbytes": MAX_BYTES}
+_size = {"bytes": 0}  # Total memory of the cached results
+_source: Optional[tuple[str, int, str, Optional[str]]] = None
+_lock = threading.Lock()
+
+
+def configure(*, maxsize: Optional[int] = None, maxbytes: Optional[int] = None) -> None:
+    """
+    Changes the cache size, 0 disables the memoization.
+
+    Args:
+        maxsize (Optional[int], optional): Maximum number of cached endpoint results.
+            Defaults to None (unchanged).
+        maxbytes (Optional[int], optional): Maximum total memory of the cached
+            endpoint results, a quarter of it is the largest cached result.
+            Defaults to None (unchanged).
+    """
+    with _lock:
+        if maxsize is not None:
+            _stats["maxsize"] = maxsize
+        if maxbytes is not None:
+            _stats["maxbytes"] = maxbytes
+        _evict()
+
+
+def _evict() -> None:
+    """Removes the least recently used results until the cache fits, holds _lock."""
+    while _cache and (
+        len(_cache) > _stats["maxsize"] or _size["bytes"] > _stats["maxbytes"]
+    ):
+        _, (_, nbytes) = _cache.popitem(last=False)
+        _size["bytes"] -= nbytes
+
+
+def cache_info() -> CacheInfo:
+    """
+    Obtain the cache statistics.
+
+    Returns:
+        CacheInfo: Hits, misses, maximum and current number of cached results and
+            their maximum and current memory.
+    """
+    with _lock:
+        return CacheInfo(
+            _stats["hits"],
+            _stats["misses"],
+            _stats["maxsize"],
+            len(_cache),
+            _stats["maxbytes"],
+            _size["bytes"],
+        )
+
+
+def cache_clear() -> None:
+    """Removes every cached result and resets the statistics."""
+    with _lock:
+        _cache.clear()
+        _size["bytes"] = 0
+        _stats["hits"] = _stats["misses"] = 0
+
+
+def _check_source() -> None:
+    """Clears the cache if the database file was modified or the backend changed."""
+    global _source
+
+    current = source()
+    if current != _source:
+        cache_clear()
+        _source = current
+
+
+def call_key(
+    endpoint: Callable[..., Any],
+    signature: inspect.Signature,
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> Hashable:
+    """
+    Obtain the normalized key of an endpoint call. Positional and keyword arguments,
+    their order and explicitly passed defaults all map to the same key.
+
+    Args:
+        endpoint (Callable[..., Any]): Ergast endpoint.
+        signature (inspect.Signature): Signature of the endpoint.
+        args (tuple[Any, ...]): Positional arguments of the call.
+        kwargs (dict[str, Any]): Keyword arguments of the call.
+
+    Raises:
+        TypeError: Arguments do not match the signature.
+
+    Returns:
+        Hashable: Endpoint name and the set arguments.
+    """
+    bound = signature.bind(*args, **kwargs)
+    return (endpoint.__name__,) + tuple(
+        (name, tuple(value) if isinstance(value, list) else value)
+        for name, value in bound.arguments.items()
+        if value is not None
+    )
+
+
+def memoize(endpoint: Callable[..., pd.DataFrame]) -> Callable[..., pd.DataFrame]:
+    """
+    Memoizes an ergast endpoint, calls with the same normalized arguments (see
+    call_key) on the same data source (database, backend and columnar cache) map to
+    the same entry.
+
+    Args:
+        endpoint (Callable[..., pd.DataFrame]): Ergast endpoint.
+
+    Returns:
+        Callable[..., pd.DataFrame]: Memoized endpoint returning defensive copies.
+    """
+    signature = inspect.signature(endpoint)
+
+    @wraps(endpoint)
+    def memoized(*args: Any, **kwargs: Any) -> pd.DataFrame:
+        if _stats["maxsize"] <= 0 or _stats["maxbytes"] <= 0:
+            return endpoint(*args, **kwargs)
+
+        _check_source()
+        key = (
+            source(),
+            str(columnar.folder()) if columnar.is_enabled() else None,
+            is_counting(),  # Counts are cached apart from the rows (see query.count)
+            call_key(endpoint, signature, args, kwargs),
+        )
+        with _lock:
+            entry = _cache.get(key)
+            if entry is not None:
+                _cache.move_to_end(key)
+                _stats["hits"] += 1
+            else:
+                _stats["misses"] += 1
+        if entry is not None:
+            return entry[0].copy()
+
+        df = endpoint(*args, **kwargs)
+        nbytes = int(df.memory_usage(deep=True).sum())
+        if nbytes > _stats["maxbytes"] // 4:
+            return df  # Too large to cache, the caller owns the only copy
+        with _lock:
+            if key in _cache:  # Cached by another thread in the meantime
+                _size["bytes"] -= _cache[key][1]
+            _cache[key] = (df, nbytes)
+            _size["bytes"] += nbytes
+            _evict()
+        return df.copy()
+
+    return memoized
@@ -0,0 +1,424 @@
+"""
+Ergast API routes and MRData JSON responses on top of the ergast endpoints.
+
+Paths follow the public Ergast URL scheme, e.g. /api/f1/2008/5/results.json or
+/api/f1/current/drivers/alonso/laps/1.json, with the limit and offset query parameters.
+"""
+import inspect
+import math
+from typing import Any, Callable, NamedTuple, Optional
+
+import ergast
+import pandas as pd
+from ergast import raceindex
+from ergast.query import count, unique_names
+
+XMLNS = "http://ergast.com/mrd/1.5"
+SERIES = "f1"
+DEFAULT_LIMIT = 30
+MAX_LIMIT = 1000
+
+# Criteria path segment -> endpoint argument
+CRITERIA = {
+    "circuits": "circuit",
+    "constructors": "constructor",
+    "drivers": "driver",
+    "grid": "grid",
+    "results": "result",
+    "fastest": "fastest",
+    "status": "status",
+    "driverStandings": "driverStanding",
+    "constructorStandings": "constructorStanding",
+    "laps": "lap",
+    "pitstops": "pitstop",
+}
+TEXT_CRITERIA = {"circuit", "constructor", "driver"}  # Every other one is a number
+
+# Endpoint argument -> attribute of the response table
+ATTRIBUTES = {
+    "year": "season",
+    "race": "round",
+    "circuit": "circuitId",
+    "constructor": "constructorId",
+    "driver": "driverId",
+    "grid": "grid",
+    "result": "position",
+    "fastest": "fastest",
+    "status": "statusId",
+    "driverStanding": "driverStandings",
+    "constructorStanding": "constructorStandings",
+    "lap": "lap",
+    "pitstop": "stop",
+}
+
+
+class RouteError(Exception):
+    """The path is not a valid Ergast API route."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class Route(NamedTuple):
+    table: str  # Table name, e.g. results
+    criteria: dict[str, Any]  # Endpoint arguments
+
+
+def parse(path: str) -> Route:
+    """
+    Parses an Ergast API path, "current" and "last" are resolved to the latest season
+    and its last round.
+
+    Args:
+        path (str): URL path without the query string (e.g. /api/f1/2008/5.json).
+
+    Raises:
+        RouteError: Unknown route or invalid criteria.
+
+    Returns:
+        Route: Requested table and the endpoint arguments.
+    """
+    if path.endswith(".xml"):
+        raise RouteError(400, "Only the JSON format is supported.")
+    path = path.removesuffix(".json")
+    parts = [part for part in path.split("/") if part]
+    if parts[:2] != ["api", SERIES]:
+        raise RouteError(404, f"Unknown route: {path}")
+    parts = parts[2:]
+
+    raw: dict[str, str] = {}
+    if parts and (parts[0].isdigit() or parts[0] == "current"):
+        raw["year"] = parts.pop(0)
+        if parts and (parts[0].isdigit() or parts[0] == "last"):
+            raw["race"] = parts.pop(0)
+
+    table = "races"
+    while parts:
+        name = parts.pop(0)
+        if not parts and name in TABLES:  # Last segment names the table
+            table = name
+        elif parts and name in CRITERIA:
+            raw[CRITERIA[name]] = parts.pop(0)
+            if not parts:  # Ends with a criteria, e.g. /drivers/alonso
+                table = name if name in TABLES else "results"
+        else:
+            raise RouteError(404, f"Unknown route: {path}")
+
+    criteria: dict[str, Any] = {}
+    for name, value in raw.items():
+        if name in TEXT_CRITERIA:
+            criteria[name] = value
+        elif name == "year" and value == "current":
+            criteria[name] = int(ergast.season_list()["year"].max())
+        elif name == "race" and value == "last":
+            criteria[name] = raceindex.last_round(criteria["year"]) or 0
+        elif value.isdigit():
+            criteria[name] = int(value)
+        else:
+            raise RouteError(400, f"Invalid {name}: {value}")
+    return Route(table, criteria)
+
+
+def respond(
+    route: Route, url: str, offset: int = 0, limit: int = DEFAULT_LIMIT
+) -> dict:
+    """
+    Builds the MRData response of a route.
+
+    Args:
+        route (Route): Parsed route, only the requested page of rows is fetched and
+            the total is counted with a COUNT query.
+        url (str): Requested URL, echoed in the response.
+        offset (int, optional): Number of skipped rows. Defaults to 0.
+        limit (int, optional): Maximum number of rows. Defaults to DEFAULT_LIMIT.
+
+    Raises:
+        RouteError: The table can not be filtered by one of the criteria.
+
+    Returns:
+        dict: JSON-serializable MRData response.
+    """
+    endpoint, table_name, build = TABLES[route.table]
+    accepted = inspect.signature(endpoint).parameters
+    unsupported = [name for name in route.criteria if name not in accepted]
+    if unsupported:
+        raise RouteError(
+            400, f"{route.table} can not be filtered by {', '.join(unsupported)}."
+        )
+
+    limit = max(0, min(limit, MAX_LIMIT))
+    page = endpoint(**route.criteria, offset=offset, limit=limit)
+    total = count(endpoint, **route.criteria)
+    names = unique_names(list(page.columns))  # e.g. race and result time
+    rows = [dict(zip(names, row)) for row in page.itertuples(index=False)]
+
+    table = {ATTRIBUTES[name]: str(value) for name, value in route.criteria.items()}
+    table.update(build(rows))
+    return {
+        "MRData": {
+            "xmlns": XMLNS,
+            "series": SERIES,
+            "url": url,
+            "limit": str(limit),
+            "offset": str(offset),
+            "total": str(total),
+            table_name: table,
+        }
+    }
+
+
+def _text(value: Any) -> Optional[str]:
+    """Ergast values are strings, missing ones are left out."""
+    if value is None or value is pd.NA:
+        return None
+    if isinstance(value, float):
+        if math.isnan(value):
+            return None
+        if value.is_integer():
+            return str(int(value))
+    return str(value)
+
+
+def _fields(**fields: Any) -> dict[str, Any]:
+    """Drops the missing values, nested objects are kept as they are."""
+    result = {}
+    for name, value in fields.items():
+        value = value if isinstance(value, (dict, list)) else _text(value)
+        if value is not None and value != {}:
+            result[name] = value
+    return result
+
+
+def _circuit(row: dict[str, Any], url: str = "circuitUrl") -> dict[str, Any]:
+    return _fields(
+        circuitId=row["circuitId"],
+        url=row[url],
+        circuitName=row["circuitName"],
+        Location=_fields(
+            lat=row["lat"],
+            long=row["long"],
+            locality=row.get("locality", row.get("location")),
+            country=row["country"],
+        ),
+    )
+
+
+def _race(row: dict[str, Any]) -> dict[str, Any]:
+    time = _text(row["time"])
+    return _fields(
+        season=row["year"],
+        round=row["round"],
+        url=row["url"],
+        raceName=row["raceName"],
+        Circuit=_circuit(row),
+        date=row["date"],
+        time=f"{time}Z" if time else None,
+    )
+
+
+def _driver(row: dict[str, Any], url: str = "driverUrl") -> dict[str, Any]:
+    return _fields(
+        driverId=row["driverId"],
+        permanentNumber=row.get("driverNumber", row.get("permanentNumber")),
+        code=row["driverCode"],
+        url=row[url],
+        givenName=row["givenName"],
+        familyName=row["familyName"],
+        dateOfBirth=row["dateOfBirth"],
+        nationality=row["nationality"],
+    )
+
+
+def _constructor(
+    row: dict[str, Any], url: str = "constructorUrl", nationality: str = "nationality"
+) -> dict[str, Any]:
+    return _fields(
+        constructorId=row["constructorId"],
+        url=row[url],
+        name=row["constructorName"],
+        nationality=row[nationality],
+    )
+
+
+def _per_race(
+    rows: list[dict[str, Any]],
+    items: str,
+    item: Callable[[dict[str, Any]], dict[str, Any]],
+) -> dict[str, Any]:
+    """Groups the rows (ordered by season and round) into races with their items."""
+    races: list[dict[str, Any]] = []
+    key = None
+    for row in rows:
+        if (row["year"], row["round"]) != key:
+            key = (row["year"], row["round"])
+            races.append({**_race(row), items: []})
+        races[-1][items].append(item(row))
+    return {"Races": races}
+
+
+def _seasons(rows: list[dict[str, Any]]) -> dict[str, Any]:
+    return {"Seasons": [_fields(season=row["year"], url=row["url"]) for row in rows]}
+
+
+def _races(rows: list[dict[str, Any]]) -> dict[str, Any]:
+    return {"Races": [_race(row) for row in rows]}
+
+
+def _result(row: dict[str, Any]) -> dict[str, Any]:
+    return _fields(
+        number=row["carNumber"],
+        position=row["position"],
+        positionText=row["positionText"],
+        points=row["points"],
+        Driver=_driver(row),
+        Constructor=_constructor(row, nationality="constructorNationality"),
+        grid=row["grid"],
+        laps=row["laps"],
+        status=row["status"],
+        Time=_fields(millis=row["timeMillis"], time=row["time.1"]),
+        FastestLap=_fields(
+            rank=row["fastestLapRank"],
+            lap=row["fastestLap"],
+            Time=_fields(time=row["fastestLapTime"]),
+            AverageSpeed=(
+                _fields(units="kph", speed=row["fastestLapSpeed"])
+                if _text(row["fastestLapSpeed"])
+                else {}
+            ),
+        ),
+    )
+
+
+def _results(rows: list[dict[str, Any]]) -> dict[str, Any]:
+    return _per_race(rows, "Results", _result)
+
+
+def _qualifying(rows: list[dict[str, Any]]) -> dict[str, Any]:
+    return _per_race(
+        rows,
+        "QualifyingResults",
+        lambda row: _fields(
+            number=row["carNumber"],
+            position=row["position"],
+            Driver=_driver(row),
+            Constructor=_constructor(row, nationality="constructorNationality"),
+            Q1=row["q1"],
+            Q2=row["q2"],
+            Q3=row["q3"],
+        ),
+    )
+
+
+def _standings(
+    rows: list[dict[str, Any]],
+    items: str,
+    item: Callable[[dict[str, Any]], dict[str, Any]],
+) -> dict[str, Any]:
+    """Groups the standings (ordered by season) into one list per season and round."""
+    lists: list[dict[str, Any]] = []
+    key = None
+    for row in rows:
+        if (row["year"], row["round"]) != key:
+            key = (row["year"], row["round"])
+            lists.append({**_fields(season=row["year"], round=row["round"]), items: []})
+        lists[-1][items].append(
+            _fields(
+                position=row["position"],
+                positionText=row["positionText"],
+                points=row["points"],
+                wins=row["wins"],
+            )
+            | item(row)
+        )
+    return {"StandingsLists": lists}
+
+
+def _driver_standings(rows: list[dict[str, Any]]) -> dict[str, Any]:
+    return _standings(
+        rows,
+        "DriverStandings",
+        lambda row: {"Driver": _driver(row, url="url")},
+    )
+
+
+def _constructor_standings(rows: list[dict[str, Any]]) -> dict[str, Any]:
+    return _standings(
+        rows,
+        "ConstructorStandings",
+        lambda row: {"Constructor": _constructor(row, url="url")},
+    )
+
+
+def _drivers(rows: list[dict[str, Any]]) -> dict[str, Any]:
+    return {"Drivers": [_driver(row, url="url") for row in rows]}
+
+
+def _constructors(rows: list[dict[str, Any]]) -> dict[str, Any]:
+    return {"Constructors": [_constructor(row, url="url") for row in rows]}
+
+
+def _circuits(rows: list[dict[str, Any]]) -> dict[str, Any]:
+    return {"Circuits": [_circuit(row, url="url") for row in rows]}
+
+
+def _status(rows: list[dict[str, Any]]) -> dict[str, Any]:
+    return {
+        "Status": [
+            _fields(statusId=row["statusId"], count=row["count"], status=row["status"])
+            for row in rows
+        ]
+    }
+
+
+def _laps(rows: list[dict[str, Any]]) -> dict[str, Any]:
+    races = _per_race(rows, "Laps", lambda row: row)
+    for race in races["Races"]:  # Group the timings of every race per lap
+        laps: list[dict[str, Any]] = []
+        for row in race["Laps"]:
+            if not laps or laps[-1]["number"] != _text(row["lap"]):
+                laps.append({"number": _text(row["lap"]), "Timings": []})
+            laps[-1]["Timings"].append(
+                _fields(
+                    driverId=row["driverId"],
+                    position=row["position"],
+                    time=row["lapTime"],
+                )
+            )
+        race["Laps"] = laps
+    return races
+
+
+def _pitstops(rows: list[dict[str, Any]]) -> dict[str, Any]:
+    return _per_race(
+        rows,
+        "PitStops",
+        lambda row: _fields(
+            driverId=row["driverId"],
+            lap=row["lap"],
+            stop=row["pitstop"],
+            time=row["localTime"],
+            duration=row["pitstopDuration"],
+        ),
+    )
+
+
+# Table name -> (endpoint, MRData table, builder of the table contents)
+TABLES: dict[str, tuple[Callable[..., pd.DataFrame], str, Callable[..., dict]]] = {
+    "seasons": (ergast.season_list, "SeasonTable", _seasons),
+    "races": (ergast.race_schedule, "RaceTable", _races),
+    "results": (ergast.race_results, "RaceTable", _results),
+    "qualifying": (ergast.qualifying_results, "RaceTable", _qualifying),
+    "driverStandings": (ergast.driver_standings, "StandingsTable", _driver_standings),
+    "constructorStandings": (
+        ergast.constructor_standings,
+        "StandingsTable",
+        _constructor_standings,
+    ),
+    "drivers": (ergast.driver_information, "DriverTable", _drivers),
+    "constructors": (ergast.constructor_information, "ConstructorTable", _constructors),
+    "circuits": (ergast.circuit_information, "CircuitTable", _circuits),
+    "status": (ergast.finishing_status, "StatusTable", _status),
+    "laps": (ergast.lap_times, "RaceTable", _laps),
+    "pitstops": (ergast.pit_stops, "RaceTable", _pitstops),
+}
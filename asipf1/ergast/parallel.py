@@ -0,0 +1,44 @@
+"""
+Process pools for the per race work of the analyses.
+
+Worker processes never share a connection with their parent, every worker opens its
+own read-only connection (see ergast.db.get_connection) with the settings of the
+parent, and reads the columnar cache when the parent has it enabled. Results are
+returned in submission order, so merging them matches a serial run.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Optional
+
+from ergast import columnar, db
+
+
+def _initialize(settings: dict[str, Any], columnar_folder: Optional[str]) -> None:
+    """Configures a worker process like its parent."""
+    db.configure(**settings)
+    if columnar_folder is not None:
+        columnar.enable(columnar_folder)
+
+
+def process_pool(jobs: int) -> ProcessPoolExecutor:
+    """
+    Creates a pool of worker processes configured like the calling process.
+
+    Args:
+        jobs (int): Number of worker processes.
+
+    Raises:
+        ValueError: jobs is not positive.
+
+    Returns:
+        ProcessPoolExecutor: Process pool, use it as a context manager.
+    """
+    if jobs <= 0:
+        raise ValueError("At least one job is required.")
+    return ProcessPoolExecutor(
+        jobs,
+        initializer=_initialize,
+        initargs=(
+            db.settings(),
+            str(columnar.folder()) if columnar.is_enabled() else None,
+        ),
+    )
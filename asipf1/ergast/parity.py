@@ -0,0 +1,165 @@
+"""
+Parity check of the ergast backends.
+
+Runs the same endpoint calls on the SQLite backend and on the DuckDB backend (see
+ergast.duck) and compares the returned DataFrames, values and dtypes alike. It covers
+the full history loads of every endpoint along with filtered, paginated and per-race
+calls, and exits with a non-zero status when any result differs. Run from the
+repository root with:
+
+    PYTHONPATH=asipf1 python -m ergast.parity [--database PATH] [--parquet FOLDER]
+"""
+import argparse
+import sys
+from typing import Any, Callable, NamedTuple, Optional
+
+import ergast
+import pandas as pd
+from ergast import cumulative, db, raceindex
+from ergast.db import DATABASE_FILE_PATH
+
+
+class Mismatch(NamedTuple):
+    endpoint: str
+    params: dict[str, Any]
+    reason: str  # First line of the assertion message or the raised error
+
+
+def _collect(endpoint: str) -> Callable[..., pd.DataFrame]:
+    """Obtain a callable returning the DataFrame of an endpoint or a stream of it."""
+    if endpoint.startswith("iter_"):
+        stream = getattr(ergast, endpoint)
+
+        def call(**params: Any) -> pd.DataFrame:
+            return pd.concat(list(stream(**params)), ignore_index=True)
+
+        return call
+    if endpoint.endswith("_page"):
+        page = getattr(ergast, endpoint)
+        return lambda **params: page(**params).data
+    return getattr(ergast, endpoint)
+
+
+def sample_calls() -> list[tuple[str, dict[str, Any]]]:
+    """
+    Obtain the compared endpoint calls, the per-race calls use the latest race of the
+    configured database.
+
+    Returns:
+        list[tuple[str, dict[str, Any]]]: Endpoint names and their parameters.
+    """
+    index = raceindex.get_index()
+    year, race = max(index.race_ids) if index.race_ids else (None, None)
+    calls: list[tuple[str, dict[str, Any]]] = [
+        ("season_list", {}),
+        ("season_list", {"driverStanding": 1}),
+        ("race_schedule", {}),
+        ("race_schedule", {"result": 1, "offset": 5, "limit": 10}),
+        ("race_results", {}),
+        ("race_results", {"compact": True}),
+        ("race_results", {"result": 1, "grid": 1}),
+        ("race_results", {"offset": 100}),
+        ("race_results_page", {"limit": 100}),
+        ("qualifying_results", {}),
+        ("driver_standings", {}),
+        ("driver_standings", {"driverStanding": 1}),
+        ("constructor_standings", {}),
+        ("driver_information", {}),
+        ("driver_information", {"driverStanding": 1}),
+        ("constructor_information", {}),
+        ("circuit_information", {}),
+        ("finishing_status", {}),
+        ("iter_lap_times", {}),
+        ("iter_pit_stops", {}),
+    ]
+    if year:
+        calls += [
+            ("race_results", {"year": year, "race": race}),
+            ("qualifying_results", {"year": year, "race": race}),
+            ("driver_standings", {"year": year}),
+            ("constructor_standings", {"year": year, "race": race}),
+            ("finishing_status", {"year": year, "race": race}),
+            ("lap_times", {"year": year, "race": race}),
+            ("lap_times", {"year": year, "race": race, "compact": True}),
+            ("pit_stops", {"year": year, "race": race}),
+        ]
+    if cumulative.is_built():
+        calls.append(("iter_lap_cumulative", {}))
+    return calls
+
+
+def _run(calls: list[tuple[str, dict[str, Any]]]) -> list[Any]:
+    """Runs the calls on the configured backend, keeping the errors as results."""
+    results: list[Any] = []
+    for endpoint, params in calls:
+        try:
+            results.append(_collect(endpoint)(**params))
+        except Exception as error:  # Compared like any other result
+            results.append(error)
+    return results
+
+
+def _compare(expected: Any, actual: Any) -> Optional[str]:
+    """Obtain the reason the results differ, None if they are identical."""
+    if isinstance(expected, Exception) or isinstance(actual, Exception):
+        if type(expected) is type(actual):
+            return None
+        if isinstance(actual, Exception):
+            backend, error = "duckdb", actual
+        else:
+            backend, error = "sqlite", expected
+        return f"{backend} raised {type(error).__name__}: {error}".splitlines()[0]
+    try:
+        pd.testing.assert_frame_equal(expected, actual, check_exact=True)
+    except AssertionError as error:  # Skips the listed values, keeps the first diff
+        lines = [line for line in str(error).splitlines() if not line.startswith("[")]
+        return " ".join(" ".join(lines).split())
+    return None
+
+
+def check(
+    database: str = DATABASE_FILE_PATH, parquet: Optional[str] = None
+) -> list[Mismatch]:
+    """
+    Compares the endpoint results of both backends and prints the mismatches.
+
+    Args:
+        database (str, optional): Path to the SQLite database image.
+            Defaults to DATABASE_FILE_PATH.
+        parquet (Optional[str], optional): Folder with the Parquet export read by the
+            DuckDB backend. Defaults to None (attach the database image).
+
+    Returns:
+        list[Mismatch]: Calls whose results differ.
+    """
+    db.configure(database=database, backend="sqlite", parquet="")
+    calls = sample_calls()
+    expected = _run(calls)
+    db.configure(backend="duckdb", parquet=parquet or "")
+    try:
+        db.get_connection()  # Fails once when DuckDB cannot open the database
+        actual = _run(calls)
+    finally:
+        db.configure(backend="sqlite", parquet="")
+
+    mismatches = []
+    for (endpoint, params), left, right in zip(calls, expected, actual):
+        reason = _compare(left, right)
+        if reason is not None:
+            mismatches.append(Mismatch(endpoint, params, reason))
+            print(f"MISMATCH {endpoint}({params}): {reason}")
+    print(f"{len(calls) - len(mismatches)} of {len(calls)} endpoint calls identical")
+    return mismatches
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database", default=DATABASE_FILE_PATH)
+    parser.add_argument("--parquet", help="Parquet export read by DuckDB")
+    args = parser.parse_args(argv)
+    if check(args.database, args.parquet):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
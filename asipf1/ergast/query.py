@@ -0,0 +1,564 @@
+import base64
+import hashlib
+import json
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache, wraps
+from itertools import groupby
+from operator import itemgetter
+from typing import Any, Callable, Iterator, NamedTuple, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from ergast import instrument
+from ergast.db import get_connection
+
+Shape = frozenset[str]
+
+CHUNK_SIZE = 10_000  # Rows fetched at once by the streaming endpoints
+PAGE_SIZE = 1000  # Rows per page of the keyset paginated endpoints
+
+# Compact column dtypes, integers holding NULLs become the nullable Int16/Int32
+CATEGORY = "category"
+INT16 = "int16"
+INT32 = "int32"
+FLOAT32 = "float32"
+DATE = "date"  # ISO 8601 date strings parsed to datetime64
+
+PAGINATION = frozenset({"offset", "limit"})  # Parameters where 0 is a value
+
+_counting: ContextVar[bool] = ContextVar("counting", default=False)
+
+
+class Column(NamedTuple):
+    expr: str  # SQL expression in the SELECT clause
+    name: str  # Name of the DataFrame column
+    dtype: Optional[str] = None  # Compact dtype, None keeps the inferred one
+
+
+Columns = tuple[Column, ...]
+
+
+class Page(NamedTuple):
+    data: pd.DataFrame
+    token: Optional[str]  # Continuation token of the next page, None on the last one
+
+
+def template(
+    columns: list[Column],
+) -> Callable[[Callable[[Shape, str], str]], Callable[..., str]]:
+    """
+    Memoizes an SQL template builder per filter shape and column projection.
+    Builders only decide which clauses are needed, filter values are always bound as
+    named parameters (e.g. :year), so every call with the same shape reuses the same SQL
+    text and hits the sqlite3 statement cache instead of being parsed and planned again.
+
+    Args:
+        columns (list[Column]): Every column the endpoint can return.
+
+    Returns:
+        Callable[[Callable[[Shape, str], str]], Callable[..., str]]: Decorator turning
+            a builder of (shape, select clause) into a memoized builder of
+            (shape, selected columns), which selects every column by default.
+    """
+
+    def decorator(build: Callable[[Shape, str], str]) -> Callable[..., str]:
+        @lru_cache(maxsize=None)
+        @wraps(build)
+        def compiled(f: Shape, selected: Optional[Columns] = None) -> str:
+            return build(f, ", ".join(column.expr for column in selected or columns))
+
+        return compiled
+
+    return decorator
+
+
+def shape(params: dict[str, Any]) -> Shape:
+    """
+    Obtain the filter shape of a query, e.g. the names of the parameters that are set.
+
+    Args:
+        params (dict[str, Any]): Query parameters.
+
+    Returns:
+        Shape: Names of parameters with truthy values, offset and limit count as set
+            unless they are None (e.g. offset 0).
+    """
+    return frozenset(
+        name
+        for name, value in params.items()
+        if value or (name in PAGINATION and value is not None)
+    )
+
+
+def paginate(f: Shape) -> str:
+    """
+    Renders the LIMIT clause of the offset and limit parameters.
+
+    Args:
+        f (Shape): Filter shape of the query.
+
+    Returns:
+        str: LIMIT clause, empty if neither offset nor limit is set.
+    """
+    if "limit" in f:
+        return "LIMIT :limit OFFSET :offset" if "offset" in f else "LIMIT :limit"
+    return "LIMIT -1 OFFSET :offset" if "offset" in f else ""
+
+
+def project(columns: list[Column], names: Optional[Sequence[str]] = None) -> Columns:
+    """
+    Obtain the endpoint columns to select, in the requested order.
+
+    Args:
+        columns (list[Column]): Every column the endpoint can return.
+        names (Optional[Sequence[str]], optional): Names of the requested columns.
+            Defaults to None (all columns).
+
+    Raises:
+        ValueError: Unknown column name or no columns requested.
+
+    Returns:
+        Columns: Selected columns, names used more than once select every match.
+    """
+    if names is None:
+        return tuple(columns)
+    if isinstance(names, str):
+        names = [names]
+    if not names:
+        raise ValueError("At least one column has to be selected.")
+
+    unknown = [name for name in names if name not in {c.name for c in columns}]
+    if unknown:
+        raise ValueError(f"Unknown columns: {', '.join(unknown)}.")
+    return tuple(c for name in dict.fromkeys(names) for c in columns if c.name == name)
+
+
+def unique_names(names: Sequence[str]) -> list[str]:
+    """
+    Obtain unique column names, repeated names (e.g. time) get a .N suffix.
+
+    Args:
+        names (Sequence[str]): Column names.
+
+    Returns:
+        list[str]: Column names, the first occurrence of each name is kept as is.
+    """
+    seen: dict[str, int] = {}
+    unique = []
+    for name in names:
+        unique.append(f"{name}.{seen[name]}" if name in seen else name)
+        seen[name] = seen.get(name, 0) + 1
+    return unique
+
+
+def downcast(df: pd.DataFrame, columns: Sequence[Column]) -> pd.DataFrame:
+    """
+    Converts the DataFrame columns in place to their compact dtypes. Strings become
+    categoricals, numbers are downcast and dates are parsed.
+
+    Args:
+        df (pd.DataFrame): DataFrame built from the selected columns.
+        columns (Sequence[Column]): Selected columns, in the DataFrame column order.
+
+    Returns:
+        pd.DataFrame: The same DataFrame with the compact dtypes.
+    """
+    for i, column in enumerate(columns):
+        series = df.iloc[:, i]
+        if column.dtype == CATEGORY:
+            series = series.astype(CATEGORY)
+        elif column.dtype in (INT16, INT32):
+            series = pd.to_numeric(series, errors="coerce")
+            nullable = series.isna().any()  # e.g. Int16 keeps NULLs as pd.NA
+            series = series.astype(column.dtype.title() if nullable else column.dtype)
+        elif column.dtype == FLOAT32:
+            series = pd.to_numeric(series, errors="coerce").astype(FLOAT32)
+        elif column.dtype == DATE:
+            series = pd.to_datetime(series, format="%Y-%m-%d", errors="coerce")
+        else:
+            continue
+        df.isetitem(i, series)  # Positional, names can repeat (e.g. time)
+    return df
+
+
+@contextmanager
+def counting(enabled: bool = True) -> Iterator[None]:
+    """
+    Makes fetch and fetch_arrays only count the rows of their queries (see count)
+    within the context, or fetch them again when disabled.
+
+    Args:
+        enabled (bool, optional): Count instead of fetching. Defaults to True.
+    """
+    token = _counting.set(enabled)
+    try:
+        yield
+    finally:
+        _counting.reset(token)
+
+
+def is_counting() -> bool:
+    """Checks whether the queries are only counted, see counting."""
+    return _counting.get()
+
+
+def count(endpoint: Callable[..., pd.DataFrame], **params: Any) -> int:
+    """
+    Counts the rows an endpoint call returns with a COUNT query of the endpoint query,
+    without fetching them. Calls served from the columnar cache are read and counted.
+
+    Args:
+        endpoint (Callable[..., pd.DataFrame]): Ergast endpoint.
+        **params (Any): Endpoint parameters.
+
+    Returns:
+        int: Number of rows.
+    """
+    with counting():
+        df = endpoint(**params)
+    return df.attrs.get("count", len(df.index))
+
+
+def _count(query: str, params: dict[str, Any]) -> pd.DataFrame:
+    """Counts the rows of a query, the count is kept in the attrs of an empty frame."""
+    cur = get_connection().cursor()
+    cur.execute(f"SELECT COUNT(*) FROM ({query})", params)
+    (total,) = cur.fetchone()
+    cur.close()
+    df = pd.DataFrame([])
+    df.attrs["count"] = total
+    return df
+
+
+def fetch(
+    query: str,
+    params: dict[str, Any],
+    columns: Sequence[Column],
+    compact: bool = False,
+) -> pd.DataFrame:
+    """
+    Executes the SQL query with the given bound parameters.
+
+    Args:
+        query (str): SQL query with named placeholders.
+        params (dict[str, Any]): Query parameters, unused ones are ignored.
+        columns (Sequence[Column]): Selected columns of the query.
+        compact (bool, optional): Convert the columns to their compact dtypes.
+            Defaults to False.
+
+    Returns:
+        pd.DataFrame: Pandas DataFrame with the query results.
+    """
+    if _counting.get():
+        return _count(query, params)
+
+    start = time.perf_counter()
+    cur = get_connection().cursor()
+    cur.execute(query, params)
+    executed = time.perf_counter()
+    res = cur.fetchall()
+    cur.close()
+    fetched = time.perf_counter()
+
+    df = _frame(res, columns, compact)
+    call = instrument.current()
+    if call is not None:
+        build = time.perf_counter() - fetched
+        call.query(
+            query,
+            params,
+            executed - start,
+            fetched - executed,
+            build,
+            len(res),
+            instrument.frame_bytes(df),
+        )
+    return df
+
+
+def fetch_arrays(
+    query: str,
+    params: dict[str, Any],
+    columns: Sequence[Column],
+    compact: bool = False,
+    chunk_size: int = CHUNK_SIZE,
+) -> pd.DataFrame:
+    """
+    Executes the SQL query with the given bound parameters, same as fetch, but decodes
+    the rows straight into one preallocated NumPy array per column instead of building
+    the list of row tuples first. Integer and float columns of the endpoint schema get
+    typed arrays, which grow in place and the DataFrame wraps without copying them.
+    It lowers the peak memory but is not faster than fetch, so the endpoints use fetch
+    and python -m ergast.benchmark compares both.
+
+    Args:
+        query (str): SQL query with named placeholders.
+        params (dict[str, Any]): Query parameters, unused ones are ignored.
+        columns (Sequence[Column]): Selected columns of the query.
+        compact (bool, optional): Convert the columns to their compact dtypes.
+            Defaults to False.
+        chunk_size (int, optional): Number of rows decoded at once.
+            Defaults to CHUNK_SIZE.
+
+    Returns:
+        pd.DataFrame: Pandas DataFrame with the query results.
+    """
+    if _counting.get():
+        return _count(query, params)
+
+    arrays: list[np.ndarray] = []
+    size = 0
+
+    start = time.perf_counter()
+    cur = get_connection().cursor()
+    cur.execute(query, params)
+    executed = time.perf_counter()
+    fetched = 0.0
+    while True:
+        chunk_start = time.perf_counter()
+        rows = cur.fetchmany(chunk_size)
+        fetched += time.perf_counter() - chunk_start
+        if not rows:
+            break
+        if not arrays:  # Sized by the first chunk, exact for results of one chunk
+            arrays = [np.empty(len(rows), _storage_dtype(column)) for column in columns]
+        elif size + len(rows) > len(arrays[0]):
+            capacity = max(2 * len(arrays[0]), size + len(rows))
+            for array in arrays:  # Grown in place by realloc, amortized like a list
+                array.resize(capacity, refcheck=False)
+        for i, values in enumerate(zip(*rows)):
+            arrays[i] = _fill(arrays[i], size, values)
+        size += len(rows)
+    cur.close()
+
+    if not size:
+        df = _frame([], columns, compact)
+    else:
+        for array in arrays:
+            array.resize(size, refcheck=False)  # Trims the unused capacity in place
+        data = {i: _finish(array) for i, array in enumerate(arrays)}
+        df = pd.DataFrame(data, copy=False)
+        df.columns = [column.name for column in columns]  # Names can repeat
+        if compact:
+            downcast(df, columns)
+
+    call = instrument.current()
+    if call is not None:  # Decoding into the arrays is part of the build
+        build = time.perf_counter() - executed - fetched
+        call.query(
+            query,
+            params,
+            executed - start,
+            fetched,
+            build,
+            size,
+            instrument.frame_bytes(df),
+        )
+    return df
+
+
+def _storage_dtype(column: Column) -> type:
+    """Obtain the NumPy dtype the values of the column are decoded into."""
+    if column.dtype in (INT16, INT32):
+        return np.int64
+    if column.dtype == FLOAT32:
+        return np.float64
+    return object
+
+
+def _fill(array: np.ndarray, start: int, values: tuple) -> np.ndarray:
+    """
+    Copies a chunk of column values into the array at the given position. Integer
+    arrays are promoted to float (NULL becomes NaN) and numeric arrays to object if the
+    values do not fit, like pandas does when it infers the column dtype.
+
+    Args:
+        array (np.ndarray): Preallocated column array.
+        start (int): Row index of the first value.
+        values (tuple): Column values of the fetched rows.
+
+    Returns:
+        np.ndarray: The array holding the values, a promoted copy if needed.
+    """
+    chunk: Any = values
+    if array.dtype != object:
+        chunk = np.array(values)
+        if chunk.dtype.kind not in "iu" or array.dtype.kind == "f":
+            try:
+                chunk = np.array(values, dtype=np.float64)
+                array = array.astype(np.float64, copy=False)
+            except (TypeError, ValueError):
+                chunk = values
+                array = array.astype(object)
+    array[start : start + len(values)] = chunk
+    return array
+
+
+def _finish(array: np.ndarray) -> np.ndarray:
+    """Infers the dtype of object arrays and keeps columns without values as None."""
+    if array.dtype.kind == "f" and np.isnan(array).all():
+        return np.full(len(array), None, dtype=object)
+    if array.dtype == object and pd.api.types.infer_dtype(array, skipna=True) in (
+        "integer",
+        "floating",
+        "mixed-integer-float",
+    ):
+        return pd.to_numeric(array)
+    return array
+
+
+def stream(
+    query: str,
+    params: dict[str, Any],
+    columns: Sequence[Column],
+    compact: bool = False,
+    chunk_size: int = CHUNK_SIZE,
+    group_by: Optional[Sequence[str]] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Executes the SQL query with the given bound parameters and streams the results,
+    only chunk_size rows (and the current group) are held in memory at once.
+
+    Args:
+        query (str): SQL query with named placeholders.
+        params (dict[str, Any]): Query parameters, unused ones are ignored.
+        columns (Sequence[Column]): Selected columns of the query.
+        compact (bool, optional): Convert the columns to their compact dtypes.
+            Defaults to False.
+        chunk_size (int, optional): Number of rows fetched at once.
+            Defaults to CHUNK_SIZE.
+        group_by (Optional[Sequence[str]], optional): Yield one DataFrame per run of
+            equal values in these columns instead of one per chunk, the query has to
+            be ordered by them. Defaults to None.
+
+    Raises:
+        ValueError: Grouping columns are not selected or chunk_size is not positive.
+
+    Returns:
+        Iterator[pd.DataFrame]: Pandas DataFrames with consecutive query results.
+    """
+    if chunk_size <= 0:
+        raise ValueError("The chunk size has to be positive.")
+    names = [column.name for column in columns]
+    missing = [name for name in group_by or [] if name not in names]
+    if missing:
+        raise ValueError(f"Grouping requires the columns: {', '.join(missing)}.")
+    key = itemgetter(*[names.index(name) for name in group_by]) if group_by else None
+
+    def generate() -> Iterator[pd.DataFrame]:
+        call = instrument.current()
+        stats = {"execute": 0.0, "fetch": 0.0, "build": 0.0, "rows": 0, "nbytes": 0}
+
+        def frame(rows: list[tuple]) -> pd.DataFrame:
+            start = time.perf_counter()
+            df = _frame(rows, columns, compact)
+            stats["build"] += time.perf_counter() - start
+            if call is not None:
+                stats["nbytes"] += instrument.frame_bytes(df)
+            return df
+
+        cur = get_connection().cursor()
+        try:
+            start = time.perf_counter()
+            cur.execute(query, params)
+            stats["execute"] = time.perf_counter() - start
+            group: list[tuple] = []
+            while True:
+                start = time.perf_counter()
+                rows = cur.fetchmany(chunk_size)
+                stats["fetch"] += time.perf_counter() - start
+                if not rows:
+                    break
+                stats["rows"] += len(rows)
+                if key is None:
+                    yield frame(rows)
+                    continue
+                for value, run in groupby(rows, key):
+                    if group and key(group[0]) != value:
+                        yield frame(group)
+                        group = []
+                    group.extend(run)
+            if group:
+                yield frame(group)
+        finally:
+            cur.close()
+            if call is not None:
+                call.query(query, params, **stats)
+
+    return generate()
+
+
+def _frame(rows: list[tuple], columns: Sequence[Column], compact: bool) -> pd.DataFrame:
+    """Builds the DataFrame of the fetched rows."""
+    df = pd.DataFrame(rows, columns=[column.name for column in columns])
+    if compact:
+        downcast(df, columns)
+    return df
+
+
+def _fingerprint(build_sql: Callable[..., str], params: dict[str, Any]) -> str:
+    """Identifies the query a continuation token belongs to."""
+    filters = {name: value for name, value in params.items() if value is not None}
+    content = json.dumps([build_sql.__name__, filters], sort_keys=True, default=str)
+    return hashlib.blake2b(content.encode(), digest_size=8).hexdigest()
+
+
+def fetch_page(
+    build_sql: Callable[..., str],
+    params: dict[str, Any],
+    columns: Columns,
+    keys: Columns,
+    limit: int = PAGE_SIZE,
+    token: Optional[str] = None,
+    compact: bool = False,
+) -> Page:
+    """
+    Fetches one page of a keyset paginated query. Instead of skipping rows with an
+    offset, the next page starts right after the sort key of the last returned row,
+    so every page costs the same no matter how deep it is.
+
+    The query template has to order by the key columns when the keyset parameter is
+    set and only return rows after the :<key name> parameters when they are set.
+
+    Args:
+        build_sql (Callable[..., str]): Compiled query template (see template).
+        params (dict[str, Any]): Query filter parameters.
+        columns (Columns): Selected columns of the query.
+        keys (Columns): Unique sort key of the query, the column names double as
+            parameter names.
+        limit (int, optional): Number of rows per page. Defaults to PAGE_SIZE.
+        token (Optional[str], optional): Continuation token returned with the
+            previous page. Defaults to None (first page).
+        compact (bool, optional): Convert the columns to their compact dtypes.
+            Defaults to False.
+
+    Raises:
+        ValueError: limit is not positive or the token belongs to another query.
+
+    Returns:
+        Page: Pandas DataFrame with the page and the token of the next page.
+    """
+    if limit <= 0:
+        raise ValueError("The page size has to be positive.")
+    fingerprint = _fingerprint(build_sql, params)
+    page_params = {**params, "keyset": True, "limit": limit}
+    if token is not None:
+        try:
+            query, after = json.loads(base64.urlsafe_b64decode(token.encode()))
+        except (TypeError, ValueError) as e:
+            raise ValueError("Invalid continuation token.") from e
+        if query != fingerprint or len(after) != len(keys):
+            raise ValueError("The continuation token belongs to another query.")
+        page_params.update(zip([key.name for key in keys], after))
+
+    selected = tuple(columns) + tuple(keys)
+    df = fetch(build_sql(shape(page_params), selected), page_params, selected, compact)
+
+    next_token = None
+    if len(df) == limit:
+        after = [value.item() for value in df.iloc[-1, len(columns) :].to_numpy()]
+        content = json.dumps([fingerprint, after]).encode()
+        next_token = base64.urlsafe_b64encode(content).decode()
+    return Page(df.iloc[:, : len(columns)], next_token)
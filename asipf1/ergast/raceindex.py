@@ -0,0 +1,169 @@
+"""
+In-memory index of the races table.
+
+The per-race endpoints are called once for every race of an analysis, so resolving
+(year, round) to a raceId in SQL (a join on races plus MAX(round) subqueries) is paid
+over and over again. The index is built with two small queries on first use and maps
+(year, round) -> raceId, year -> last round (scheduled and with standings) and
+circuitRef -> raceIds, which lets the endpoints filter the fact tables by raceId
+directly. It is rebuilt whenever the database file changes.
+"""
+import threading
+from typing import NamedTuple, Optional
+
+from ergast.db import database_path, get_connection
+
+NO_RACE = -1  # raceId that matches no rows, for filters that match no race
+
+
+class RaceIndex(NamedTuple):
+    race_ids: dict[tuple[int, int], int]  # (year, round) -> raceId
+    last_rounds: dict[int, int]  # year -> last scheduled round
+    standings_rounds: dict[int, int]  # year -> last round with driver standings
+    season_race_ids: dict[int, frozenset[int]]  # year -> raceIds
+    circuit_race_ids: dict[str, frozenset[int]]  # circuitRef -> raceIds
+
+
+_index: Optional[RaceIndex] = None
+_source: Optional[tuple[str, int]] = None
+_lock = threading.Lock()
+
+
+def _build() -> RaceIndex:
+    """Reads the races and the last round with standings of every season."""
+    con = get_connection()
+    races = con.execute(
+        "SELECT ra.raceId, ra.year, ra.round, ci.circuitRef "
+        "FROM races ra, circuits ci WHERE ra.circuitId=ci.circuitId"
+    ).fetchall()
+    standings = con.execute(
+        "SELECT r.year, MAX(r.round) FROM driverStandings ds, races r "
+        "WHERE ds.raceId=r.raceId GROUP BY r.year"
+    ).fetchall()
+
+    race_ids: dict[tuple[int, int], int] = {}
+    last_rounds: dict[int, int] = {}
+    seasons: dict[int, set[int]] = {}
+    circuits: dict[str, set[int]] = {}
+    for race_id, year, race, circuit in races:
+        race_ids[(year, race)] = race_id
+        last_rounds[year] = max(race, last_rounds.get(year, race))
+        seasons.setdefault(year, set()).add(race_id)
+        circuits.setdefault(circuit, set()).add(race_id)
+
+    return RaceIndex(
+        race_ids,
+        last_rounds,
+        dict(standings),
+        {year: frozenset(ids) for year, ids in seasons.items()},
+        {circuit: frozenset(ids) for circuit, ids in circuits.items()},
+    )
+
+
+def get_index() -> RaceIndex:
+    """
+    Obtain the race index, building it on first use or after the database changed.
+
+    Returns:
+        RaceIndex: Lookup tables of the races table.
+    """
+    global _index, _source
+
+    path = database_path()
+    source = (str(path), path.stat().st_mtime_ns)
+    with _lock:
+        if _index is None or source != _source:
+            _index = _build()
+            _source = source
+        return _index
+
+
+def race_id(year: int, race: int) -> int:
+    """
+    Obtain the raceId of a race.
+
+    Args:
+        year (int): Season calendar year.
+        race (int): Race round in the selected calendar year.
+
+    Returns:
+        int: raceId of the race, NO_RACE if there is no such race.
+    """
+    return get_index().race_ids.get((year, race), NO_RACE)
+
+
+def last_round(year: int) -> Optional[int]:
+    """
+    Obtain the last scheduled round of a season.
+
+    Args:
+        year (int): Season calendar year.
+
+    Returns:
+        Optional[int]: Last round, None if the season does not exist.
+    """
+    return get_index().last_rounds.get(year)
+
+
+def standings_race_id(year: int) -> int:
+    """
+    Obtain the raceId of the last race of a season that has driver standings.
+
+    Args:
+        year (int): Season calendar year.
+
+    Returns:
+        int: raceId of the race, NO_RACE if the season has no standings.
+    """
+    index = get_index()
+    race = index.standings_rounds.get(year)
+    return NO_RACE if race is None else index.race_ids.get((year, race), NO_RACE)
+
+
+def race_ids(circuit: str) -> frozenset[int]:
+    """
+    Obtain the raceIds of every race held at a circuit.
+
+    Args:
+        circuit (str): Circuit reference (e.g. monaco).
+
+    Returns:
+        frozenset[int]: raceIds of the races, empty for an unknown circuit.
+    """
+    return get_index().circuit_race_ids.get(circuit, frozenset())
+
+
+def resolve(
+    year: Optional[int] = None,
+    race: Optional[int] = None,
+    circuit: Optional[str] = None,
+) -> Optional[int]:
+    """
+    Resolves race filters to the raceId of the single race they match.
+
+    Args:
+        year (Optional[int], optional): Season calendar year. Defaults to None.
+        race (Optional[int], optional): Race round in the selected calendar year.
+            Defaults to None.
+        circuit (Optional[str], optional): Circuit reference (e.g. monaco).
+            Defaults to None.
+
+    Returns:
+        Optional[int]: raceId of the race, NO_RACE if the filters match no race and
+            None if they can match more than one race.
+    """
+    if not year:
+        return None
+    index = get_index()
+    if race:
+        candidates = {index.race_ids.get((year, race), NO_RACE)}
+    else:
+        candidates = set(index.season_race_ids.get(year, ()))
+    if circuit:
+        candidates &= index.circuit_race_ids.get(circuit, frozenset())
+
+    if not candidates:
+        return NO_RACE
+    if len(candidates) > 1:  # e.g. a double header or a whole season
+        return None
+    return candidates.pop()
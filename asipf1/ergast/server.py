@@ -0,0 +1,297 @@
+"""
+Local Ergast compatible HTTP API served from the f1db.sqlite image.
+
+Serves the public Ergast routes and MRData JSON responses (see ergast.mrdata) fully
+offline. Requests run on a bounded pool of worker threads, each with its own read-only
+connection. Idle keep-alive connections do not hold a worker, they are watched by a
+selector and handed back to the pool once the next request arrives. Responses are
+cached in memory by path and query and carry an ETag, so polling with If-None-Match is
+answered with 304 Not Modified without any query. Run from the repository root with:
+
+    PYTHONPATH=asipf1 python -m ergast.server [--host HOST] [--port PORT]
+        [--workers N] [--database PATH]
+"""
+import argparse
+import hashlib
+import json
+import queue
+import selectors
+import socket
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any, NamedTuple, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from ergast import db, mrdata
+from ergast.db import DATABASE_FILE_PATH
+
+HOST = "127.0.0.1"
+PORT = 8000
+WORKERS = 8  # Number of requests handled at once
+CACHE_SIZE = 1024  # Number of cached responses
+IDLE_TIMEOUT = 5  # Seconds an idle keep-alive connection is kept open
+
+
+class Response(NamedTuple):
+    status: int
+    body: bytes
+    etag: str
+
+
+class ResponseCache:
+    """Size-bounded LRU cache of responses, cleared whenever the database changes."""
+
+    def __init__(self, maxsize: int = CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self._responses: OrderedDict[str, Response] = OrderedDict()
+        self._source: Optional[tuple[str, int, str, Optional[str]]] = None
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Response]:
+        source = db.source()
+        with self._lock:
+            if source != self._source:
+                self._responses.clear()
+                self._source = source
+            response = self._responses.get(key)
+            if response is not None:
+                self._responses.move_to_end(key)
+            return response
+
+    def put(self, key: str, response: Response) -> None:
+        with self._lock:
+            self._responses[key] = response
+            while len(self._responses) > self.maxsize:
+                self._responses.popitem(last=False)
+
+
+def render(target: str, host: str) -> Response:
+    """
+    Builds the response of a request target.
+
+    Args:
+        target (str): Request path and query string (e.g. /api/f1/2008.json?limit=5).
+        host (str): Requested host, used in the echoed URL.
+
+    Returns:
+        Response: Status code, JSON body and its ETag.
+    """
+    url = urlsplit(target)
+    query = parse_qs(url.query)
+    try:
+        offset = int(query.get("offset", ["0"])[0])
+        limit = int(query.get("limit", [str(mrdata.DEFAULT_LIMIT)])[0])
+    except ValueError:
+        offset = limit = -1
+    if offset < 0 or limit < 0:
+        return _response(
+            HTTPStatus.BAD_REQUEST,
+            {"error": "The offset and limit have to be non-negative integers."},
+        )
+
+    try:
+        route = mrdata.parse(url.path)
+        content: Any = mrdata.respond(
+            route, f"http://{host}{url.path}", offset=offset, limit=limit
+        )
+    except mrdata.RouteError as e:
+        return _response(HTTPStatus(e.status), {"error": str(e)})
+    except ValueError as e:  # Invalid endpoint arguments
+        return _response(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+    return _response(HTTPStatus.OK, content)
+
+
+def _response(status: int, content: Any) -> Response:
+    """Serializes the response content and computes its ETag."""
+    body = json.dumps(content, separators=(",", ":")).encode()
+    etag = f'"{hashlib.sha1(body).hexdigest()}"'
+    return Response(status, body, etag)
+
+
+class ErgastHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive connections
+    disable_nagle_algorithm = True  # Headers and body are written separately
+    timeout = IDLE_TIMEOUT  # While reading a request
+    server: "ErgastServer"
+    parked = False  # Idle keep-alive connection handed back to the server
+
+    def handle(self) -> None:
+        # Requests the client already sent are served right away, otherwise the idle
+        # connection is parked so it does not hold a worker until the next one
+        self.handle_one_request()
+        while not self.close_connection and self._has_pending_request():
+            self.handle_one_request()
+        self.parked = not self.close_connection
+
+    def _has_pending_request(self) -> bool:
+        """Checks without blocking whether the next request was (partly) received."""
+        self.connection.setblocking(False)
+        try:
+            return bool(self.rfile.peek(1))
+        except OSError:
+            return False
+        finally:
+            self.connection.settimeout(self.timeout)
+
+    def do_HEAD(self) -> None:
+        self.do_GET(body=False)
+
+    def do_GET(self, body: bool = True) -> None:
+        host = self.headers.get("Host", f"{HOST}:{PORT}")
+        key = f"{host}{self.path}"
+        response = self.server.cache.get(key)
+        if response is None:
+            response = render(self.path, host)
+            if response.status == HTTPStatus.OK:
+                self.server.cache.put(key, response)
+
+        if response.etag in self.headers.get("If-None-Match", ""):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", response.etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(response.status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(response.body)))
+        self.send_header("ETag", response.etag)
+        self.end_headers()
+        if body:
+            self.wfile.write(response.body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass  # Logging every request would cost more than serving a cached one
+
+
+class ErgastServer(HTTPServer):
+    """
+    HTTP server handling the requests on a bounded pool of worker threads, idle
+    keep-alive connections wait in a selector instead of on a worker.
+    """
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        workers: int = WORKERS,
+        cache_size: int = CACHE_SIZE,
+    ) -> None:
+        super().__init__(address, ErgastHandler)
+        self.cache = ResponseCache(cache_size)
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="ergast-http")
+        self._parked: queue.SimpleQueue = queue.SimpleQueue()
+        self._wakeup, self._waker = socket.socketpair()
+        self._closing = threading.Event()
+        self._watcher = threading.Thread(
+            target=self._watch_idle, name="ergast-keepalive", daemon=True
+        )
+        self._watcher.start()
+
+    def process_request(
+        self, request: socket.socket, client_address: tuple[str, int]
+    ) -> None:
+        self._executor.submit(self._process, request, client_address)
+
+    def finish_request(
+        self, request: socket.socket, client_address: tuple[str, int]
+    ) -> ErgastHandler:
+        return self.RequestHandlerClass(request, client_address, self)
+
+    def _process(self, request: socket.socket, client_address: tuple[str, int]) -> None:
+        try:
+            handler = self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+            self.shutdown_request(request)
+            return
+        if handler.parked and not self._closing.is_set():
+            self._parked.put((request, client_address))
+            self._waker.send(b"\0")
+        else:
+            self.shutdown_request(request)
+
+    def _watch_idle(self) -> None:
+        """
+        Waits for the next request on the parked connections and submits them to the
+        pool again, closing the ones idle for longer than IDLE_TIMEOUT.
+        """
+        idle: dict[socket.socket, tuple[tuple[str, int], float]] = {}
+        with selectors.DefaultSelector() as selector:
+            selector.register(self._wakeup, selectors.EVENT_READ)
+            while not self._closing.is_set():
+                while not self._parked.empty():
+                    request, client_address = self._parked.get()
+                    selector.register(request, selectors.EVENT_READ)
+                    idle[request] = (client_address, time.monotonic())
+
+                for key, _ in selector.select(timeout=min(1, IDLE_TIMEOUT)):
+                    if key.fileobj is self._wakeup:
+                        self._wakeup.recv(4096)
+                        continue
+                    selector.unregister(key.fileobj)
+                    client_address, _ = idle.pop(key.fileobj)
+                    self._executor.submit(self._process, key.fileobj, client_address)
+
+                expired = time.monotonic() - IDLE_TIMEOUT
+                for request, (_, since) in list(idle.items()):
+                    if since < expired:
+                        selector.unregister(request)
+                        del idle[request]
+                        self.shutdown_request(request)
+
+            for request in idle:
+                self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self._closing.set()
+        self._waker.send(b"\0")
+        self._watcher.join()
+        self._executor.shutdown(wait=True)
+        while not self._parked.empty():  # Parked while the watcher was stopping
+            self.shutdown_request(self._parked.get()[0])
+        self._wakeup.close()
+        self._waker.close()
+
+
+def serve(
+    host: str = HOST,
+    port: int = PORT,
+    workers: int = WORKERS,
+    database: str = DATABASE_FILE_PATH,
+) -> None:
+    """
+    Serves the API until interrupted.
+
+    Args:
+        host (str, optional): Interface to listen on. Defaults to HOST.
+        port (int, optional): Port to listen on. Defaults to PORT.
+        workers (int, optional): Number of worker threads. Defaults to WORKERS.
+        database (str, optional): Path to the SQLite database image.
+            Defaults to DATABASE_FILE_PATH.
+    """
+    db.configure(database=database)
+    with ErgastServer((host, port), workers) as server:
+        print(f"Serving the Ergast API on http://{host}:{port}/api/f1")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--database", default=DATABASE_FILE_PATH)
+    args = parser.parse_args(argv)
+    serve(args.host, args.port, args.workers, args.database)
+
+
+if __name__ == "__main__":
+    main()
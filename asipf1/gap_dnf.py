@@ -1,12 +1,18 @@
 import os
 import textwrap
 import warnings
+from typing import TYPE_CHECKING, Iterator, Optional
 
 import ergast
+import ergast.checkpoint
+import ergast.cumulative
+import ergast.lazy
+import ergast.parallel
 import numpy as np
 import pandas as pd
 from core.constants import (
     BAR_WIDTH,
+    DNFS_QUERY_STATS_JSON,
     GAPS_CSV,
     IMAGES_DNFS_FOLDER,
     IMAGES_DNFS_SIZE,
@@ -18,12 +24,55 @@ from core.constants import (
     STATUS_COLLISIONS,
     STATUS_FINISHED,
 )
-from matplotlib import pyplot as plt
+from core.utils import get_pyplot
+
+if TYPE_CHECKING:
+    import polars as pl
 
 warnings.simplefilter(action="ignore", category=FutureWarning)
 
+# Lap time columns used by the analysis, the rest is not loaded
+LAP_TIMES_COLUMNS = ["year", "round", "driverId", "lap", "millis"]
+# Same with the cumulative race time, read when the lapCumulative table is built
+LAP_CUMULATIVE_COLUMNS = LAP_TIMES_COLUMNS + ["cumulativeMillis"]
+# Source tables of the per race results, bump the version when get_race_dnfs changes
+CHECKPOINT_TABLES = ("races", "results", "lapTimes")
+CHECKPOINT_VERSION = 1
+# Interval to the car ahead of a car in a DRS-style train and of a close car (ms)
+TRAIN_GAP = 1000
+CLOSE_GAP = 2000
+DENSITY_COLUMNS = [
+    "lap",
+    "cars",
+    "within_1s",
+    "within_2s",
+    "largest_train",
+    "lead_pack_cars",
+    "lead_pack_spread",
+]
+# Same for the cached per race field density series, computed from the lap times only
+DENSITY_CHECKPOINT_TABLES = ("races", "lapTimes")
+DENSITY_CHECKPOINT_VERSION = 1
+
+
+def generate_dataset(
+    jobs: int = 1, checkpoints: bool = True, reuse: bool = True
+) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Generates the DNF percentages, gaps and results race by race.
 
-def generate_dataset() -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    Args:
+        jobs (int, optional): Number of processes computing the races, the output
+            is identical to the serial run. Defaults to 1.
+        checkpoints (bool, optional): Store the per race results in the checkpoint
+            store (see ergast.checkpoint). Defaults to True.
+        reuse (bool, optional): Reuse the stored results, only new or changed races
+            are computed. Otherwise every race is computed and stored again.
+            Defaults to True.
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]: Percentages, gaps and
+            results, also written to their CSV files.
+    """
     result_gaps = []
     percentages = pd.DataFrame([])
     gaps = pd.DataFrame([])
@@ -32,20 +81,101 @@ def generate_dataset() -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
     # status_codes = STATUS_CODES_COLLISIONS if collisions else STATUS_CODES
 
     print(f"Generating data from 1996 till {max_season}")
-    # Lap Time data is available from 96
-    for year in range(1996, max_season + 1):
-        print(f"Parsing year {year}:")
-        # Get number of races in a given season
-        race_count = len(ergast.race_schedule(year=year).index)
-
-        for race in range(1, race_count + 1):  # Rounds are 1-index based
-            race_percentages, race_gaps, result_gap = get_race_dnfs(year, race)
+    races = [
+        (year, race)
+        for year in range(1996, max_season + 1)
+        for race in range(1, len(ergast.race_schedule(year=year).index) + 1)
+    ]
+    store = None
+    done = {}
+    if checkpoints:
+        store = ergast.checkpoint.Store(
+            "gap_dnf", CHECKPOINT_TABLES, CHECKPOINT_VERSION
+        )
+    if store is not None and reuse:
+        done = store.load(races)
+        print(f"Reusing {len(done)} of {len(races)} races from the checkpoints")
+    pending = [key for key in races if key not in done]
+    if jobs > 1:
+        computed = _parallel_race_dnfs(pending, jobs)
+    else:
+        computed = _serial_race_dnfs(pending)
+
+    for key in races:  # Merged in race order, pending races are computed in order
+        if key in done:
+            race_dnfs = done[key]
+        else:
+            race_dnfs = next(computed)
+            if store is not None:
+                store.save(key, race_dnfs)
+        race_percentages, race_gaps, result_gap = race_dnfs
+        percentages = pd.concat([percentages, race_percentages])
+        gaps = pd.concat([gaps, race_gaps])
+        if result_gap > 0:  # -1 means we terminated the iteration
+            result_gaps.append(result_gap)
+
+    return _aggregate_dataset(percentages, gaps, result_gaps)
+
+
+def _serial_race_dnfs(
+    races: list[tuple[int, int]],
+) -> Iterator[tuple[pd.DataFrame, pd.DataFrame, int]]:
+    """Computes the races one by one, yielded in race order."""
+    parsed_year = None
+    for (year, race), lap_times in zip(races, _stream_race_laps(races)):
+        if year != parsed_year:
+            print(f"Parsing year {year}:")
+            parsed_year = year
+        yield get_race_dnfs(year, race, lap_times)
+
+
+def _stream_race_laps(races: list[tuple[int, int]]) -> Iterator[pd.DataFrame]:
+    """Streams the lap times of the races, yielded in race order."""
+    if not races:
+        return
+    # Lap Time data is available from 96, stream it one race at a time in race order
+    if ergast.cumulative.is_built():
+        laps_by_race = ergast.iter_lap_cumulative(
+            start_year=races[0][0], columns=LAP_CUMULATIVE_COLUMNS, by_race=True
+        )
+    else:
+        laps_by_race = ergast.iter_lap_times(
+            start_year=races[0][0], columns=LAP_TIMES_COLUMNS, by_race=True
+        )
+    next_laps = next(laps_by_race, None)
+    for year, race in races:
+        # Skip the streamed races that are not requested (e.g. already checkpointed)
+        while next_laps is not None and (
+            next_laps["year"].iat[0],
+            next_laps["round"].iat[0],
+        ) < (year, race):
+            next_laps = next(laps_by_race, None)
+        lap_times = pd.DataFrame([])  # Races without lap data are not streamed
+        if next_laps is not None and (
+            next_laps["year"].iat[0] == year and next_laps["round"].iat[0] == race
+        ):
+            lap_times, next_laps = next_laps, next(laps_by_race, None)
+
+        yield lap_times
+
+
+def _parallel_race_dnfs(
+    races: list[tuple[int, int]], jobs: int
+) -> Iterator[tuple[pd.DataFrame, pd.DataFrame, int]]:
+    """Computes the races in a process pool, yielded in race order."""
+    if not races:
+        return
+    print(f"Parsing {len(races)} races in {jobs} processes")
+    with ergast.parallel.process_pool(jobs) as pool:
+        yield from pool.map(
+            get_race_dnfs, [year for year, _ in races], [race for _, race in races]
+        )
 
-            percentages = pd.concat([percentages, race_percentages])
-            gaps = pd.concat([gaps, race_gaps])
-            if result_gap > 0:  # -1 means we terminated the iteration
-                result_gaps.append(result_gap)
 
+def _aggregate_dataset(
+    percentages: pd.DataFrame, gaps: pd.DataFrame, result_gaps: list[int]
+) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Sums the DNFs of every race, writes and returns the dataset."""
     # Convert to int64 and summ everything without duplicates
     percentages.sort_values(by=["percentage"], inplace=True)
     percentages = percentages.astype(np.int64)
@@ -76,8 +206,193 @@ def generate_dataset() -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
     return percentages, gaps, results
 
 
-def get_race_dnfs(year: int, race: int) -> tuple[pd.DataFrame, pd.DataFrame, int]:
-    lap_times = ergast.lap_times(year, race)
+def lazy_dataset() -> tuple["pl.LazyFrame", "pl.LazyFrame", "pl.LazyFrame"]:
+    """Builds the percentages, gaps and results of generate_dataset as LazyFrames.
+
+    Every race is computed at once with grouped operations over the lap times and
+    race results scanned from the columnar cache (see ergast.lazy), so the whole
+    dataset is a single plan the Polars optimizer can push filters and projections
+    through. Requires polars.
+
+    Returns:
+        tuple[pl.LazyFrame, pl.LazyFrame, pl.LazyFrame]: Percentages, gaps and
+            results with the columns and order of the generated CSVs.
+    """
+    import polars as pl
+
+    race = ["year", "round"]
+    # Total race time thus far of every driver at the end of every lap
+    laps = (
+        ergast.lazy.lap_times(start_year=1996)
+        .group_by([*race, "driverId", "lap"])
+        .agg(pl.col("millis").sum())
+        .with_columns(
+            total_millis=pl.col("millis")
+            .cum_sum()
+            .over([*race, "driverId"], order_by="lap")
+        )
+    )
+    median_gap = (  # We are using MEDIAN
+        pl.col("total_millis").median() - pl.col("total_millis").min()
+    ).cast(pl.Int64)
+    lap_gaps = laps.group_by([*race, "lap"]).agg(gap=median_gap)
+    lap_counts = laps.group_by(race).agg(lap_count=pl.col("lap").max())
+
+    results = ergast.lazy.race_results(start_year=1996).select(
+        [*race, "driverId", "positionText", "laps", "statusId"]
+    )
+    collision = pl.col("statusId").is_in(STATUS_COLLISIONS)
+    # We are looking at the end of completed lap, this fixes the 0 lap issue
+    dnfs = (
+        results.filter(pl.col("statusId").is_in(STATUS_ACCIDENTS) | collision)
+        .with_columns(lap=pl.col("laps") + 1, collisions=collision.cast(pl.Int64))
+        .with_columns(accidents=1 - pl.col("collisions"))
+        .join(lap_counts, on=race)
+        .join(lap_gaps, on=[*race, "lap"])
+        .with_columns(
+            percentage=(pl.col("laps") / pl.col("lap_count") * 100)
+            .round(0, mode="half_to_even")
+            .cast(pl.Int64)
+        )
+    )
+    totals = [pl.col("accidents").sum(), pl.col("collisions").sum()]
+    percentages = dnfs.group_by("percentage").agg(totals).sort("percentage")
+    gaps = (
+        dnfs.group_by("gap")
+        .agg(totals)
+        .sort("gap")
+        .with_columns(
+            total_accidents=pl.col("accidents").cum_sum(),
+            total_collisions=pl.col("collisions").cum_sum(),
+        )
+    )
+
+    # Median gap to the leader at the end of the race of the drivers that finished
+    finished = results.filter(
+        ~pl.col("positionText").is_in(POSITION_DNF).fill_null(False)
+        & pl.col("statusId").is_in(STATUS_FINISHED)
+    ).select([*race, "driverId"])
+    result_gaps = (
+        laps.join(finished, on=[*race, "driverId"])
+        .filter(pl.col("lap") == pl.col("lap").max().over([*race, "driverId"]))
+        .group_by(race)
+        .agg(gap=median_gap)
+        .filter(pl.col("gap") > 0)
+        .select("gap")
+        .sort("gap")
+    )
+    return percentages, gaps, result_gaps
+
+
+def generate_dataset_lazy() -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Same as generate_dataset, but collects lazy_dataset in one optimized run.
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]: Percentages, gaps and
+            results, also written to their CSV files.
+    """
+    import polars as pl
+
+    print("Generating data from 1996 with a single lazy plan")
+    frames = [df.to_pandas() for df in pl.collect_all(lazy_dataset())]
+    percentages, gaps, results = frames
+
+    _save_dataset(percentages, gaps, results)
+    return percentages, gaps, results
+
+
+def generate_dataset_history() -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Same as generate_dataset, but computes every race in a single pass.
+
+    The lap times and race results of the whole history are loaded once, the lap
+    gaps, DNFs and final gaps of every race are then computed with grouped
+    operations keyed by raceId instead of a Python loop over the races.
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]: Percentages, gaps and
+            results, also written to their CSV files.
+    """
+    print("Generating data from 1996 in a single pass")
+    race_ids = pd.DataFrame(
+        [
+            (*race, race_id)
+            for race, race_id in ergast.raceindex.get_index().race_ids.items()
+        ],
+        columns=["year", "round", "raceId"],
+    )
+    if ergast.cumulative.is_built():
+        laps = ergast.lap_cumulative(start_year=1996, columns=LAP_CUMULATIVE_COLUMNS)
+        laps = laps.rename(columns={"cumulativeMillis": "total_millis"})
+        laps = laps.merge(race_ids, on=["year", "round"])
+    else:
+        laps = ergast.lap_times(start_year=1996, columns=LAP_TIMES_COLUMNS)
+        laps = laps.merge(race_ids, on=["year", "round"])
+        # Add total race time thus far in milliseconds as a new column
+        laps.sort_values(by=["raceId", "driverId", "lap"], inplace=True)
+        laps["total_millis"] = laps.groupby(["raceId", "driverId"])["millis"].cumsum()
+
+    # Median gap to the leader at the end of every lap of every race
+    by_lap = laps.groupby(["raceId", "lap"])["total_millis"]
+    lap_gaps = (by_lap.median() - by_lap.min()).astype(np.int64).rename("gap")
+    lap_counts = laps.groupby("raceId")["lap"].max().rename("lap_count")
+
+    race_results = ergast.race_results(
+        start_year=1996,
+        columns=["year", "round", "driverId", "positionText", "laps", "statusId"],
+    ).merge(race_ids, on=["year", "round"])
+    dnfs = race_results[
+        race_results["statusId"].isin(STATUS_ACCIDENTS + STATUS_COLLISIONS)
+    ].merge(lap_counts, left_on="raceId", right_index=True)
+    dnfs["collisions"] = dnfs["statusId"].isin(STATUS_COLLISIONS).astype(np.int64)
+    dnfs["accidents"] = 1 - dnfs["collisions"]
+    # We are looking at the end of completed lap, this fixes the 0 lap issue
+    dnfs["lap"] = dnfs["laps"] + 1
+    dnfs = dnfs.merge(lap_gaps, how="left", left_on=["raceId", "lap"], right_index=True)
+    for row in dnfs[dnfs["gap"].isna()].itertuples():  # NOTE: This should not trigger
+        print(f"Error -> Y:{row.year}, R:{row.round}, I:{row.laps}")
+    dnfs = dnfs.dropna(subset=["gap"])
+    dnfs["gap"] = dnfs["gap"].astype(np.int64)
+    dnfs["percentage"] = np.round(dnfs["laps"] / dnfs["lap_count"] * 100)
+    dnfs["percentage"] = dnfs["percentage"].astype(np.int64)
+
+    counts = ["accidents", "collisions"]
+    percentages = dnfs.groupby("percentage")[counts].sum().reset_index()
+    gaps = dnfs.groupby("gap")[counts].sum().reset_index()
+    gaps["total_accidents"] = gaps["accidents"].cumsum()
+    gaps["total_collisions"] = gaps["collisions"].cumsum()
+
+    # Median gap to the leader at the end of the race of the drivers that finished
+    finished = race_results.query(
+        f"positionText not in {POSITION_DNF} and statusId in {STATUS_FINISHED}"
+    )[["raceId", "driverId"]]
+    final_laps = laps.merge(finished, on=["raceId", "driverId"])
+    last_lap = final_laps.groupby(["raceId", "driverId"])["lap"].transform("max")
+    by_race = final_laps[final_laps["lap"] == last_lap].groupby("raceId")
+    result_gaps = (
+        by_race["total_millis"].median() - by_race["total_millis"].min()
+    ).astype(np.int64)
+    results = pd.DataFrame(
+        np.sort(result_gaps[result_gaps > 0].to_numpy()), columns=["gap"]
+    )
+
+    _save_dataset(percentages, gaps, results)
+    return percentages, gaps, results
+
+
+def _save_dataset(
+    percentages: pd.DataFrame, gaps: pd.DataFrame, results: pd.DataFrame
+) -> None:
+    """Writes the generated dataset to the CSV files."""
+    percentages.to_csv(PERCENTAGES_CSV, index=False)
+    gaps.to_csv(GAPS_CSV, index=False)
+    results.to_csv(RESULTS_CSV, index=False)
+
+
+def get_race_dnfs(
+    year: int, race: int, lap_times: Optional[pd.DataFrame] = None
+) -> tuple[pd.DataFrame, pd.DataFrame, int]:
+    if lap_times is None:
+        lap_times = _race_laps(year, race)
     if lap_times.empty:
         print(f"SKIPPING ({year}:{race}) -> No lap_time data")
         return (
@@ -86,17 +401,12 @@ def get_race_dnfs(year: int, race: int) -> tuple[pd.DataFrame, pd.DataFrame, int
             -1,
         )  # Skip because no lap time data is available
     lap_count = lap_times["lap"].max()
-
-    # Add total race time thus far in milliseconds as a new column
-    agg_df = pd.DataFrame(
-        lap_times.groupby(["driverId", "lap"], as_index=False)["millis"].sum()
-    )
-    agg_df["total_millis"] = agg_df.groupby("driverId")["millis"].cumsum()
-    lap_times = lap_times.merge(agg_df, on=["driverId", "lap", "millis"])
-    del agg_df
+    lap_times = _with_total_millis(lap_times)
 
     # Get DNF Laps
-    race_results = ergast.race_results(year=year, race=race)
+    race_results = ergast.race_results(
+        year=year, race=race, columns=["driverId", "positionText", "laps", "statusId"]
+    )
     accident_laps = (
         race_results.query(f"statusId in {STATUS_ACCIDENTS}").reset_index(drop=True)
     )["laps"].to_list()
@@ -109,30 +419,204 @@ def get_race_dnfs(year: int, race: int) -> tuple[pd.DataFrame, pd.DataFrame, int
         f"positionText not in {POSITION_DNF} and statusId in {STATUS_FINISHED}"
     )["driverId"].to_list()
 
-    race_percentages = pd.DataFrame([])
-    race_gaps = pd.DataFrame([])
+    drivers, matrix = race_matrix(lap_times, lap_count)
+    gaps = lap_gaps(matrix)
 
-    for lap in accident_laps:
-        percentage, gap = get_lap_dnfs(year, race, lap, lap_count, lap_times)
-        race_percentages = pd.concat([race_percentages, percentage])
-        race_gaps = pd.concat([race_gaps, gap])
-    for lap in collision_laps:
-        percentage, gap = get_lap_dnfs(year, race, lap, lap_count, lap_times, True)
-        race_percentages = pd.concat([race_percentages, percentage])
-        race_gaps = pd.concat([race_gaps, gap])
+    race_percentages = []
+    race_gaps = []
+    dnf_laps = [(lap, False) for lap in accident_laps]
+    dnf_laps += [(lap, True) for lap in collision_laps]
+    for lap, is_collision in dnf_laps:
+        dnf = _lap_dnfs(year, race, lap, lap_count, gaps, is_collision)
+        if dnf is not None:
+            race_percentages.append(dnf[0])
+            race_gaps.append(dnf[1])
 
     # Get median gap to the leader at the end of the race :)
-    grouped = lap_times.query(f"driverId in {finished_drivers}").groupby(["driverId"])
-    results = pd.DataFrame([])
-    for _, group in grouped:
-        results = pd.concat([results, group[group["lap"] == group["lap"].max()]])
-
-    result_gap = int(
-        results["total_millis"].median()  # We are using MEDIAN
-        - results["total_millis"].min()
+    finished = np.isin(drivers, finished_drivers)
+    completed = ~np.isnan(matrix[finished])
+    last_laps = np.where(completed, np.arange(lap_count), -1).max(axis=1)
+    results = matrix[finished][np.arange(len(last_laps)), last_laps]
+
+    result_gap = int(np.median(results) - np.min(results))  # We are using MEDIAN
+
+    return pd.DataFrame(race_percentages), pd.DataFrame(race_gaps), result_gap
+
+
+def _race_laps(year: int, race: int) -> pd.DataFrame:
+    """Loads the lap times of a race, with the cumulative times when materialized."""
+    if ergast.cumulative.is_built():
+        return ergast.lap_cumulative(year, race, columns=LAP_CUMULATIVE_COLUMNS)
+    return ergast.lap_times(year, race, columns=LAP_TIMES_COLUMNS)
+
+
+def _with_total_millis(lap_times: pd.DataFrame) -> pd.DataFrame:
+    """Adds the total race time thus far of every lap as the total_millis column."""
+    if "cumulativeMillis" in lap_times:  # Precomputed in the lapCumulative table
+        return lap_times.rename(columns={"cumulativeMillis": "total_millis"})
+
+    # Add total race time thus far in milliseconds as a new column
+    agg_df = pd.DataFrame(
+        lap_times.groupby(["driverId", "lap"], as_index=False)["millis"].sum()
+    )
+    agg_df["total_millis"] = agg_df.groupby("driverId")["millis"].cumsum()
+    return lap_times.merge(agg_df, on=["driverId", "lap", "millis"])
+
+
+def race_matrix(
+    lap_times: pd.DataFrame, lap_count: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Reduces the lap times of a race to a drivers x laps matrix of race times.
+
+    Args:
+        lap_times (pd.DataFrame): Lap times of the race with the total_millis column.
+        lap_count (int): Number of laps of the race.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Sorted driverIds and the total race time of
+            every driver (row) at the end of every lap (column), NaN where the driver
+            did not complete the lap.
+    """
+    drivers, rows = np.unique(lap_times["driverId"].to_numpy(), return_inverse=True)
+    matrix = np.full((len(drivers), lap_count), np.nan)
+    laps = lap_times["lap"].to_numpy(np.int64) - 1  # Laps are 1-index based
+    matrix[rows, laps] = lap_times["total_millis"].to_numpy(np.float64)
+    return drivers, matrix
+
+
+def lap_gaps(matrix: np.ndarray) -> np.ndarray:
+    """Computes the median gap to the leader at the end of every lap.
+
+    Args:
+        matrix (np.ndarray): Race times of the drivers, see race_matrix.
+
+    Returns:
+        np.ndarray: Median minus the minimum race time of every lap, NaN for laps no
+            driver completed.
+    """
+    completed = ~np.isnan(matrix).all(axis=0)
+    gaps = np.full(matrix.shape[1], np.nan)
+    gaps[completed] = np.nanmedian(matrix[:, completed], axis=0) - np.nanmin(
+        matrix[:, completed], axis=0
+    )
+    return gaps
+
+
+def lap_density(matrix: np.ndarray) -> pd.DataFrame:
+    """Computes the field density at the end of every lap.
+
+    The race times of every lap are sorted (O(n log n) per lap, every lap at once)
+    and the intervals between consecutive cars give the density metrics. A train is
+    a run of cars each within TRAIN_GAP of the car ahead, the lead pack is the train
+    of the leader.
+
+    Args:
+        matrix (np.ndarray): Race times of the drivers, see race_matrix.
+
+    Returns:
+        pd.DataFrame: Cars that completed the lap, cars within 1s and 2s of the car
+            ahead, cars in the largest train, cars in the lead pack and the time
+            between the leader and the last car of the lead pack of every lap (in
+            DENSITY_COLUMNS order), laps no driver completed are left out.
+    """
+    ordered = np.sort(matrix, axis=0)  # NaN sorts last, so the intervals are NaN
+    intervals = np.diff(ordered, axis=0)
+    close = intervals <= TRAIN_GAP
+
+    # Length of the run of train intervals ending at every interval
+    runs = np.cumsum(close, axis=0)
+    trains = runs - np.maximum.accumulate(np.where(close, 0, runs), axis=0)
+    lead_pack = np.cumprod(close, axis=0).sum(axis=0)  # Cars behind the leader
+
+    laps = np.arange(matrix.shape[1])
+    density = pd.DataFrame(
+        {
+            "lap": laps + 1,  # Laps are 1-index based
+            "cars": (~np.isnan(matrix)).sum(axis=0),
+            "within_1s": close.sum(axis=0),
+            "within_2s": (intervals <= CLOSE_GAP).sum(axis=0),
+            "largest_train": trains.max(axis=0, initial=0) + 1,
+            "lead_pack_cars": lead_pack + 1,
+            "lead_pack_spread": ordered[lead_pack, laps] - ordered[0],
+        }
     )
+    density = density[density["cars"] > 0].reset_index(drop=True)
+    return density.astype({"lead_pack_spread": np.int64})
+
+
+def _race_density(lap_times: pd.DataFrame) -> pd.DataFrame:
+    """Computes the field density of a race from its lap times, see lap_density."""
+    if lap_times.empty:
+        return pd.DataFrame(columns=DENSITY_COLUMNS)
+    _, matrix = race_matrix(_with_total_millis(lap_times), lap_times["lap"].max())
+    return lap_density(matrix)
+
 
-    return race_percentages, race_gaps, result_gap
+def field_density(year: int, race: int) -> pd.DataFrame:
+    """Obtain the field density at the end of every lap of a race.
+
+    The series is computed once and cached per race in the checkpoint store (see
+    ergast.checkpoint), it is recomputed when the lap times of the race change.
+
+    Args:
+        year (int): Season calendar year.
+        race (int): Race round in the selected calendar year.
+
+    Returns:
+        pd.DataFrame: Field density of every lap, see lap_density. Empty if the race
+            has no lap time data.
+    """
+    store = ergast.checkpoint.Store(
+        "field_density", DENSITY_CHECKPOINT_TABLES, DENSITY_CHECKPOINT_VERSION
+    )
+    cached = store.load([(year, race)])
+    if (year, race) in cached:
+        return cached[(year, race)]
+
+    density = _race_density(_race_laps(year, race))
+    store.save((year, race), density)
+    return density
+
+
+def field_density_history(
+    start_year: int = 1996, end_year: Optional[int] = None
+) -> pd.DataFrame:
+    """Obtain the field density at the end of every lap of every race.
+
+    Races that are not cached yet (see field_density) are computed from a single
+    stream of their lap times.
+
+    Args:
+        start_year (int, optional): First season (inclusive). Defaults to 1996.
+        end_year (Optional[int], optional): Last season (inclusive).
+            Defaults to None (the last season).
+
+    Returns:
+        pd.DataFrame: Year, round and the field density of every lap (see
+            lap_density) in race and lap order.
+    """
+    if end_year is None:
+        end_year = ergast.season_list()["year"].max()
+    races = [
+        (year, race)
+        for year in range(start_year, end_year + 1)
+        for race in range(1, len(ergast.race_schedule(year=year).index) + 1)
+    ]
+    store = ergast.checkpoint.Store(
+        "field_density", DENSITY_CHECKPOINT_TABLES, DENSITY_CHECKPOINT_VERSION
+    )
+    done = store.load(races)
+    pending = [key for key in races if key not in done]
+    for key, lap_times in zip(pending, _stream_race_laps(pending)):
+        done[key] = _race_density(lap_times)
+        store.save(key, done[key])
+
+    frames = [
+        done[key].assign(year=key[0], round=key[1]) for key in races if len(done[key])
+    ]
+    if not frames:
+        return pd.DataFrame(columns=["year", "round", *DENSITY_COLUMNS])
+    return pd.concat(frames, ignore_index=True)[["year", "round", *DENSITY_COLUMNS]]
 
 
 def get_lap_dnfs(
@@ -143,18 +627,44 @@ def get_lap_dnfs(
     lap_times: pd.DataFrame,
     is_collision: bool = False,
 ) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Obtain the completion percentage and the gap of a DNF lap.
+
+    Args:
+        year (int): Season calendar year.
+        race (int): Race round in the selected calendar year.
+        lap (int): Lap the driver retired on.
+        lap_count (int): Number of laps of the race.
+        lap_times (pd.DataFrame): Lap times of the race with the total_millis column.
+        is_collision (bool, optional): The DNF was a collision. Defaults to False.
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: One row DataFrames with the percentage and
+            the gap, empty if no driver completed the following lap.
+    """
+    laps = int(lap_times["lap"].max()) if not lap_times.empty else 0
+    _, matrix = race_matrix(lap_times, max(lap_count, laps))
+    dnf = _lap_dnfs(year, race, lap, lap_count, lap_gaps(matrix), is_collision)
+    if dnf is None:
+        return (pd.DataFrame([]), pd.DataFrame([]))
+    return (pd.DataFrame([dnf[0]]), pd.DataFrame([dnf[1]]))
+
+
+def _lap_dnfs(
+    year: int,
+    race: int,
+    lap: int,
+    lap_count: int,
+    gaps: np.ndarray,
+    is_collision: bool = False,
+) -> Optional[tuple[dict[str, int], dict[str, int]]]:
     # We are looking at the end of completed lap, this fixes the 0 lap issue
-    current_lap_times = lap_times.query(f"lap == {lap+1}")
-    time_diff = 0
-    if not current_lap_times.empty:
-        time_diff = int(
-            current_lap_times["total_millis"].median()  # We are using MEDIAN
-            - current_lap_times["total_millis"].min()
-        )
+    # (the gaps are 0-index based, so gaps[lap] is the end of lap + 1)
+    if 0 <= lap < len(gaps) and not np.isnan(gaps[lap]):
+        time_diff = int(gaps[lap])  # We are using MEDIAN, see lap_gaps
     else:
         # NOTE: This should not trigger
         print(f"Error -> Y:{year}, R:{race}, I:{lap}")
-        return (pd.DataFrame([]), pd.DataFrame([]))
+        return None
 
     percentage = {
         "percentage": round((lap / lap_count) * 100),
@@ -168,7 +678,7 @@ def get_lap_dnfs(
         "collisions": 1 if is_collision else 0,
     }
 
-    return (pd.DataFrame([percentage]), pd.DataFrame([gap]))
+    return percentage, gap
 
 
 def _analyze_percentages(df: pd.DataFrame) -> None:
@@ -178,6 +688,7 @@ def _analyze_percentages(df: pd.DataFrame) -> None:
         df (pd.DataFrame): DataFrame containing accidents, collisions and completion
             percentages.
     """
+    plt = get_pyplot()
 
     # Display a line plot for percentage completed correlation
     inc = df["accidents"].sum()
@@ -230,6 +741,7 @@ def _analyze_gaps(gaps: pd.DataFrame, results: pd.DataFrame) -> None:
     Args:
         df (pd.DataFrame): DataFrame containing accidents, collisions and median gaps.
     """
+    plt = get_pyplot()
     ta = gaps["total_accidents"].max()
     tc = gaps["total_collisions"].max()
 
@@ -322,6 +834,7 @@ def _analyze_gaps(gaps: pd.DataFrame, results: pd.DataFrame) -> None:
 
 
 def _analyze_results(results: pd.DataFrame, gaps: pd.DataFrame) -> None:
+    plt = get_pyplot()
     ta = gaps["total_accidents"].max()
     tc = gaps["total_collisions"].max()
 
@@ -411,7 +924,7 @@ def _analyze_results(results: pd.DataFrame, gaps: pd.DataFrame) -> None:
     )
 
 
-def analyze(force_generate_dataset: bool = False) -> None:
+def analyze(force_generate_dataset: bool = False, jobs: int = 1) -> None:
     if not os.path.exists(IMAGES_DNFS_FOLDER):
         os.makedirs(IMAGES_DNFS_FOLDER)
 
@@ -422,7 +935,9 @@ def analyze(force_generate_dataset: bool = False) -> None:
         or force_generate_dataset
     ):
         print("DNFs CSVs not found, generating dataset.")
-        percentages, gaps, results = generate_dataset()
+        percentages, gaps, results = generate_dataset(
+            jobs, reuse=not force_generate_dataset
+        )
     else:
         percentages = pd.read_csv(PERCENTAGES_CSV)
         gaps = pd.read_csv(GAPS_CSV)
@@ -432,6 +947,9 @@ def analyze(force_generate_dataset: bool = False) -> None:
     _analyze_gaps(gaps, results)
     _analyze_results(results, gaps)
 
+    if ergast.instrument.is_enabled():
+        ergast.instrument.dump(DNFS_QUERY_STATS_JSON)
+
 
 if __name__ == "__main__":
     analyze()
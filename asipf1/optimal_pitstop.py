@@ -1,30 +1,100 @@
 import math
 import os
 import warnings
+from itertools import repeat
+from typing import TYPE_CHECKING, Iterator, Optional
 
 import ergast
-import matplotlib.pyplot as plt
+import ergast.checkpoint
+import ergast.lazy
+import ergast.parallel
 import numpy as np
 import pandas as pd
-import seaborn as sns
-from core.constants import IMAGES_PITSTOPS_FOLDER, PITSTOPS_CSV
+from core.constants import (
+    IMAGES_PITSTOPS_FOLDER,
+    PITSTOPS_CSV,
+    PITSTOPS_QUERY_STATS_JSON,
+)
 from core.utils import get_local_minimum, plot_multiple_by_time, plot_regression
 
-
-def generate_dataset() -> pd.DataFrame:
+if TYPE_CHECKING:
+    import polars as pl
+
+# Columns used by the analysis, the rest is not loaded
+RACE_RESULTS_COLUMNS = [
+    "year",
+    "round",
+    "circuitId",
+    "driverId",
+    "timeMillis",
+    "laps",
+    "position",
+    "positionText",
+    "fastestLapTime",
+]
+PIT_STOPS_COLUMNS = [
+    "year",
+    "round",
+    "time",
+    "circuitId",
+    "driverId",
+    "pitstop",
+    "lap",
+    "localTime",
+    "pitstopDuration",
+    "durationMilliseconds",
+]
+# Source tables of the per race results, bump the version when get_pitstop_data changes
+CHECKPOINT_TABLES = ("races", "results", "pitStops")
+CHECKPOINT_VERSION = 1
+
+
+def generate_dataset(
+    jobs: int = 1, checkpoints: bool = True, reuse: bool = True
+) -> pd.DataFrame:
+    """Generates the first pit stop analysis race by race.
+
+    Args:
+        jobs (int, optional): Number of processes analyzing the races, the output is
+            identical to the serial run. Defaults to 1.
+        checkpoints (bool, optional): Store the per race results in the checkpoint
+            store (see ergast.checkpoint). Defaults to True.
+        reuse (bool, optional): Reuse the stored results, only new or changed races
+            are analyzed. Otherwise every race is analyzed and stored again.
+            Defaults to True.
+
+    Returns:
+        pd.DataFrame: First pit stop analysis of every race, also written to the CSV.
+    """
     results = pd.DataFrame([])
 
     max_season = ergast.season_list()["year"].max()
 
     print(f"Generating pitstop data from 2012 till {max_season}")
-    # Pitstop data is available from 2012
-    for year in range(2012, max_season + 1):
-        print(f"Parsing year {year}:")
-        # Get number of races in a given season
-        race_count = len(ergast.race_schedule(year=year).index)
-
-        for race in range(1, race_count + 1):  # Rounds are 1-index based
-            results = pd.concat([results, get_pitstop_data(year, race)])
+    races = [
+        (year, race)
+        for year in range(2012, max_season + 1)
+        for race in range(1, len(ergast.race_schedule(year=year).index) + 1)
+    ]
+    store = None
+    done = {}
+    if checkpoints:
+        store = ergast.checkpoint.Store(
+            "optimal_pitstop", CHECKPOINT_TABLES, CHECKPOINT_VERSION
+        )
+    if store is not None and reuse:
+        done = store.load(races)
+        print(f"Reusing {len(done)} of {len(races)} races from the checkpoints")
+    computed = _race_pitstop_data([key for key in races if key not in done], jobs)
+
+    for key in races:  # Merged in race order, pending races are analyzed in order
+        if key in done:
+            race_data = done[key]
+        else:
+            race_data = next(computed)
+            if store is not None and race_data is not None:  # Retried on the next run
+                store.save(key, race_data)
+        results = pd.concat([results, race_data])
 
     results.reset_index(inplace=True, drop=True)  # Concat messed up index, so reset it
     results.to_csv(PITSTOPS_CSV, index=False)
@@ -32,9 +102,130 @@ def generate_dataset() -> pd.DataFrame:
     return results
 
 
-def get_pitstop_data(year: int, race: int, degree: int = 3) -> pd.DataFrame:
+def _race_pitstop_data(
+    races: list[tuple[int, int]], jobs: int
+) -> Iterator[Optional[pd.DataFrame]]:
+    """Analyzes the races, in a process pool when jobs > 1, yielded in race order."""
+    if not races:
+        return
+    # Pitstop data is available from 2012, load all of it at once and split it per race
+    race_results = ergast.race_results(
+        start_year=races[0][0], columns=RACE_RESULTS_COLUMNS
+    )
+    results_by_race = {
+        key: group for key, group in race_results.groupby(["year", "round"])
+    }
+    pit_stops = ergast.pit_stops(start_year=races[0][0], columns=PIT_STOPS_COLUMNS)
+    stops_by_race = {key: group for key, group in pit_stops.groupby(["year", "round"])}
+    results_frames = [results_by_race.get(key, pd.DataFrame([])) for key in races]
+    stops_frames = [stops_by_race.get(key, pd.DataFrame([])) for key in races]
+
+    if jobs > 1:
+        print(f"Parsing {len(races)} races in {jobs} processes")
+        with ergast.parallel.process_pool(jobs) as pool:
+            # Races are returned in submission order, same as the serial loop
+            yield from pool.map(
+                get_pitstop_data,
+                [year for year, _ in races],
+                [race for _, race in races],
+                repeat(3),
+                results_frames,
+                stops_frames,
+            )
+        return
+
+    parsed_year = None
+    for (year, race), race_results, pit_stops in zip(
+        races, results_frames, stops_frames
+    ):
+        if year != parsed_year:
+            print(f"Parsing year {year}:")
+            parsed_year = year
+        yield get_pitstop_data(
+            year, race, race_results=race_results, pit_stops=pit_stops
+        )
+
+
+def lazy_dataset() -> tuple["pl.LazyFrame", "pl.LazyFrame"]:
+    """Builds the first pit stops and retirements of every race as LazyFrames.
+
+    The race results and pit stops are scanned from the columnar cache (see
+    ergast.lazy) and joined for every race at once in a single plan, the per race
+    regression then runs on the collected first pit stops. Requires polars.
+
+    Returns:
+        tuple[pl.LazyFrame, pl.LazyFrame]: Race results merged with the first pit
+            stops, in race and finishing order, and the retirement laps of the races.
+    """
+    import polars as pl
+
+    race = ["year", "round"]
+    race_results = ergast.lazy.race_results(start_year=2012).select(
+        RACE_RESULTS_COLUMNS
+    )
+    pit_stops = ergast.lazy.pit_stops(start_year=2012).select(PIT_STOPS_COLUMNS)
+    dnfs = (
+        race_results.filter(pl.col("positionText") == "R")  # Get all crashes
+        .group_by(race)
+        .agg(dnfLaps=pl.col("laps"))
+    )
+    stops = (
+        race_results.drop_nulls(subset=["timeMillis"])  # Drop non-eligible ones
+        .join(pit_stops, on=[*race, "circuitId", "driverId"], maintain_order="left")
+        .with_columns(  # Average number of pitstops, before keeping the first ones
+            averageNumberOfPitstops=pl.col("pitstop").sum().over(race)
+            / pl.col("pitstop").count().over(race)
+        )
+        .filter(pl.col("pitstop") == 1)
+    )
+    return stops, dnfs
+
+
+def generate_dataset_lazy() -> pd.DataFrame:
+    """Same as generate_dataset, but loads and joins the races with lazy_dataset.
+
+    Returns:
+        pd.DataFrame: First pit stop analysis of every race, also written to the CSV.
+    """
+    import polars as pl
+
+    print("Generating pitstop data from 2012 with a single lazy plan")
+    stops, dnfs = (df.to_pandas() for df in pl.collect_all(lazy_dataset()))
+    dnf_laps = {(year, race): laps for year, race, laps in dnfs.itertuples(False)}
+    races = []
+    for (year, race), group in stops.groupby(["year", "round"], sort=True):
+        races.append(
+            _summarize_first_stops(
+                year,
+                group.reset_index(drop=True),
+                group["averageNumberOfPitstops"].iat[0],
+                pd.DataFrame({"laps": dnf_laps.get((year, race), [])}),
+            )
+        )
+
+    results = pd.concat(races, ignore_index=True) if races else pd.DataFrame([])
+    results.to_csv(PITSTOPS_CSV, index=False)
+
+    return results
+
+
+def get_pitstop_data(
+    year: int,
+    race: int,
+    degree: int = 3,
+    race_results: Optional[pd.DataFrame] = None,
+    pit_stops: Optional[pd.DataFrame] = None,
+) -> pd.DataFrame:
     # Get race results for lets say first round 2022
-    results = ergast.race_results(year=year, race=race)[
+    if race_results is None:
+        race_results = ergast.race_results(
+            year=year, race=race, columns=RACE_RESULTS_COLUMNS
+        )
+    if race_results.empty:
+        print(f"SKIPPING ({year}:{race}) -> No race results")
+        return  # Exit because no results are available
+
+    results = race_results[
         [
             "year",
             "circuitId",
@@ -52,7 +243,13 @@ def get_pitstop_data(year: int, race: int, degree: int = 3) -> pd.DataFrame:
         print(f"SKIPPING ({year}:{race}) -> No race results")
         return  # Exit because no results are available
 
-    stops = ergast.pit_stops(year, race)[
+    if pit_stops is None:
+        pit_stops = ergast.pit_stops(year, race, columns=PIT_STOPS_COLUMNS)
+    if pit_stops.empty:
+        print(f"SKIPPING ({year}:{race}) -> No pitstop data")
+        return  # Exit because no results are available
+
+    stops = pit_stops[
         [
             "year",
             "time",
@@ -77,6 +274,30 @@ def get_pitstop_data(year: int, race: int, degree: int = 3) -> pd.DataFrame:
     average_number_of_pistops = results["pitstop"].mean()
     results = results[results["pitstop"] == 1]
 
+    return _summarize_first_stops(
+        year, results, average_number_of_pistops, dnfs, degree
+    )
+
+
+def _summarize_first_stops(
+    year: int,
+    results: pd.DataFrame,
+    average_number_of_pistops: float,
+    dnfs: pd.DataFrame,
+    degree: int = 3,
+) -> pd.DataFrame:
+    """Fits the first pit stop laps of a race and summarizes them in one row.
+
+    Args:
+        year (int): Season calendar year.
+        results (pd.DataFrame): Race results merged with the first pit stops.
+        average_number_of_pistops (float): Average number of pit stops per driver.
+        dnfs (pd.DataFrame): Race results of the retired drivers.
+        degree (int, optional): Degree of the fitted polynomial. Defaults to 3.
+
+    Returns:
+        pd.DataFrame: Optimal and actual first pit stop lap of the race.
+    """
     results["fastestLap"] = pd.to_datetime(
         results["fastestLapTime"], format="%M:%S.%f"
     ) + pd.DateOffset(years=70)
@@ -154,19 +375,22 @@ def _analyze_averages(df: pd.DataFrame) -> None:
     plot_multiple_by_time(res, IMAGES_PITSTOPS_FOLDER + "./_pitstop_averages.png")
 
 
-def analyze(force_generate_dataset: bool = False) -> None:
+def analyze(force_generate_dataset: bool = False, jobs: int = 1) -> None:
     if not os.path.exists(IMAGES_PITSTOPS_FOLDER):
         os.makedirs(IMAGES_PITSTOPS_FOLDER)
 
     if not os.path.exists(PITSTOPS_CSV) or force_generate_dataset:
         print("Pitstops CSV not found, generating dataset.")
-        df = generate_dataset()
+        df = generate_dataset(jobs, reuse=not force_generate_dataset)
     else:
         df = pd.read_csv(PITSTOPS_CSV)
 
     _analyze_averages(df)
     _analyze_per_track(df)
 
+    if ergast.instrument.is_enabled():
+        ergast.instrument.dump(PITSTOPS_QUERY_STATS_JSON)
+
 
 if __name__ == "__main__":
     analyze()
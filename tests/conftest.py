@@ -0,0 +1,43 @@
+import shutil
+import sys
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+# The analyses and the ergast package are imported like the scripts import them
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "asipf1"))
+
+from core import constants  # noqa: E402
+from ergast import columnar, db, memo  # noqa: E402
+
+from tests.fixture import create_database  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def fixture_database(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    path = tmp_path_factory.mktemp("fixture") / "f1db.sqlite"
+    create_database(path)
+    return path
+
+
+@pytest.fixture(autouse=True)
+def database(
+    fixture_database: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> Iterator[Path]:
+    """
+    Runs every test in its own working directory with a fresh copy of the fixture
+    database in data/, where the analyses read and write their files.
+    """
+    path = tmp_path / db.DATABASE_FILE_PATH
+    path.parent.mkdir()
+    shutil.copy(fixture_database, path)
+    monkeypatch.chdir(tmp_path)
+    Path(constants.PERCENTAGES_CSV).parent.mkdir(exist_ok=True)  # The data. folder
+    settings = db.settings()
+    db.configure(database=str(path), backend="sqlite", parquet="")
+    columnar.disable()
+    memo.cache_clear()
+    yield path
+    columnar.disable()
+    db.configure(**settings)
@@ -0,0 +1,257 @@
+"""
+Small synthetic f1db.sqlite image with the Ergast schema.
+
+A few seasons of races with lap times, pit stops (from 2012 like the real data),
+qualifying, standings and retirements (accidents and collisions included), generated
+from a fixed seed so every run sees the same rows.
+"""
+import os
+import random
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Any
+
+FIRST_SEASON = 2010
+LAST_SEASON = 2013
+
+_SCHEMA = """
+CREATE TABLE seasons (year INTEGER PRIMARY KEY, url VARCHAR(255));
+CREATE TABLE circuits (
+    circuitId INTEGER PRIMARY KEY, circuitRef VARCHAR(255), name VARCHAR(255),
+    location VARCHAR(255), country VARCHAR(255), lat FLOAT, lng FLOAT, alt INTEGER,
+    url VARCHAR(255)
+);
+CREATE TABLE races (
+    raceId INTEGER PRIMARY KEY, year INTEGER, round INTEGER, circuitId INTEGER,
+    name VARCHAR(255), date DATE, time TIME, url VARCHAR(255)
+);
+CREATE TABLE drivers (
+    driverId INTEGER PRIMARY KEY, driverRef VARCHAR(255), number INTEGER,
+    code VARCHAR(3), forename VARCHAR(255), surname VARCHAR(255), dob DATE,
+    nationality VARCHAR(255), url VARCHAR(255)
+);
+CREATE TABLE constructors (
+    constructorId INTEGER PRIMARY KEY, constructorRef VARCHAR(255), name VARCHAR(255),
+    nationality VARCHAR(255), url VARCHAR(255)
+);
+CREATE TABLE status (statusId INTEGER PRIMARY KEY, status VARCHAR(255));
+CREATE TABLE results (
+    resultId INTEGER PRIMARY KEY, raceId INTEGER, driverId INTEGER,
+    constructorId INTEGER, number INTEGER, grid INTEGER, position INTEGER,
+    positionText VARCHAR(255), positionOrder INTEGER, points FLOAT, laps INTEGER,
+    time VARCHAR(255), milliseconds INTEGER, fastestLap INTEGER, rank INTEGER,
+    fastestLapTime VARCHAR(255), fastestLapSpeed VARCHAR(255), statusId INTEGER
+);
+CREATE TABLE qualifying (
+    qualifyId INTEGER PRIMARY KEY, raceId INTEGER, driverId INTEGER,
+    constructorId INTEGER, number INTEGER, position INTEGER, q1 VARCHAR(255),
+    q2 VARCHAR(255), q3 VARCHAR(255)
+);
+CREATE TABLE lapTimes (
+    raceId INTEGER, driverId INTEGER, lap INTEGER, position INTEGER,
+    time VARCHAR(255), milliseconds INTEGER, PRIMARY KEY (raceId, driverId, lap)
+);
+CREATE TABLE pitStops (
+    raceId INTEGER, driverId INTEGER, stop INTEGER, lap INTEGER, time TIME,
+    duration VARCHAR(255), milliseconds INTEGER, PRIMARY KEY (raceId, driverId, stop)
+);
+CREATE TABLE driverStandings (
+    driverStandingsId INTEGER PRIMARY KEY, raceId INTEGER, driverId INTEGER,
+    points FLOAT, position INTEGER, positionText VARCHAR(255), wins INTEGER
+);
+CREATE TABLE constructorStandings (
+    constructorStandingsId INTEGER PRIMARY KEY, raceId INTEGER,
+    constructorId INTEGER, points FLOAT, position INTEGER, positionText VARCHAR(255),
+    wins INTEGER
+);
+"""
+
+STATUSES = {
+    1: "Finished",
+    3: "Accident",
+    4: "Collision",
+    5: "Engine",
+    11: "+1 Lap",
+    20: "Spun off",
+    130: "Collision damage",
+}
+RETIREMENTS = (3, 4, 5, 20, 130)
+CIRCUITS = ("monaco", "monza", "silverstone", "suzuka", "bahrain")
+DRIVERS = (
+    "hamilton",
+    "alonso",
+    "vettel",
+    "raikkonen",
+    "button",
+    "massa",
+    "webber",
+    "rosberg",
+    "perez",
+    "maldonado",
+)
+CONSTRUCTORS = ("ferrari", "mclaren", "williams", "red_bull", "mercedes")
+
+
+def _lap_time(millis: int) -> str:
+    return f"{millis // 60000}:{millis // 1000 % 60:02d}.{millis % 1000:03d}"
+
+
+def create_database(path: Path, seed: int = 42) -> None:
+    """
+    Writes the synthetic database image, replacing an existing file.
+
+    Args:
+        path (Path): Path to the SQLite database image.
+        seed (int, optional): Seed of the generated rows. Defaults to 42.
+    """
+    rnd = random.Random(seed)
+    path.unlink(missing_ok=True)
+    con = sqlite3.connect(path)
+    con.executescript(_SCHEMA)
+    con.executemany("INSERT INTO status VALUES (?, ?)", STATUSES.items())
+    for i, ref in enumerate(CIRCUITS, 1):
+        con.execute(
+            "INSERT INTO circuits VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (i, ref, f"{ref.title()} Circuit", ref.title(), f"Country {i}", 10.5 * i)
+            + (20.25 * i, 5 * i, f"http://en.wikipedia.org/wiki/{ref}"),
+        )
+    for i, ref in enumerate(DRIVERS, 1):
+        con.execute(
+            "INSERT INTO drivers VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (i, ref, i * 7 if i % 3 else None, ref[:3].upper(), f"Fn{ref}")
+            + (ref.title(), f"19{70 + i}-0{1 + i % 9}-1{i % 9}", f"Nat{i % 4}")
+            + (f"http://en.wikipedia.org/wiki/{ref}",),
+        )
+    for i, ref in enumerate(CONSTRUCTORS, 1):
+        con.execute(
+            "INSERT INTO constructors VALUES (?, ?, ?, ?, ?)",
+            (
+                i,
+                ref,
+                ref.title(),
+                f"CNat{i % 3}",
+                f"http://en.wikipedia.org/wiki/{ref}",
+            ),
+        )
+
+    race_id = result_id = 0
+    for year in range(FIRST_SEASON, LAST_SEASON + 1):
+        con.execute(
+            "INSERT INTO seasons VALUES (?, ?)",
+            (year, f"http://en.wikipedia.org/wiki/{year}"),
+        )
+        driver_points = dict.fromkeys(range(1, len(DRIVERS) + 1), 0.0)
+        constructor_points = dict.fromkeys(range(1, len(CONSTRUCTORS) + 1), 0.0)
+        for round_ in range(1, rnd.randint(2, 3) + 1):
+            race_id += 1
+            circuit = rnd.randint(1, len(CIRCUITS))
+            con.execute(
+                "INSERT INTO races VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (race_id, year, round_, circuit, f"{CIRCUITS[circuit - 1]} GP")
+                + (f"{year}-0{round_ + 2}-1{round_}", "14:00:00")
+                + (f"http://en.wikipedia.org/wiki/{year}_{round_}",),
+            )
+            lap_count = rnd.randint(15, 25)
+            field = rnd.sample(range(1, len(DRIVERS) + 1), rnd.randint(7, len(DRIVERS)))
+            pace = {driver: rnd.randint(80000, 90000) for driver in field}
+            status, laps = {}, {}
+            for driver in field:
+                roll = rnd.random()
+                if roll < 0.2:
+                    status[driver] = rnd.choice(RETIREMENTS)
+                    laps[driver] = rnd.randint(0, lap_count - 1)
+                elif roll < 0.3:
+                    status[driver], laps[driver] = 11, lap_count - 1
+                else:
+                    status[driver], laps[driver] = 1, lap_count
+
+            total = dict.fromkeys(field, 0)
+            for lap in range(1, lap_count + 1):
+                running = [driver for driver in field if laps[driver] >= lap]
+                millis = {
+                    driver: pace[driver] + rnd.randint(0, 3000) for driver in running
+                }
+                for driver in running:
+                    total[driver] += millis[driver]
+                order = sorted(running, key=total.get)
+                con.executemany(
+                    "INSERT INTO lapTimes VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (race_id, d, lap, pos, _lap_time(millis[d]), millis[d])
+                        for pos, d in enumerate(order, 1)
+                    ],
+                )
+
+            classified = sorted(
+                field, key=lambda driver: (-laps[driver], total[driver])
+            )
+            for pos, driver in enumerate(classified, 1):
+                result_id += 1
+                constructor = (driver - 1) % len(CONSTRUCTORS) + 1
+                finished = status[driver] in (1, 11)
+                points = float(max(0, 10 - pos)) if finished else 0.0
+                driver_points[driver] += points
+                constructor_points[constructor] += points
+                fastest = rnd.randint(1, laps[driver]) if laps[driver] else None
+                gap = total[driver] - total[classified[0]]
+                con.execute(
+                    "INSERT INTO results VALUES "
+                    "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (result_id, race_id, driver, constructor, driver * 2)
+                    + (rnd.randint(1, len(field)), pos if finished else None)
+                    + (str(pos) if finished else "R", pos, points, laps[driver])
+                    + (
+                        (f"+{gap}", total[driver])
+                        if status[driver] == 1
+                        else (None,) * 2
+                    )
+                    + (fastest, pos if fastest else None)
+                    + (_lap_time(pace[driver]) if fastest else None,)
+                    + ("200.123" if fastest else None, status[driver]),
+                )
+                con.execute(
+                    "INSERT INTO qualifying VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (result_id, race_id, driver, constructor, driver * 2, pos)
+                    + (_lap_time(pace[driver]), None, None),
+                )
+                if year >= 2012 and laps[driver] > 5:
+                    stops = rnd.sample(range(2, laps[driver]), rnd.randint(1, 2))
+                    for stop, lap in enumerate(sorted(stops), 1):
+                        duration = rnd.randint(19000, 30000)
+                        con.execute(
+                            "INSERT INTO pitStops VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            (race_id, driver, stop, lap, f"14:{10 + lap:02d}:30")
+                            + (f"{duration / 1000:.3f}", duration),
+                        )
+
+            for table, points in (
+                ("driverStandings", driver_points),
+                ("constructorStandings", constructor_points),
+            ):
+                ranking = sorted(points, key=lambda key: -points[key])
+                con.executemany(
+                    f"INSERT INTO {table} VALUES (NULL, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (race_id, key, points[key], pos, str(pos), int(pos == 1))
+                        for pos, key in enumerate(ranking, 1)
+                    ],
+                )
+    con.commit()
+    con.close()
+
+
+def update_database(path: Path, query: str, *params: Any) -> None:
+    """
+    Modifies the database image and moves its modification time forward, so the
+    change is detected even within the timestamp resolution of the file system.
+
+    Args:
+        path (Path): Path to the SQLite database image.
+        query (str): Modifying SQL statement.
+        *params (Any): Parameters of the statement.
+    """
+    with closing(sqlite3.connect(path)) as con, con:
+        con.execute(query, params)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
@@ -0,0 +1,120 @@
+from pathlib import Path
+from typing import Any, Callable
+
+import gap_dnf
+import optimal_pitstop
+import pandas as pd
+import pytest
+from ergast import checkpoint, raceindex
+
+from tests.fixture import update_database
+
+
+def counted(monkeypatch: pytest.MonkeyPatch, module: Any, name: str) -> list[Any]:
+    """Records the arguments of every call of a module function."""
+    calls: list[Any] = []
+    function: Callable[..., Any] = getattr(module, name)
+
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        calls.append(args)
+        return function(*args, **kwargs)
+
+    monkeypatch.setattr(module, name, wrapper)
+    return calls
+
+
+def assert_datasets_equal(actual: tuple, expected: tuple) -> None:
+    for left, right in zip(actual, expected):
+        pd.testing.assert_frame_equal(left, right)
+
+
+def test_checkpoints_are_reused(monkeypatch: pytest.MonkeyPatch) -> None:
+    expected = gap_dnf.generate_dataset(checkpoints=False)
+    first = gap_dnf.generate_dataset()
+
+    races = counted(monkeypatch, gap_dnf, "get_race_dnfs")
+    digests = counted(monkeypatch, checkpoint, "race_digests")
+    reused = gap_dnf.generate_dataset()
+
+    assert races == [] and digests == []  # Database unchanged, nothing is hashed
+    assert_datasets_equal(first, expected)
+    assert_datasets_equal(reused, expected)
+
+
+def test_changed_race_is_recomputed(
+    database: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    gap_dnf.generate_dataset()
+    update_database(
+        database,
+        "UPDATE lapTimes SET milliseconds = milliseconds + 5000 "
+        "WHERE raceId = ? AND lap = 3",
+        raceindex.race_id(2012, 2),
+    )
+
+    races = counted(monkeypatch, gap_dnf, "get_race_dnfs")
+    updated = gap_dnf.generate_dataset()
+
+    assert [race[:2] for race in races] == [(2012, 2)]
+    assert_datasets_equal(updated, gap_dnf.generate_dataset(checkpoints=False))
+
+
+def test_forced_regeneration_skips_the_checkpoints(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(gap_dnf, "_analyze_percentages", lambda *args: None)
+    monkeypatch.setattr(gap_dnf, "_analyze_gaps", lambda *args: None)
+    monkeypatch.setattr(gap_dnf, "_analyze_results", lambda *args: None)
+    gap_dnf.generate_dataset()
+
+    races = counted(monkeypatch, gap_dnf, "get_race_dnfs")
+    gap_dnf.analyze(force_generate_dataset=True)
+
+    assert len(races) == len(raceindex.get_index().race_ids)
+
+
+def test_forced_regeneration_stores_the_races(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(gap_dnf, "_analyze_percentages", lambda *args: None)
+    monkeypatch.setattr(gap_dnf, "_analyze_gaps", lambda *args: None)
+    monkeypatch.setattr(gap_dnf, "_analyze_results", lambda *args: None)
+    expected = gap_dnf.generate_dataset(checkpoints=False)
+    gap_dnf.analyze(force_generate_dataset=True)
+
+    races = counted(monkeypatch, gap_dnf, "get_race_dnfs")
+    assert_datasets_equal(gap_dnf.generate_dataset(), expected)
+    assert races == []
+
+
+def test_forced_pitstop_analysis_stores_the_races(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    expected = optimal_pitstop.generate_dataset(checkpoints=False)
+    pd.testing.assert_frame_equal(
+        optimal_pitstop.generate_dataset(reuse=False), expected
+    )
+
+    races = counted(monkeypatch, optimal_pitstop, "get_pitstop_data")
+    pd.testing.assert_frame_equal(optimal_pitstop.generate_dataset(), expected)
+    assert races == []
+
+
+def test_races_without_pitstop_data_are_not_stored(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    get_pitstop_data = optimal_pitstop.get_pitstop_data
+
+    def without_first_race(year: int, race: int, *args: Any, **kwargs: Any) -> Any:
+        if (year, race) == (2012, 1):
+            return None
+        return get_pitstop_data(year, race, *args, **kwargs)
+
+    monkeypatch.setattr(optimal_pitstop, "get_pitstop_data", without_first_race)
+    optimal_pitstop.generate_dataset()
+
+    store = checkpoint.Store(
+        "optimal_pitstop",
+        optimal_pitstop.CHECKPOINT_TABLES,
+        optimal_pitstop.CHECKPOINT_VERSION,
+    )
+    stored = store.load([(2012, 1), (2012, 2)])
+    assert (2012, 1) not in stored and (2012, 2) in stored
@@ -0,0 +1,53 @@
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+import gap_dnf
+import pandas as pd
+from ergast import cumulative, raceindex
+
+from tests.fixture import update_database
+
+
+def build(database: Path) -> None:
+    with closing(sqlite3.connect(database)) as con:
+        cumulative.build(con)
+
+
+def test_stale_table_is_not_used(database: Path) -> None:
+    expected = gap_dnf.generate_dataset(checkpoints=False)
+    build(database)
+    assert cumulative.is_built()
+
+    update_database(
+        database, "UPDATE lapTimes SET milliseconds = 2 * milliseconds WHERE lap = 2"
+    )
+    assert not cumulative.is_built()
+    changed = gap_dnf.generate_dataset(checkpoints=False)
+
+    assert not changed[1].equals(expected[1])
+    build(database)
+    assert cumulative.is_built()
+    for left, right in zip(gap_dnf.generate_dataset(checkpoints=False), changed):
+        pd.testing.assert_frame_equal(left, right)
+
+
+def test_moved_lap_times_are_rebuilt(database: Path) -> None:
+    build(database)
+    race_id = raceindex.race_id(2011, 1)
+    with closing(sqlite3.connect(database)) as con, con:
+        (first, a), (second, b) = con.execute(
+            "SELECT driverId, milliseconds FROM lapTimes WHERE raceId = ? AND lap = 1 "
+            "ORDER BY driverId LIMIT 2",
+            (race_id,),
+        ).fetchall()
+        # Swap the lap times of two drivers, the count and sum of the race are equal
+        for driver, millis in ((first, b), (second, a)):
+            con.execute(
+                "UPDATE lapTimes SET milliseconds = ? "
+                "WHERE raceId = ? AND lap = 1 AND driverId = ?",
+                (millis, race_id, driver),
+            )
+
+        assert cumulative.build(con) == 1
+        assert cumulative.build(con) == 0
@@ -0,0 +1,74 @@
+from typing import Any
+
+import gap_dnf
+import numpy as np
+import pandas as pd
+import pytest
+from ergast import raceindex
+
+nan = np.nan
+
+
+def density(rows: list[list[int]]) -> pd.DataFrame:
+    return pd.DataFrame(rows, columns=gap_dnf.DENSITY_COLUMNS, dtype=np.int64)
+
+
+def test_lap_density() -> None:
+    matrix = np.array(
+        [
+            [1000, 2000, nan, 0],
+            [1800, 2500, nan, 3000],
+            [3500, 3200, nan, 3500],
+            [4200, nan, nan, 4000],
+        ]
+    )
+
+    expected = density(
+        [
+            # Intervals 800, 1700 and 700: two trains of two cars
+            [1, 4, 2, 3, 2, 2, 800],
+            # Intervals 500 and 700: the car without a time is left out
+            [2, 3, 2, 2, 3, 3, 1200],
+            # Intervals 3000, 500 and 500: the leader is alone ahead of the train
+            [4, 4, 2, 2, 3, 1, 0],
+        ]
+    )
+    pd.testing.assert_frame_equal(gap_dnf.lap_density(matrix), expected)
+
+
+def test_lap_density_of_a_single_car() -> None:
+    expected = density([[1, 1, 0, 0, 1, 1, 0], [2, 1, 0, 0, 1, 1, 0]])
+    pd.testing.assert_frame_equal(
+        gap_dnf.lap_density(np.array([[1000, 2000]])), expected
+    )
+
+
+def test_lap_density_interval_limits() -> None:
+    # Intervals of exactly TRAIN_GAP and CLOSE_GAP are included
+    matrix = np.array([[0], [gap_dnf.TRAIN_GAP], [gap_dnf.TRAIN_GAP + 2000]])
+    expected = density([[1, 3, 1, 2, 2, 2, gap_dnf.TRAIN_GAP]])
+    pd.testing.assert_frame_equal(gap_dnf.lap_density(matrix), expected)
+
+
+def test_field_density_is_cached(monkeypatch: pytest.MonkeyPatch) -> None:
+    races: list[Any] = []
+    race_density = gap_dnf._race_density
+
+    def counted(lap_times: pd.DataFrame) -> pd.DataFrame:
+        races.append(lap_times)
+        return race_density(lap_times)
+
+    monkeypatch.setattr(gap_dnf, "_race_density", counted)
+    first = gap_dnf.field_density(2011, 1)
+    assert len(races) == 1 and len(first)
+
+    pd.testing.assert_frame_equal(gap_dnf.field_density(2011, 1), first)
+    assert len(races) == 1
+
+    # The history only computes the races that are not cached yet
+    history = gap_dnf.field_density_history()
+    assert len(races) == len(raceindex.get_index().race_ids)
+    cached = history.query("year == 2011 and round == 1")
+    pd.testing.assert_frame_equal(
+        cached[gap_dnf.DENSITY_COLUMNS].reset_index(drop=True), first
+    )
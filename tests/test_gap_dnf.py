@@ -0,0 +1,135 @@
+from pathlib import Path
+
+import ergast
+import gap_dnf
+import numpy as np
+import pandas as pd
+import pytest
+from ergast import raceindex
+
+from tests.fixture import update_database
+
+
+def races() -> list[tuple[int, int]]:
+    return sorted(raceindex.get_index().race_ids)
+
+
+def race_lap_times(year: int, race: int) -> pd.DataFrame:
+    lap_times = ergast.lap_times(year, race, columns=gap_dnf.LAP_TIMES_COLUMNS)
+    return gap_dnf._with_total_millis(lap_times)
+
+
+def reference_gap(lap_times: pd.DataFrame, lap: int) -> float:
+    """Median gap to the leader at the end of a lap, computed on its rows."""
+    current = lap_times.query(f"lap == {lap}")["total_millis"]
+    return current.median() - current.min() if len(current) else np.nan
+
+
+def reference_race_dnfs(year: int, race: int) -> tuple[list, list, int]:
+    """Per race DNFs computed lap by lap on the lap time rows."""
+    lap_times = race_lap_times(year, race)
+    lap_count = lap_times["lap"].max()
+    race_results = ergast.race_results(year=year, race=race)
+
+    percentages, gaps = [], []
+    for statuses, is_collision in (
+        (gap_dnf.STATUS_ACCIDENTS, False),
+        (gap_dnf.STATUS_COLLISIONS, True),
+    ):
+        for lap in race_results.query(f"statusId in {statuses}")["laps"]:
+            gap = reference_gap(lap_times, lap + 1)
+            if np.isnan(gap):
+                continue
+            kind = {"accidents": int(not is_collision), "collisions": int(is_collision)}
+            percentages.append({"percentage": round(lap / lap_count * 100)} | kind)
+            gaps.append({"gap": int(gap)} | kind)
+
+    finished = race_results.query(
+        f"positionText not in {gap_dnf.POSITION_DNF} "
+        f"and statusId in {gap_dnf.STATUS_FINISHED}"
+    )["driverId"]
+    last_laps = lap_times[lap_times["driverId"].isin(finished)]
+    last_laps = last_laps[
+        last_laps["lap"] == last_laps.groupby("driverId")["lap"].transform("max")
+    ]["total_millis"]
+    return percentages, gaps, int(last_laps.median() - last_laps.min())
+
+
+def test_lap_gaps_match_the_per_lap_reference() -> None:
+    for year, race in races():
+        lap_times = race_lap_times(year, race)
+        lap_count = lap_times["lap"].max()
+        _, matrix = gap_dnf.race_matrix(lap_times, lap_count)
+
+        expected = [reference_gap(lap_times, lap) for lap in range(1, lap_count + 1)]
+        np.testing.assert_array_equal(gap_dnf.lap_gaps(matrix), expected)
+
+
+def test_race_dnfs_match_the_per_lap_reference() -> None:
+    for year, race in races():
+        percentages, gaps, result_gap = gap_dnf.get_race_dnfs(year, race)
+        expected = reference_race_dnfs(year, race)
+
+        assert percentages.to_dict("records") == expected[0]
+        assert gaps.to_dict("records") == expected[1]
+        assert result_gap == expected[2]
+
+
+def test_missing_laps_are_left_out() -> None:
+    lap_times = pd.DataFrame(
+        {
+            "driverId": ["alonso", "alonso", "vettel", "webber", "webber"],
+            "lap": [1, 2, 1, 1, 2],
+            "total_millis": [1000, 2000, 1500, 1200, 2600],
+        }
+    )
+    drivers, matrix = gap_dnf.race_matrix(lap_times, 3)
+
+    assert list(drivers) == ["alonso", "vettel", "webber"]
+    np.testing.assert_array_equal(
+        matrix,
+        [[1000, 2000, np.nan], [1500, np.nan, np.nan], [1200, 2600, np.nan]],
+    )
+    np.testing.assert_array_equal(gap_dnf.lap_gaps(matrix), [200, 300, np.nan])
+
+
+def test_retirement_after_the_last_lap_is_skipped(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    lap_times = race_lap_times(2011, 1)
+    lap_count = lap_times["lap"].max()
+
+    percentage, gap = gap_dnf.get_lap_dnfs(2011, 1, lap_count, lap_count, lap_times)
+
+    assert percentage.empty and gap.empty
+    assert f"Error -> Y:2011, R:1, I:{lap_count}" in capsys.readouterr().out
+
+
+def test_race_with_a_retirement_on_the_last_lap(database: Path) -> None:
+    percentages, gaps, _ = gap_dnf.get_race_dnfs(2011, 1)
+    lap_count = int(race_lap_times(2011, 1)["lap"].max())
+    update_database(
+        database,
+        "UPDATE results SET statusId = 3, laps = ? WHERE raceId = ? AND statusId = 1 "
+        "AND positionOrder = (SELECT max(positionOrder) FROM results "
+        "WHERE raceId = ? AND statusId = 1)",
+        lap_count,
+        raceindex.race_id(2011, 1),
+        raceindex.race_id(2011, 1),
+    )
+
+    # The retirement has no following lap, the other DNFs and gaps are unchanged
+    updated = gap_dnf.get_race_dnfs(2011, 1)
+    pd.testing.assert_frame_equal(updated[0], percentages)
+    pd.testing.assert_frame_equal(updated[1], gaps)
+
+
+def test_race_without_lap_times(database: Path) -> None:
+    update_database(
+        database, "DELETE FROM lapTimes WHERE raceId = ?", raceindex.race_id(2012, 1)
+    )
+
+    percentages, gaps, result_gap = gap_dnf.get_race_dnfs(2012, 1)
+
+    assert percentages.empty and gaps.empty and result_gap == -1
+    assert not gap_dnf.get_race_dnfs(2012, 2)[0].empty
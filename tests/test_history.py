@@ -0,0 +1,33 @@
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+import gap_dnf
+import pandas as pd
+import pytest
+from ergast import cumulative
+
+CSV_FILES = (gap_dnf.PERCENTAGES_CSV, gap_dnf.GAPS_CSV, gap_dnf.RESULTS_CSV)
+
+
+def read_csv_files() -> list[bytes]:
+    return [Path(path).read_bytes() for path in CSV_FILES]
+
+
+@pytest.mark.parametrize("cumulative_table", [False, True])
+def test_history_matches_the_race_by_race_dataset(
+    database: Path, cumulative_table: bool
+) -> None:
+    if cumulative_table:
+        with closing(sqlite3.connect(database)) as con:
+            cumulative.build(con)
+    assert cumulative.is_built() == cumulative_table
+
+    expected = gap_dnf.generate_dataset(checkpoints=False)
+    expected_files = read_csv_files()
+    history = gap_dnf.generate_dataset_history()
+
+    for left, right in zip(history, expected):
+        pd.testing.assert_frame_equal(left, right)
+    assert read_csv_files() == expected_files
+    assert all(len(frame) for frame in history)
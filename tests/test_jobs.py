@@ -0,0 +1,42 @@
+from pathlib import Path
+
+import gap_dnf
+import optimal_pitstop
+import pandas as pd
+import pytest
+from ergast import columnar
+
+GAP_DNF_CSVS = (gap_dnf.PERCENTAGES_CSV, gap_dnf.GAPS_CSV, gap_dnf.RESULTS_CSV)
+
+
+def test_gap_dnf_dataset_does_not_depend_on_jobs() -> None:
+    serial = gap_dnf.generate_dataset(jobs=1, checkpoints=False)
+    files = [Path(path).read_bytes() for path in GAP_DNF_CSVS]
+    parallel = gap_dnf.generate_dataset(jobs=2, checkpoints=False)
+
+    assert not serial[0].empty and not serial[1].empty
+    for expected, actual in zip(serial, parallel):
+        pd.testing.assert_frame_equal(actual, expected)
+    assert [Path(path).read_bytes() for path in GAP_DNF_CSVS] == files
+
+
+def test_optimal_pitstop_dataset_does_not_depend_on_jobs() -> None:
+    serial = optimal_pitstop.generate_dataset(jobs=1, checkpoints=False)
+    csv = Path(optimal_pitstop.PITSTOPS_CSV).read_bytes()
+    parallel = optimal_pitstop.generate_dataset(jobs=2, checkpoints=False)
+
+    assert not serial.empty
+    pd.testing.assert_frame_equal(parallel, serial)
+    assert Path(optimal_pitstop.PITSTOPS_CSV).read_bytes() == csv
+
+
+def test_workers_share_a_cold_columnar_cache(tmp_path: Path) -> None:
+    pytest.importorskip("pyarrow")
+    expected = gap_dnf.generate_dataset(jobs=1, checkpoints=False)
+
+    columnar.enable(str(tmp_path / "columnar"))  # Materialized by the workers
+    parallel = gap_dnf.generate_dataset(jobs=4, checkpoints=False)
+
+    for left, right in zip(parallel, expected):
+        pd.testing.assert_frame_equal(left, right)
+    assert not list((tmp_path / "columnar").glob("*/*.tmp"))
@@ -0,0 +1,65 @@
+import os
+import sqlite3
+from pathlib import Path
+from typing import Iterator
+
+import ergast
+import pytest
+from ergast import memo
+
+
+@pytest.fixture(autouse=True)
+def memo_limits() -> Iterator[None]:
+    yield
+    memo.configure(maxsize=memo.MAX_SIZE, maxbytes=memo.MAX_BYTES)
+
+
+def test_repeated_calls_hit_the_cache() -> None:
+    first = ergast.race_results(year=2012, race=1)
+    second = ergast.race_results(race=1, year=2012)
+
+    assert memo.cache_info().hits == 1
+    assert memo.cache_info().misses == 1
+    assert second.equals(first)
+
+
+def test_callers_receive_their_own_copy() -> None:
+    seasons = ergast.season_list()
+    seasons["year"] = 0
+
+    assert ergast.season_list()["year"].tolist() == [2010, 2011, 2012, 2013]
+
+
+def test_database_change_invalidates_the_cache(database: Path) -> None:
+    assert len(ergast.season_list()) == 4
+    with sqlite3.connect(database) as con:
+        con.execute("INSERT INTO seasons VALUES (2014, NULL)")
+    stat = database.stat()  # Written within the timestamp resolution
+    os.utime(database, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert ergast.season_list()["year"].tolist()[-1] == 2014
+    assert memo.cache_info().hits == 0
+
+
+def test_counts_are_cached_apart_from_the_rows() -> None:
+    rows = ergast.race_results(year=2012)
+
+    assert ergast.query.count(ergast.race_results, year=2012) == len(rows)
+    assert ergast.race_results(year=2012).equals(rows)
+
+
+def test_memory_bound_evicts_and_skips_large_results() -> None:
+    nbytes = int(ergast.race_results(year=2012).memory_usage(deep=True).sum())
+    memo.cache_clear()
+
+    memo.configure(maxbytes=4 * nbytes)
+    for year in range(2010, 2014):
+        ergast.race_results(year=year)
+    assert 0 < memo.cache_info().currbytes <= 4 * nbytes
+
+    memo.configure(maxbytes=nbytes)  # Every result is over a quarter of the bound
+    memo.cache_clear()
+    ergast.race_results(year=2012)
+    ergast.race_results(year=2012)
+    assert memo.cache_info().currsize == 0
+    assert memo.cache_info().hits == 0
@@ -0,0 +1,56 @@
+from typing import Any, Callable
+
+import ergast
+import pandas as pd
+import pytest
+from ergast.query import Page
+
+
+def rows(df: pd.DataFrame) -> list[list[Any]]:
+    # Column dtypes are inferred per result (e.g. int64 for a page without NULLs and
+    # float64 otherwise, None or NaN for missing strings), so only values are compared
+    values = df.astype(object).where(df.notna(), None)
+    return [list(df.columns)] + values.to_numpy(object).tolist()
+
+
+def read_pages(
+    page_endpoint: Callable[..., Page], limit: int, **params: Any
+) -> list[pd.DataFrame]:
+    pages = [page_endpoint(limit=limit, **params)]
+    while pages[-1].token:
+        pages.append(page_endpoint(limit=limit, token=pages[-1].token, **params))
+    return [page.data for page in pages]
+
+
+@pytest.mark.parametrize("limit", [1, 7, 1000])
+def test_race_results_pages_round_trip(limit: int) -> None:
+    pages = read_pages(ergast.race_results_page, limit, start_year=2011)
+
+    assert all(len(page.index) <= limit for page in pages)
+    expected = ergast.race_results(start_year=2011)
+    assert rows(pd.concat(pages, ignore_index=True)) == rows(expected)
+
+
+@pytest.mark.parametrize("limit", [13, 100])
+def test_lap_times_pages_round_trip(limit: int) -> None:
+    pages = read_pages(ergast.lap_times_page, limit, year=2012)
+
+    assert rows(pd.concat(pages, ignore_index=True)) == rows(ergast.lap_times(2012))
+
+
+def test_token_of_another_query_is_rejected() -> None:
+    token = ergast.race_results_page(year=2012, limit=2).token
+
+    with pytest.raises(ValueError):
+        ergast.race_results_page(year=2013, limit=2, token=token)
+
+
+def test_limit_has_to_be_positive() -> None:
+    with pytest.raises(ValueError):
+        ergast.lap_times_page(year=2012, limit=0)
+
+
+def test_offset_zero_is_the_first_page() -> None:
+    first = ergast.race_results(year=2012, offset=0, limit=5)
+
+    assert rows(first) == rows(ergast.race_results(year=2012).head(5))
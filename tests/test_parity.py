@@ -0,0 +1,42 @@
+from pathlib import Path
+from typing import Any
+
+import ergast
+import pandas as pd
+import pytest
+from ergast import columnar, memo, parity
+
+SEASONAL_CALLS = [
+    ("lap_times", {"year": 2012}),
+    ("lap_times", {"year": 2012, "race": 1, "lap": 3}),
+    ("lap_times", {"start_year": 2011, "compact": True}),
+    ("pit_stops", {"start_year": 2012}),
+    ("pit_stops", {"year": 2013, "race": 2, "columns": ["driverId", "lap"]}),
+    ("race_results", {"year": 2012}),
+    ("race_results", {"start_year": 2011, "end_year": 2012, "status": 1}),
+    ("race_results", {"year": 2010, "race": 2, "driver": "alonso"}),
+]
+
+
+@pytest.mark.parametrize("endpoint, params", SEASONAL_CALLS)
+def test_columnar_matches_sqlite(
+    tmp_path: Path, endpoint: str, params: dict[str, Any]
+) -> None:
+    pytest.importorskip("pyarrow")
+    expected = getattr(ergast, endpoint)(**params)
+
+    columnar.enable(str(tmp_path / "columnar"))
+    memo.cache_clear()
+    actual = getattr(ergast, endpoint)(**params)
+
+    assert list((tmp_path / "columnar" / endpoint).glob("*.parquet"))
+    pd.testing.assert_frame_equal(actual, expected, check_exact=True)
+
+
+def test_duckdb_matches_sqlite(database: Path, tmp_path: Path) -> None:
+    pytest.importorskip("duckdb")
+    from ergast import duck
+
+    duck.export(str(database), str(tmp_path / "parquet"))
+
+    assert parity.check(str(database), str(tmp_path / "parquet")) == []
@@ -0,0 +1,86 @@
+import http.client
+import json
+import threading
+from typing import Any, Iterator, Optional
+
+import pytest
+from ergast import server
+
+
+@pytest.fixture
+def address() -> Iterator[tuple[str, int]]:
+    httpd = server.ErgastServer(("127.0.0.1", 0), workers=2)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd.server_address
+    httpd.shutdown()
+    httpd.server_close()
+    thread.join()
+
+
+def get(
+    con: http.client.HTTPConnection, path: str, etag: Optional[str] = None
+) -> tuple[int, Optional[str], Any]:
+    con.request("GET", path, headers={"If-None-Match": etag} if etag else {})
+    response = con.getresponse()
+    body = response.read()
+    return response.status, response.getheader("ETag"), body and json.loads(body)
+
+
+def test_pages_report_the_total(address: tuple[str, int]) -> None:
+    con = http.client.HTTPConnection(*address, timeout=10)
+    status, _, body = get(con, "/api/f1/2012/results.json?limit=5&offset=3")
+    _, _, full = get(con, "/api/f1/2012/results.json?limit=1000")
+
+    assert status == 200
+    races = body["MRData"]["RaceTable"]["Races"]
+    assert sum(len(race["Results"]) for race in races) == 5
+    assert body["MRData"]["total"] == full["MRData"]["total"]
+    assert int(full["MRData"]["total"]) == sum(
+        len(race["Results"]) for race in full["MRData"]["RaceTable"]["Races"]
+    )
+
+
+@pytest.mark.parametrize("query", ["limit=x", "offset=-1", "offset=1.5"])
+def test_invalid_pagination_is_a_bad_request(
+    address: tuple[str, int], query: str
+) -> None:
+    con = http.client.HTTPConnection(*address, timeout=10)
+    status, _, body = get(con, f"/api/f1/2012.json?{query}")
+
+    assert status == 400
+    assert "non-negative integers" in body["error"]
+
+
+def test_invalid_endpoint_arguments_are_a_bad_request(address: tuple[str, int]) -> None:
+    con = http.client.HTTPConnection(*address, timeout=10)
+    status, _, body = get(con, "/api/f1/circuits/monza/driverStandings/1/seasons.json")
+
+    assert status == 400
+    assert body["error"].startswith("Cannot combine standings")
+
+
+def test_unknown_route_is_not_found(address: tuple[str, int]) -> None:
+    con = http.client.HTTPConnection(*address, timeout=10)
+
+    assert get(con, "/api/f1/nonsense.json")[0] == 404
+
+
+def test_matching_etag_is_not_modified(address: tuple[str, int]) -> None:
+    con = http.client.HTTPConnection(*address, timeout=10)
+    status, etag, _ = get(con, "/api/f1/2012/1/laps.json")
+    assert status == 200 and etag
+
+    assert get(con, "/api/f1/2012/1/laps.json", etag)[:2] == (304, etag)
+    assert get(con, "/api/f1/2012/1/laps.json", '"stale"')[0] == 200
+
+
+def test_idle_connections_do_not_hold_the_workers(address: tuple[str, int]) -> None:
+    idle = [http.client.HTTPConnection(*address, timeout=10) for _ in range(6)]
+    for con in idle:  # Keep-alive connections, more than the 2 workers
+        assert get(con, "/api/f1/2012.json")[0] == 200
+
+    fresh = http.client.HTTPConnection(*address, timeout=2)
+    assert get(fresh, "/api/f1/2013.json")[0] == 200
+    for con in idle:  # Parked connections are served again
+        assert get(con, "/api/f1/2013.json")[0] == 200